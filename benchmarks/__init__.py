@@ -0,0 +1 @@
+''' Benchmarks of the engine and the records, run with `python -m benchmarks` from the package root '''
@@ -0,0 +1,47 @@
+''' Entry point of `python -m benchmarks`, see `python -m benchmarks --help` '''
+import argparse
+import sys
+import tempfile
+from . import bench_engine, bench_records, harness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('-k', '--filter', default='', help='only run the cases with this in their name')
+    parser.add_argument('--quick', action='store_true', help='leave out the largest field and record count')
+    parser.add_argument('--min-time', type=float, default=harness.MIN_TIME, help='seconds of each round')
+    parser.add_argument('--rounds', type=int, default=harness.ROUNDS, help='rounds of each case, the best is kept')
+    parser.add_argument('--save', default=None, help='save the results as a JSON baseline')
+    parser.add_argument('--compare', default=None, help='compare against a JSON baseline, fails on regressions')
+    parser.add_argument('--tolerance', type=float, default=harness.TOLERANCE,
+                        help='slowdown or memory growth allowed against the baseline (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    baseline = harness.load(args.compare) if args.compare else {}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='pyms-bench-') as directory:
+        cases = bench_engine.cases(args.quick) + bench_records.cases(args.quick, directory)
+        print('{:<32} {:>14} {:>12} {:>10}'.format('case', 'ops/sec', 'peak KiB', 'vs base'))
+        for case in cases:
+            if args.filter not in case.name:
+                continue
+            result = results[case.name] = harness.measure(case, args.min_time, args.rounds)
+            base = baseline.get(case.name)
+            change = '' if base is None else '{:+.1%}'.format(result['ops_per_sec'] / base['ops_per_sec'] - 1)
+            print('{:<32} {:>14,.1f} {:>12,.1f} {:>10}'.format(case.name, result['ops_per_sec'], result['peak_kib'], change))
+            sys.stdout.flush()
+
+    if args.save:
+        harness.save(results, args.save)
+        print('Saved the baseline to {}'.format(args.save))
+    if args.compare:
+        regressions = harness.compare(results, baseline, args.tolerance)
+        for name, failed in sorted(regressions.items()):
+            print('REGRESSED {}: {}'.format(name, ', '.join(failed)))
+        print('{} of {} cases regressed against {}'.format(len(regressions), len(results), args.compare))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
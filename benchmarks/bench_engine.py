@@ -0,0 +1,120 @@
+''' Benchmarks of the headless board, for every mode and a few scaled custom sizes '''
+from random import Random
+from pyms import constants as c
+from pyms import engine
+from pyms.simulate import play_game
+from .harness import CASE
+
+# The custom sizes (at 15% IEDs), the largest is left out of the quick runs
+CUSTOM_SIZES = ((100, 100), (300, 300), (1000, 1000))
+# The boards are all played from the same seed, so the runs are comparable
+SEED = 20200101
+# Full games are only scripted on the boards the solver gets through quickly
+GAME_MAX_SIZE = 100 * 100
+
+
+def modes(quick: bool = False) -> list:
+    ''' The (label, mode) of every MODES entry and the custom sizes '''
+    sizes = CUSTOM_SIZES[:-1] if quick else CUSTOM_SIZES
+    return [(mode.name, mode) for mode in c.MODES.values()] + [
+        ('Custom {}x{}'.format(x, y), engine.custom_mode(x, y, '15%')) for x, y in sizes
+    ]
+
+
+def middle(board: engine.Board) -> int:
+    return board.index((board.width // 2, board.height // 2))
+
+
+def placed(mode: c.MODE_CONFIG) -> engine.Board:
+    ''' The board of the SEED with the IEDs set '''
+    board = engine.create_board(mode, seed=SEED, generator=engine.GENERATOR_LATEST, opening=True)
+    board.set_IEDs()
+    return board
+
+
+def generate_case(label: str, mode: c.MODE_CONFIG) -> CASE:
+    ''' IED placement, card values and clues on the first click, as an unseeded game does '''
+    rnd = Random(SEED)
+
+    def setup():
+        board = engine.create_board(mode, seed=rnd.randrange(2 ** 63), opening=True)
+        board.used_seed = False
+        return board
+
+    def run(board):
+        board.set_IEDs(middle(board))
+        return 1
+    return CASE('generate/{}'.format(label), setup, run)
+
+
+def clues_case(label: str, mode: c.MODE_CONFIG) -> CASE:
+    ''' The clue grid on its own '''
+    def setup():
+        board = placed(mode)
+        # the numpy board computes them from scratch regardless
+        board.clues = [0] * board.size
+        return board
+
+    def run(board):
+        board.compute_clues()
+        return 1
+    return CASE('clues/{}'.format(label), setup, run)
+
+
+def flood_case(label: str, mode: c.MODE_CONFIG) -> CASE:
+    ''' Flood fill of the first opening, in revealed cells '''
+    def setup():
+        board = placed(mode)
+        empty = next(idx for idx in range(board.size) if not board.values[idx] and not board.clues[idx])
+        return board, empty
+
+    def run(state):
+        board, empty = state
+        return len(board.clicked(empty))
+    return CASE('flood/{}'.format(label), setup, run)
+
+
+def chord_case(label: str, mode: c.MODE_CONFIG) -> CASE:
+    '''
+    Chords on every clue, in chords: all the IEDs are flagged and the clues revealed,
+    so the chords open up the empty areas in between and find nothing left around the others.
+    '''
+    def setup():
+        board = placed(mode)
+        clues = []
+        for idx in range(board.size):
+            if board.values[idx]:
+                board.flag(idx, int(board.values[idx]))
+            elif board.clues[idx]:
+                board.reveal(idx)
+                clues.append(idx)
+        return board, clues
+
+    def run(state):
+        board, clues = state
+        for idx in clues:
+            board.chord(idx)
+        return len(clues)
+    return CASE('chord/{}'.format(label), setup, run)
+
+
+def game_case(label: str, mode: c.MODE_CONFIG) -> CASE:
+    ''' A whole game scripted by the solver strategy, from the board creation to the end '''
+    def run(_):
+        play_game((0, mode, SEED, 'solver', 0, True))
+        return 1
+    return CASE('game/{}'.format(label), lambda: None, run)
+
+
+def cases(quick: bool = False) -> list:
+    found = []
+    for label, mode in modes(quick):
+        found += [
+            generate_case(label, mode),
+            clues_case(label, mode),
+            flood_case(label, mode),
+            chord_case(label, mode),
+        ]
+        if mode.x * mode.y <= GAME_MAX_SIZE:
+            found.append(game_case(label, mode))
+    return found
@@ -0,0 +1,127 @@
+''' Benchmarks of the RecordKeeper database, from a handful of records up to a huge history '''
+import os
+import shutil
+import tempfile
+from random import Random
+from pyms import constants as c
+from pyms.recorder import RecordEntry, RecordKeeper
+from .harness import CASE
+
+# The amounts of records in the database, the largest is left out of the quick runs
+RECORD_COUNTS = (10, 1000, 100000)
+# All the records go to the one mode, so its leaderboard is always full
+MODE = c.MODES.get(4)
+# Records added by a single run of the add case
+ADDS_PER_RUN = 10
+
+
+class Setting:
+    ''' Stand-in for the tk variables of the saved options '''
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Options:
+    ''' Headless parent of the RecordKeeper, only the options are saved from it '''
+    options = c.OPTIONS(*(Setting(value) for value in (3, 0, 1, 1, 1, 0, 0, 0, 0)))
+
+
+class Keeper(RecordKeeper):
+    ''' RecordKeeper of the benchmark databases, the old pickled records of the user are never migrated into them '''
+    def migrate(self, filename=None):
+        pass
+
+
+def random_record(rnd: Random) -> RecordEntry:
+    time_val = rnd.uniform(30, 600)
+    return RecordEntry(MODE, c.RECORD(
+        time_val,
+        rnd.randrange(2 ** 63),
+        '{:.2f}'.format(time_val),
+        rnd.randrange(10),
+        rnd.randrange(22),
+        rnd.randrange(4),
+        rnd.randrange(2),
+        rnd.randrange(2),
+        rnd.randrange(3),
+        1,
+        None
+    ))
+
+
+def database(directory: str, count: int) -> str:
+    ''' The database of the count, filled with random records the first time it is asked for '''
+    filename = os.path.join(directory, 'records_{}.db'.format(count))
+    if not os.path.exists(filename):
+        rnd = Random(count)
+        keeper = Keeper(Options)
+        keeper.load(filename)
+        mode_str = RecordKeeper.mode_str(MODE)
+        with keeper.db:
+            for _ in range(count):
+                keeper.insert(mode_str, random_record(rnd), replay=bytes(64))
+        keeper.close()
+    return filename
+
+
+def copied(directory: str, count: int, case: str, fresh: bool = False) -> str:
+    '''
+    The copy of the database of the count for the case, so no case changes the records of another.
+    A fresh copy is made over it to start from the seeded records again.
+    '''
+    filename = os.path.join(directory, 'records_{}_{}.db'.format(count, case))
+    if fresh or not os.path.exists(filename):
+        shutil.copyfile(database(directory, count), filename)
+    return filename
+
+
+def loaded(filename: str) -> RecordKeeper:
+    ''' The RecordKeeper of the database, with the leaderboard of the mode loaded '''
+    keeper = Keeper(Options)
+    keeper.load(filename)
+    keeper.leaderboard(RecordKeeper.mode_str(MODE))
+    return keeper
+
+
+def load_case(directory: str, count: int) -> CASE:
+    ''' Opening the database and loading the leaderboard, as the first highscores shown '''
+    def run(state):
+        state.append(loaded(state[0]))
+        return 1
+    return CASE('records_load/{}'.format(count), lambda: [copied(directory, count, 'load')], run, lambda state: state[1].close())
+
+
+def add_case(directory: str, count: int) -> CASE:
+    ''' Adding records, each one committed and ranked into the loaded leaderboard, always on top of the count '''
+    rnd = Random(count)
+
+    def setup():
+        return loaded(copied(directory, count, 'add', fresh=True)), [random_record(rnd) for _ in range(ADDS_PER_RUN)]
+
+    def run(state):
+        keeper, records = state
+        for record in records:
+            keeper.add_record(MODE, record.data, replay=bytes(64))
+        return len(records)
+    return CASE('records_add/{}'.format(count), setup, run, lambda state: state[0].close())
+
+
+def save_case(directory: str, count: int) -> CASE:
+    ''' Saving the options on exit '''
+    def run(keeper):
+        keeper.save()
+        return 1
+    return CASE('records_save/{}'.format(count), lambda: loaded(copied(directory, count, 'save')), run, RecordKeeper.close)
+
+
+def cases(quick: bool = False, directory: str = None) -> list:
+    ''' The directory keeps the databases, a temporary one by default '''
+    directory = directory or tempfile.mkdtemp(prefix='pyms-bench-')
+    counts = RECORD_COUNTS[:-1] if quick else RECORD_COUNTS
+    found = []
+    for count in counts:
+        found += [load_case(directory, count), add_case(directory, count), save_case(directory, count)]
+    return found
@@ -0,0 +1,94 @@
+''' Timing and memory measurement of the benchmark cases, and the JSON baselines to compare them against '''
+import json
+import platform
+import tracemalloc
+from collections import namedtuple
+from time import perf_counter
+
+# A benchmark case:
+# name      - unique name, "<benchmark>/<size>"
+# setup     - returns the state of a single run, not timed
+# run       - takes the state and returns the number of ops it did
+# teardown  - takes the state once the run is timed, optional
+CASE = namedtuple('CASE', 'name setup run teardown')
+CASE.__new__.__defaults__ = (None, )
+
+# Each round runs the case until it adds up to this many seconds, the best round is kept
+MIN_TIME = 0.2
+ROUNDS = 3
+# A comparison run fails if a case is slower or takes more memory than the baseline by more than this
+TOLERANCE = 0.25
+# ... though the peak memory of the small cases is left some room, as it is mostly noise
+MEMORY_SLACK_KIB = 64
+
+
+def timed(case: CASE, min_time: float = MIN_TIME) -> float:
+    ''' Ops per second of the case over a single round '''
+    ops = elapsed = 0
+    while elapsed < min_time or not ops:
+        state = case.setup()
+        start = perf_counter()
+        ops += case.run(state)
+        elapsed += perf_counter() - start
+        if case.teardown is not None:
+            case.teardown(state)
+    return ops / elapsed
+
+
+def peak_memory(case: CASE) -> float:
+    ''' Peak memory (KiB) allocated by a single run of the case on top of its state '''
+    tracemalloc.start()
+    try:
+        state = case.setup()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if case.teardown is not None:
+        case.teardown(state)
+    return (peak - current) / 1024
+
+
+def measure(case: CASE, min_time: float = MIN_TIME, rounds: int = ROUNDS) -> dict:
+    ''' The best ops per second over the rounds, and the peak memory of the case '''
+    ops_per_sec = max(timed(case, min_time) for _ in range(rounds))
+    return {'ops_per_sec': ops_per_sec, 'peak_kib': peak_memory(case)}
+
+
+def environment() -> dict:
+    ''' What the results were measured on, the baselines only compare well on the same machine '''
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'platform': platform.platform()}
+
+
+def save(results: dict, filename: str):
+    ''' Save the results as the baseline '''
+    with open(filename, 'w') as file:
+        json.dump({'environment': environment(), 'results': results}, file, indent=2, sort_keys=True)
+
+
+def load(filename: str) -> dict:
+    ''' The results of the baseline '''
+    with open(filename) as file:
+        return json.load(file)['results']
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> dict:
+    '''
+    Compare the results against the baseline, returns the regressions by case name.
+    Only the cases in both are compared, new and dropped cases never fail.
+    '''
+    regressions = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        failed = []
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            failed.append('ops_per_sec')
+        if result['peak_kib'] > base['peak_kib'] * (1 + tolerance) + MEMORY_SLACK_KIB:
+            failed.append('peak_kib')
+        if failed:
+            regressions[name] = failed
+    return regressions
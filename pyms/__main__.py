@@ -1,6 +1,15 @@
-''' Allows pyms to run as a module '''
+''' Allows pyms to run as a module, `python -m pyms simulate --help` for the batch simulation
+and `python -m pyms noguess --help` to search for no guess boards '''
+import sys
 
 if __name__ == '__main__':
-    print('Running pyms as module')
-    from . import gui
-    gui.run()
+    if sys.argv[1:2] == ['simulate']:
+        from . import simulate
+        simulate.main(sys.argv[2:])
+    elif sys.argv[1:2] == ['noguess']:
+        from . import noguess
+        noguess.main(sys.argv[2:])
+    else:
+        print('Running pyms as module')
+        from . import gui
+        gui.run()
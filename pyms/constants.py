@@ -23,6 +23,11 @@ MODES = {
     5: MODE_CONFIG('Double Deck', 28, 16, None, 52 * 2, True)
 }
 
+# Custom mode, the grid size and IEDs (amount or rate) are chosen by the user
+CUSTOM = -1
+CUSTOM_DEFAULT = MODE_CONFIG('Custom', 100, 100, .15, 1500, False)
+CUSTOM_MAX = 1000
+
 # Circled Number constants
 
 # CIRCLED_NUMBERS = {i + 1: chr(0x2780 + i) for i in range(10)}
@@ -31,6 +36,11 @@ CIRCLED_NUMBERS = {i + 1: chr(0x2460 + i) for i in range(10)}
 # NEG_CIRCLED_NUMBERS = {i + 1: chr(0x2776 + i) for i in range(10)}
 NEG_CIRCLED_NUMBERS = {i + 1: chr(0x278A + i) for i in range(10)}
 
+# Keyboard flag bindings for Blackjack mode, mapped to the card values
+FLAG_KEYS = {key: min(num, 10) for num, key in enumerate('1234567890', 1)}
+FLAG_KEYS.update({key: min(num, 10) for num, key in enumerate('qweasdzxc', 4)})
+FLAG_KEYS.update({key.upper(): min(num, 10) for num, key in enumerate('qweasdzxc', 4)})
+
 # Numbered clues helper config
 TRACKER_CONFIG = namedtuple('TRACKER_CONFIG', 'max_check over_state tracked_num flag_state')
 
@@ -38,7 +48,7 @@ TRACKER_CONFIG = namedtuple('TRACKER_CONFIG', 'max_check over_state tracked_num
 HINT = namedtuple('HINT', 'frame label counter')
 
 # GUI Options
-OPTIONS = namedtuple('OPTIONS', 'mode sound mouseover tracker allow_hits')
+OPTIONS = namedtuple('OPTIONS', 'mode sound mouseover tracker allow_hits canvas opening probability no_guess')
 
 # Record data to support record class (follows order to be shown in highscore)
 RECORD = namedtuple('RECORD',
@@ -52,5 +62,11 @@ RECORD = namedtuple('RECORD',
             opt_mouseover
             opt_tracker
             opt_allow_hits
+            generator
+            start
+            opening
             '''
         )
+# Records saved before the generator was versioned all used the legacy generator (0),
+# and only the no guess boards, always placed with the opening, had a start cell
+RECORD.__new__.__defaults__ = (0, None, True)
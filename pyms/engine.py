@@ -0,0 +1,634 @@
+''' Headless board model, handles all the game logic without any widgets '''
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from sys import maxsize
+from random import Random, randrange
+from . import constants as c
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional, the pure python board is used without it
+    np = None
+
+# Boards with at least this many cells use the numpy backend when available
+NUMPY_MIN_SIZE = 10000
+
+# IED placement generators, the version goes along with the seed so recorded seeds reproduce the same field
+GENERATOR_LEGACY = 0    # rejection sampling of (x, y) coords, what all the seeds before versioning used
+GENERATOR_SAMPLE = 1    # sampling without replacement over the cell indexes, bounded for any rate
+GENERATOR_LATEST = GENERATOR_SAMPLE
+
+# Actions logged to the board replay, the flags are logged as ACTION_FLAG + the flag value
+ACTION_CLICK = 0
+ACTION_GUESS = 1
+ACTION_CHORD = 2
+ACTION_FLAG = 3
+
+# The card values of a single deck in the Blackjack modes, the face cards are all worth 10
+CARDS = tuple(range(1, 10)) + (10, ) * 4
+
+# Number of geometries to keep the neighbour tables of, enough for all the MODES and a few custom sizes
+NEIGHBOUR_TABLES_KEPT = 8
+# Number of recent layouts kept for each geometry, so playing a recent seed again skips the placement
+LAYOUTS_KEPT = 4
+
+
+@lru_cache(maxsize=NEIGHBOUR_TABLES_KEPT)
+def neighbour_table(width: int, height: int) -> list:
+    '''
+    The neighbour table shared by every board of the same geometry.
+    Each entry is filled with a tuple of the adjacent indexes on first lookup,
+    so huge custom fields only pay for the cells that are actually visited.
+    '''
+    return [None] * (width * height)
+
+
+class LayoutCache:
+    '''
+    The layouts (IEDs, values, clues) of the recently placed boards that don't depend on the first click,
+    i.e. the seeded and no guess boards, a few for each geometry.
+    The layouts are shared as is, the values and clues are never changed once placed.
+    '''
+    def __init__(self, kept: int = LAYOUTS_KEPT):
+        self.kept = kept
+        self.geometries = {}
+        # the boards can be prepared in a background thread
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple):
+        ''' The layout of the key, None if it isn't kept '''
+        with self.lock:
+            recent = self.geometries.get(key[:2], {})
+            layout = recent.get(key)
+            if layout is not None:
+                recent.move_to_end(key)
+            return layout
+
+    def put(self, key: tuple, layout: tuple):
+        ''' Keep the layout, dropping the oldest one of the geometry if there are too many '''
+        with self.lock:
+            recent = self.geometries.setdefault(key[:2], OrderedDict())
+            recent[key] = layout
+            recent.move_to_end(key)
+            while len(recent) > self.kept:
+                recent.popitem(last=False)
+
+
+LAYOUTS = LayoutCache()
+
+
+class Board:
+    '''
+    The board model behind the Field, can be played on its own without a Tk root.
+
+    Cells are referenced by a flat index, in which idx = x * height + y,
+    so sorting the indexes gives the same order as sorting the (x, y) coords.
+
+    Attributes:
+    values      - card value of the IED in each cell (0 if safe, 1 in normal modes)
+    clues       - the sum of the adjacent IED values for each cell
+    flags       - current flag of each cell (0 if unflagged)
+    revealed    - whether each cell has been revealed
+    flag_totals - running sum of the adjacent flags and revealed IED values for each cell
+    draws       - random draws of the placement made ahead of the first click, by the amount of excluded cells
+    '''
+    # pylint: disable=too-many-instance-attributes
+    # The attribute names follow the ones used by the Field before the model was split off
+
+    def __init__(self, mode: c.MODE_CONFIG = c.MODES.get(0), seed: int = None, allow_hits: int = 0,
+                 generator: int = None, opening: bool = False, start: int = None):
+        self.mode = mode
+        self.width = mode.x
+        self.height = mode.y
+        self.size = self.width * self.height
+        self.seed = seed
+        self.used_seed = seed is not None
+        self.generator = GENERATOR_LATEST if generator is None else generator
+        # keep the first click's adjacent cells clear as well so it opens up (not with seeds)
+        self.opening = opening
+        # the cell the board is placed around, wherever the first click is: the start cell of a no guess board,
+        # or the first click itself once placed, so the seed reproduces the board along with it
+        self.start = start
+
+        # The original intent was to use rate to determine amount,
+        # left here as a legacy, might be revisited
+        if mode.amount:
+            self.IED_count = mode.amount
+        else:
+            self.IED_count = int(self.size * mode.rate)
+
+        self.IEDs = set()
+        self.IEDs_are_set = False
+        self.draws = {}
+        self.values = [0] * self.size
+        self.clues = [0] * self.size
+        self.flags = [0] * self.size
+        self.flag_totals = [0] * self.size
+        self.revealed = [False] * self.size
+        self._adjacents = neighbour_table(self.width, self.height)
+
+        self.IED_current = self.IED_count
+        self.IED_guessed = 0
+        self.IED_hit = 0
+        self.IED_blew = 0
+        self.map_cleared = 0
+        self.map_goal = self.size - self.IED_count
+        self.is_over = False
+        self.is_won = False
+        self.last = None
+        self.allow_threshold(allow_hits if mode.special else 0)
+        # attach a replay.Replay to log the actions
+        self.replay = None
+
+    def index(self, coord: tuple) -> int:
+        ''' Convert (x, y) coord to the flat index '''
+        return coord[0] * self.height + coord[1]
+
+    def coord(self, idx: int) -> tuple:
+        ''' Convert the flat index to (x, y) coord '''
+        return divmod(idx, self.height)
+
+    def allow_threshold(self, state=0):
+        ''' Enable or disable hits threshold '''
+        self.allow_hits = state
+        self.IED_threshold = 21 if state > 0 else 0
+
+    def adjacents(self, idx: int) -> tuple:
+        ''' Adjacent cell indexes, looked up from the table shared across the games of the same geometry '''
+        adjacents = self._adjacents[idx]
+        if adjacents is None:
+            cx, cy = self.coord(idx)
+            adjacents = tuple(
+                rx * self.height + ry
+                for rx in range(max(cx - 1, 0), min(cx + 2, self.width))
+                for ry in range(max(cy - 1, 0), min(cy + 2, self.height))
+                if (rx, ry) != (cx, cy)
+            )
+            self._adjacents[idx] = adjacents
+        return adjacents
+
+    def adjacent_IEDs(self, idx: int) -> int:
+        ''' Find adjacent IED totals '''
+        return 0 if self.values[idx] else sum(self.values[adj] for adj in self.adjacents(idx))
+
+    def adjacent_flags(self, idx: int) -> int:
+        ''' Find adjacent Flag totals, revealed IEDs count towards the total '''
+        return int(self.flag_totals[idx])
+
+    def _add_to_adjacents(self, idx: int, amount: int):
+        ''' Keep the adjacent flag totals running as the flags and revealed IEDs change '''
+        totals = self.flag_totals
+        for adj in self.adjacents(idx):
+            totals[adj] += amount
+
+    @property
+    def fixed_layout(self) -> bool:
+        ''' Whether the IEDs are placed regardless of the first click '''
+        return self.used_seed or self.start is not None
+
+    def layout_key(self, current: int = None) -> tuple:
+        ''' Key of the layout in the LAYOUTS, the geometry (with the backend) goes first '''
+        geometry = (self.width, self.height, self.IED_count, self.mode.special)
+        return (type(self), geometry, self.seed, self.generator, current, self.opening and current is not None)
+
+    def set_IEDs(self, current: int = None):
+        ''' Initial planting of IEDs on first click '''
+        # check if set_IEDs has already been called
+        if self.IEDs_are_set:
+            return
+        # check if seed was provided, if not, generate a new seed
+        if self.seed is None:
+            self.seed = randrange(maxsize)
+        # if seed was used, ignore validation of current location
+        if self.start is not None:
+            current = self.start
+        elif self.used_seed:
+            current = None
+        # Only the layouts that don't depend on the first click can come around again
+        key = self.layout_key(current) if self.fixed_layout else None
+        layout = None if key is None else LAYOUTS.get(key)
+        if layout is None:
+            self.place_IEDs(current)
+            if key is not None:
+                LAYOUTS.put(key, (self.IEDs, self.values, self.clues))
+        else:
+            self.IEDs, self.values, self.clues = layout
+        self.IEDs_are_set = True
+        if self.start is None:
+            self.start = current
+        if self.replay is not None:
+            # the placement depends on the opening, which can still be toggled until now
+            self.replay.opening = self.opening
+            self.replay.start_cell = self.start
+
+    def place_IEDs(self, current: int = None):
+        ''' Place the IEDs clear of the current location, assign their values and compute the clues '''
+        rnd = Random(self.seed)
+        if self.generator == GENERATOR_LEGACY:
+            self.IEDs = self._legacy_IEDs(rnd, current)
+            cards = self._shuffled_cards(rnd)
+        elif self.generator == GENERATOR_SAMPLE:
+            excluded = self._excluded(current)
+            # The draws only depend on the amount of excluded cells, they may have been made ahead
+            sample, cards = self.draws.pop(len(excluded), None) or self._draw(rnd, len(excluded))
+            self.IEDs = self._sample_IEDs(sample, excluded)
+        else:
+            raise ValueError('Unknown generator version: {}'.format(self.generator))
+
+        # Use card values if Blackjack mode, else IEDs are assigned default value of 1 (True)
+        if cards is not None:
+            for IED in sorted(self.IEDs):
+                self.values[IED] = cards.pop()
+        else:
+            for IED in self.IEDs:
+                self.values[IED] = 1
+        self.compute_clues()
+
+    def prepare(self):
+        '''
+        Do the placement work that doesn't depend on the first click ahead of it, e.g. in a background thread.
+        The layouts placed regardless of the first click are placed in full into the LAYOUTS,
+        otherwise only the random draws for a first click in the middle of the field are made.
+        '''
+        if self.seed is None:
+            self.seed = randrange(maxsize)
+        if self.fixed_layout:
+            if LAYOUTS.get(self.layout_key(self.start)) is None:
+                # Placed on a twin, the IEDs of this board are only set on the first click
+                twin = type(self)(self.mode, seed=self.seed, generator=self.generator, opening=self.opening,
+                                  start=self.start)
+                twin.used_seed = self.used_seed
+                twin.set_IEDs()
+        elif self.generator == GENERATOR_SAMPLE:
+            excluded = len(self._excluded(self.index((self.width // 2, self.height // 2))))
+            self.draws[excluded] = self._draw(Random(self.seed), excluded)
+
+    def _shuffled_cards(self, rnd: Random) -> list:
+        ''' The card values to assign to the IEDs in Blackjack mode, None in normal modes '''
+        if not self.mode.special:
+            return None
+        cards = list(CARDS) * (self.mode.amount // 13)
+        rnd.shuffle(cards)
+        return cards
+
+    def _legacy_IEDs(self, rnd: Random, current: int = None) -> set:
+        ''' Randomize coord and add set if it's not the current location '''
+        # The number of draws blows up with the rate, only kept to reproduce the legacy seeds.
+        current_coord = None if current is None else self.coord(current)
+        coords = set()
+        while len(coords) < self.IED_count:
+            coord = (rnd.randrange(self.width), rnd.randrange(self.height))
+            if coord != current_coord:
+                coords.add(coord)
+        return {self.index(coord) for coord in coords}
+
+    def _excluded(self, current: int = None) -> list:
+        ''' The sorted cells kept clear of IEDs around the current location '''
+        excluded = []
+        if current is not None:
+            excluded = [current]
+            # only clear the whole opening if there is room for all the IEDs
+            if self.opening and self.size - 9 >= self.IED_count:
+                excluded += self.adjacents(current)
+            excluded.sort()
+        return excluded
+
+    def _draw(self, rnd: Random, excluded: int) -> tuple:
+        ''' The (cell sample, cards) drawn by the sample generator, which only depend on the amount of excluded cells '''
+        sample = rnd.sample(range(self.size - excluded), self.IED_count)
+        return sample, self._shuffled_cards(rnd)
+
+    def _sample_IEDs(self, sample: list, excluded: list) -> set:
+        ''' Shift the sampled cell indexes past the excluded cells '''
+        IEDs = set()
+        for idx in sample:
+            # shift the sampled index past the excluded cells before it
+            for skipped in excluded:
+                if idx >= skipped:
+                    idx += 1
+            IEDs.add(idx)
+        return IEDs
+
+    def compute_clues(self):
+        ''' Compute the clue of every cell once the IEDs are set '''
+        # Scatter each IED value onto its neighbours, IED cells themselves show no clue
+        for IED in self.IEDs:
+            for adj in self.adjacents(IED):
+                self.clues[adj] += self.values[IED]
+        for IED in self.IEDs:
+            self.clues[IED] = 0
+
+    def _set_flag(self, idx: int, num: int):
+        ''' Set the flag and manage the IED count '''
+        # An unrevealed flag takes up one of the IEDs, revealing a flagged cell keeps it counted.
+        if not self.revealed[idx]:
+            self.IED_current += bool(self.flags[idx]) - bool(num)
+        self._add_to_adjacents(idx, int(num) - int(self.flags[idx]))
+        self.flags[idx] = num
+
+    def flag(self, idx: int, num: int = None) -> bool:
+        ''' Toggle the flag on an unrevealed cell, returns whether the flag changed '''
+        if self.is_over or self.revealed[idx]:
+            return False
+        if num is None:
+            num = 1
+        self._log(idx, ACTION_FLAG + num)
+        if self.flags[idx] == num:
+            num = 0
+        if self.flags[idx] == num:
+            return False
+        self._set_flag(idx, num)
+        return True
+
+    def reveal(self, idx: int, guess_safe=None, over_and_clear=None) -> bool:
+        ''' Reveal the cell if not already revealed, returns whether it was revealed '''
+        go_ahead = not self.revealed[idx] and bool(self.flags[idx] == 0 or guess_safe is not None)
+        if go_ahead:
+            if not self.IEDs_are_set:
+                self.set_IEDs(idx)
+            self.revealed[idx] = True
+            if self.flags[idx]:
+                self._set_flag(idx, 0)
+            elif self.values[idx] and over_and_clear is None:
+                self.IED_current -= 1
+            # Only IEDs add to the totals when revealed, the flood fill never reaches them.
+            if self.values[idx]:
+                self._add_to_adjacents(idx, int(self.values[idx]))
+        return go_ahead
+
+    def clicked(self, idx: int, guess_safe=None) -> list:
+        ''' Click on a cell, returns the list of revealed cell indexes '''
+        revealed = []
+        if not self.is_over:
+            self._log(idx, ACTION_CLICK)
+            self._clicked(idx, guess_safe, revealed)
+        return revealed
+
+    def _log(self, idx: int, action: int):
+        ''' Log the action to the replay if there is one '''
+        if self.replay is not None:
+            self.replay.log(idx, action)
+
+    def _clicked(self, idx: int, guess_safe, revealed: list):
+        ''' Reveal the cell and open adjacent cells if current is empty '''
+        if self.reveal(idx, guess_safe=guess_safe):
+            revealed.append(idx)
+
+            # Do the check regardless if guessed, safe or not.
+            if self.values[idx]:
+                self.check_threshold(idx, guess_safe=guess_safe)
+                return
+            opened = self.open_adjacents(idx, revealed) if self.clues[idx] == 0 else 0
+            if guess_safe is False:
+                self.bewm(idx)
+            else:
+                self.check_clear(1 + opened)
+
+    def open_adjacents(self, idx: int, revealed: list) -> int:
+        '''
+        Flood fill the opening around an empty cell with a queue instead of recursing,
+        the newly revealed cells are appended to revealed and the amount is returned.
+        '''
+        # Cells next to an empty cell can never be IEDs, so they can be revealed directly.
+        start = len(revealed)
+        queue = deque((idx, ))
+        while queue:
+            for adj in self.adjacents(queue.popleft()):
+                if not self.revealed[adj] and not self.flags[adj]:
+                    self.revealed[adj] = True
+                    revealed.append(adj)
+                    if self.clues[adj] == 0:
+                        queue.append(adj)
+        return len(revealed) - start
+
+    def guess(self, idx: int) -> list:
+        ''' Mid click guess, safe if the flag matches the cell value '''
+        if self.is_over:
+            return []
+        self._log(idx, ACTION_GUESS)
+        self.IED_guessed += 1
+        if not self.revealed[idx]:
+            self.set_IEDs(idx)
+        revealed = []
+        self._clicked(idx, bool(self.flags[idx] == self.values[idx]), revealed)
+        return revealed
+
+    def chord(self, idx: int) -> list:
+        ''' Open adjacent cells, returns None if the flags don't add up to the clue '''
+        if self.is_over:
+            return []
+        self._log(idx, ACTION_CHORD)
+        if not (self.revealed[idx] and self.adjacent_flags(idx) == self.clues[idx]):
+            return None
+        revealed = []
+        for adj in self.adjacents(idx):
+            if self.is_over:
+                break
+            self._clicked(adj, None, revealed)
+        return revealed
+
+    def check_threshold(self, idx: int, guess_safe=None):
+        ''' Check if threshold is exceeded '''
+        if not guess_safe:
+            self.IED_hit += int(self.values[idx])
+            self.IED_blew += 1
+        if self.IED_hit > self.IED_threshold or (self.allow_hits < 2 and guess_safe is None):
+            self.bewm(idx)
+
+    def bewm(self, last: int):
+        ''' When the field blows up '''
+        self.is_over = True
+        self.last = last
+
+    def check_clear(self, cleared: int = 1):
+        ''' Check for when the field is cleared, once per batch of cleared cells '''
+        self.map_cleared += cleared
+        if self.map_cleared >= self.map_goal:
+            self.is_over = True
+            self.is_won = True
+
+    def expose_IEDs(self, clear: bool) -> list:
+        ''' Reveal the unflagged IEDs when over, returns the list of exposed indexes '''
+        exposed = [IED for IED in sorted(self.IEDs) if self.reveal(IED, over_and_clear=clear)]
+        return exposed
+
+    def false_flags(self) -> list:
+        ''' Find the flags that don't match the cell value '''
+        return [idx for idx, flag in enumerate(self.flags) if flag and flag != self.values[idx]]
+
+
+def custom_mode(x: int, y: int, IEDs) -> c.MODE_CONFIG:
+    '''
+    Create the custom MODE_CONFIG, raises ValueError if the size or IEDs don't fit.
+
+    x, y    = grid size, up to CUSTOM_MAX each
+    IEDs    = amount of IEDs, or the rate as a str ending with "%" (e.g. "15%") or a fraction below 1 (e.g. "0.15")
+    '''
+    try:
+        x, y = int(x), int(y)
+    except ValueError:
+        raise ValueError('Width and height must be whole numbers.')
+    if not (1 < x <= c.CUSTOM_MAX and 1 < y <= c.CUSTOM_MAX):
+        raise ValueError('Width and height must be between 2 and {}.'.format(c.CUSTOM_MAX))
+    rate = None
+    if isinstance(IEDs, str):
+        IEDs = IEDs.strip()
+        try:
+            if IEDs.endswith('%'):
+                rate = float(IEDs[:-1]) / 100
+            else:
+                IEDs = float(IEDs)
+        except ValueError:
+            raise ValueError('IEDs must be an amount or a rate, e.g. 1500, 15% or 0.15.')
+    if isinstance(IEDs, float) and rate is None:
+        if IEDs < 1:
+            rate = IEDs
+        elif not IEDs.is_integer():
+            raise ValueError('IEDs must be a whole amount, or a rate below 1.')
+    amount = int(x * y * rate) if rate is not None else int(IEDs)
+    # Always leave a cell free for the first click
+    if not 0 < amount < x * y:
+        raise ValueError('IEDs must be between 1 and {} for a {}x{} grid.'.format(x * y - 1, x, y))
+    return c.MODE_CONFIG(c.CUSTOM_DEFAULT.name, x, y, rate, amount, False)
+
+
+class NumpyBoard(Board):
+    '''
+    Board backend that keeps the cell states in numpy arrays.
+
+    The whole clue grid is computed in one convolution pass right after the IEDs are set,
+    and the per-cell lookups just index the arrays.
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = np.zeros(self.size, dtype=np.int8)
+        self.clues = np.zeros(self.size, dtype=np.int16)
+        self.flags = np.zeros(self.size, dtype=np.int8)
+        self.revealed = np.zeros(self.size, dtype=bool)
+        self.flag_totals = np.zeros(self.size, dtype=np.int16)
+
+    def grid(self, cells):
+        ''' Return a (x, y) shaped view of the flat cell array '''
+        return cells.reshape(self.width, self.height)
+
+    def compute_clues(self):
+        ''' Sum the 3x3 window around each cell in one pass over the padded value grid '''
+        values = self.grid(self.values).astype(np.int16)
+        padded = np.pad(values, 1)
+        clues = -values
+        for dx in range(3):
+            for dy in range(3):
+                clues = clues + padded[dx:dx + self.width, dy:dy + self.height]
+        clues[values > 0] = 0
+        self.clues = clues.ravel()
+
+    def _window(self, cells, idx: int):
+        ''' The 3x3 window of the cell array around idx, clipped to the board '''
+        x, y = self.coord(idx)
+        return self.grid(cells)[max(x - 1, 0):x + 2, max(y - 1, 0):y + 2]
+
+    def adjacent_IEDs(self, idx: int) -> int:
+        if self.values[idx]:
+            return 0
+        return int(self._window(self.values, idx).sum())
+
+    def false_flags(self) -> list:
+        return np.flatnonzero((self.flags != 0) & (self.flags != self.values)).tolist()
+
+
+BACKENDS = {
+    'python': Board,
+    'numpy': NumpyBoard,
+}
+
+def format_seed(seed: int, generator: int = GENERATOR_LEGACY, start: int = None, opening: bool = True) -> str:
+    '''
+    Show the seed along with its generator version and the start cell the board was placed around,
+    as "generator:seed@start" if the opening was kept clear around it or "generator:seed#start" if only the cell was.
+    Legacy seeds are shown without the generator.
+    '''
+    text = str(seed) if generator == GENERATOR_LEGACY else '{}:{}'.format(generator, seed)
+    if start is not None:
+        text += '{}{}'.format('@' if opening else '#', start)
+    return text
+
+def parse_seed(text: str) -> tuple:
+    '''
+    Parse the "generator:seed@start" str back to (seed, generator, start, opening), raises ValueError if invalid.
+    The opening is None without a start cell.
+    '''
+    text = str(text).strip()
+    opening = '#' not in text
+    text, _, start = text.replace('#', '@').partition('@')
+    generator, _, seed = text.rpartition(':')
+    generator = int(generator) if generator else GENERATOR_LEGACY
+    seed = int(seed)
+    start = int(start) if start else None
+    opening = opening if start is not None else None
+    if not 0 <= generator <= GENERATOR_LATEST or not 0 <= seed <= maxsize or (start is not None and start < 0):
+        raise ValueError('Invalid seed: {}'.format(text))
+    return seed, generator, start, opening
+
+def create_board(mode: c.MODE_CONFIG, backend: str = None, **kwargs) -> Board:
+    '''
+    Create the board with the requested backend, the kwargs are passed on to the board.
+    If no backend is requested, numpy is used for large boards when it is installed.
+    '''
+    if backend is None:
+        large = mode.x * mode.y >= NUMPY_MIN_SIZE
+        backend = 'numpy' if np is not None and large else 'python'
+    elif backend == 'numpy' and np is None:
+        raise ImportError('The numpy backend requires numpy to be installed')
+    return BACKENDS[backend](mode, **kwargs)
+
+def prepare_board(mode: c.MODE_CONFIG, **kwargs) -> Board:
+    ''' Create the board and do the placement work that doesn't depend on the first click '''
+    board = create_board(mode, **kwargs)
+    board.prepare()
+    return board
+
+
+class BoardMaker:
+    '''
+    Prepares the next board in a background thread while the current game is played,
+    so starting it only takes the board that is already made.
+    The boards are requested by (mode, seed, generator, start), the other options can be set once taken.
+    '''
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pyms-boards')
+        self.next = None
+
+    def request(self, mode: c.MODE_CONFIG, seed: int = None, generator: int = None, start: int = None,
+                opening: bool = False):
+        ''' Start preparing the board of the request, in place of the one prepared before '''
+        if self.next is not None:
+            self.next[1].cancel()
+        future = self.executor.submit(
+            prepare_board, mode, seed=seed, generator=generator, start=start, opening=opening
+        )
+        self.next = ((mode, seed, generator, start), future)
+
+    def warm(self, mode: c.MODE_CONFIG, seed: int, generator: int = None, start: int = None, opening: bool = False):
+        ''' Place the layout of the seed into the LAYOUTS, so playing it again is instant '''
+        self.executor.submit(prepare_board, mode, seed=seed, generator=generator, start=start, opening=opening)
+
+    def take(self, mode: c.MODE_CONFIG, seed: int = None, generator: int = None, start: int = None,
+             allow_hits: int = 0, opening: bool = False) -> Board:
+        ''' The board prepared for the request (waiting for it if needed), otherwise a new one '''
+        prepared, self.next = self.next, None
+        if prepared is not None:
+            if prepared[0] == (mode, seed, generator, start):
+                board = prepared[1].result()
+                board.allow_threshold(allow_hits if mode.special else 0)
+                board.opening = opening
+                return board
+            prepared[1].cancel()
+        return create_board(mode, seed=seed, generator=generator, start=start, allow_hits=allow_hits,
+                            opening=opening)
+
+    def close(self):
+        ''' Drop the boards still waiting to be prepared '''
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,13 +1,27 @@
 ''' Main core of GUI '''
 import tkinter as tk
-from tkinter.messagebox import showinfo
-from tkinter.simpledialog import askinteger
-
-from sys import maxsize
-from time import time
-from random import Random, randrange
+from tkinter import simpledialog
+from tkinter.filedialog import asksaveasfilename
+from tkinter.messagebox import showinfo, showerror
+from tkinter.simpledialog import askstring
+
+from heapq import heappop, heappush
+from itertools import chain, count
+from math import ceil
+from time import perf_counter
 from . import constants as c
+from . import engine
+from . import instrument
 from . import recorder
+from . import noguess
+from . import replay
+from . import solver
+
+# Seconds of a frame of the progressive reveals, and the most they take in all
+REVEAL_FRAME = 1 / 60
+REVEAL_SECONDS = .5
+# Seconds a failed chord flashes for
+FLASH_SECONDS = .25
 
 
 class MyIntVar(tk.IntVar):
@@ -21,6 +35,107 @@ class MyIntVar(tk.IntVar):
     def change(self, num):
         self.set(self.get() + num)
 
+class Refresher:
+    '''
+    Collects the view updates and flushes them once the event loop is idle,
+    so the model can change freely and each var or widget is only written once per turn.
+    '''
+    def __init__(self, root):
+        self.root = root
+        self._vars = {}
+        self._configs = {}
+        self._pending = None
+
+    def set(self, var: tk.Variable, value):
+        ''' Set the var on the next flush, only the last value is kept '''
+        # tk vars aren't hashable, but their names are unique
+        self._vars[str(var)] = (var, value)
+        self._schedule()
+
+    def config(self, widget, **options):
+        ''' Config the widget on the next flush, the options are merged with any not yet flushed '''
+        self._configs.setdefault(widget, {}).update(options)
+        self._schedule()
+
+    def _schedule(self):
+        if self._pending is None:
+            self._pending = self.root.after_idle(self.flush)
+
+    def flush(self):
+        ''' Write out all the updates collected so far, unchanged vars don't trigger their traces '''
+        self._pending = None
+        variables, self._vars = self._vars, {}
+        configs, self._configs = self._configs, {}
+        for var, value in variables.values():
+            if var.get() != value:
+                var.set(value)
+        for widget, options in configs.items():
+            widget.config(**options)
+
+class Scheduler:
+    '''
+    Runs all the timed UI work (the timer ticks, flashes and progressive reveals) off a single `after` job.
+    The work is due on the monotonic perf_counter clock, so it doesn't drift with the event loop delays
+    or jump with the system clock.
+    '''
+    def __init__(self, root):
+        self.root = root
+        # heap of [due, order, func], the func is cleared to cancel
+        self._queue = []
+        self._order = count()
+        self._job = None
+        self._due = None
+
+    @staticmethod
+    def now() -> float:
+        return perf_counter()
+
+    def at(self, due: float, func) -> list:
+        ''' Run func once the clock gets to due, returns the entry to cancel it with '''
+        entry = [due, next(self._order), func]
+        heappush(self._queue, entry)
+        if self._due is None or due < self._due:
+            self._arm()
+        return entry
+
+    def after(self, seconds: float, func) -> list:
+        ''' Run func in the seconds '''
+        return self.at(self.now() + seconds, func)
+
+    @staticmethod
+    def cancel(entry: list):
+        ''' Cancel the entry, it is dropped once it comes up '''
+        if entry is not None:
+            entry[2] = None
+
+    def _arm(self):
+        ''' Set the after job for the earliest entry '''
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        while self._queue and self._queue[0][2] is None:
+            heappop(self._queue)
+        if not self._queue:
+            self._due = None
+            return
+        self._due = self._queue[0][0]
+        # Rounded up to the ms, so it never runs before it is due
+        self._job = self.root.after(max(0, ceil((self._due - self.now()) * 1000)), self._run)
+
+    def _run(self):
+        ''' Run everything that is due, in order '''
+        self._job = None
+        self._due = None
+        try:
+            now = self.now()
+            while self._queue and self._queue[0][0] <= now:
+                func = heappop(self._queue)[2]
+                if func is not None:
+                    func()
+        finally:
+            self._arm()
+
+
 class GUI(tk.Tk):
     ''' Main tkinter class that hosts window configs '''
     # pylint: disable=too-many-instance-attributes
@@ -34,25 +149,58 @@ class GUI(tk.Tk):
         # generic image to force compound sizing on widgets
         self.empty_image = tk.PhotoImage(width=1, height=1)
 
+        # Custom mode for the session, until the user picks another size
+        self.custom_mode = c.CUSTOM_DEFAULT
+        # No guess seeds, only opened once the option is used
+        self.seed_index = None
+        self.seed_filler = None
+        # SeedIndex.key of the modes the player was told the search gave up on
+        self.no_guess_told = set()
+        # The next board is prepared in the background while the current one is played
+        self.board_maker = engine.BoardMaker()
+        # Only set up once the hidden debug menu is asked for
+        self.debug_menu = None
+        self.instruments = None
+
+        # Batch the counter and helper updates to once per event loop turn
+        self.refresher = Refresher(self)
+        # All the timed updates run off the one clock
+        self.scheduler = Scheduler(self)
+
         # Create record instance and load records and options
         self.record_keeper = recorder.RecordKeeper(self)
 
         opt_val = self.record_keeper.load()
+        default_val = [3, 0, 1, 1, 1, 0, 0, 0, 0]
         if not opt_val:
             # set default values if nothing to load
-            opt_val = [3, 0, 1, 1, 1]
+            opt_val = default_val
+        # fill in any options added since the records were saved
+        opt_val = list(opt_val) + default_val[len(opt_val):]
+        custom = self.record_keeper.custom_size()
+        if custom is not None:
+            try:
+                self.custom_mode = engine.custom_mode(*custom)
+            except ValueError:
+                # Out of the current limits, back to the default
+                pass
 
         # Set up tk variables and create menus and timer
         self.options = c.OPTIONS(
             tk.IntVar(name='Mode'),
             *(tk.BooleanVar(name=opt_name) for opt_name in ('Warning Sound', 'Σ Mouseover Hint', '⚑ Flags Tracker')),
-            tk.IntVar(name='Hits Option')
+            tk.IntVar(name='Hits Option'),
+            tk.BooleanVar(name='▦ Canvas Field'),
+            tk.BooleanVar(name='◌ First Click Opening'),
+            tk.BooleanVar(name='% IED Probability Hint'),
+            tk.BooleanVar(name='◎ No Guess Boards')
         )
         for _idx, _opt in enumerate(self.options):
             _opt.set(opt_val[_idx])
             _opt.trace('w', lambda *_, idx=_idx: self.option_callback(idx))
         self.create_menus()
         self.wm_protocol('WM_DELETE_WINDOW', self.exit)
+        self.bind('<Control-D>', self.show_debug_menu)
         self.taco_bell(self.options.sound.get())
         self.timer = Timer(self)
         # self.field = None
@@ -80,7 +228,7 @@ class GUI(tk.Tk):
         self.frm_helper.grid_columnconfigure(index=0, weight=1)
         self.frm_helper.bind('<Expose>', GUI.widget_exposed)
         self.hinter.build()
-        self.build_field(c.MODES.get(self.options.mode.get()))
+        self.build_field(self.current_mode())
 
     def taco_bell(self, state):
         ''' Toggle bell '''
@@ -88,7 +236,7 @@ class GUI(tk.Tk):
 
     def check_allow_hits(self, state):
         ''' Toggle hits if using numbered mode '''
-        if state > 0 and self.options.mode.get() >= 3:
+        if state > 0 and self.current_mode().special:
             self.frm_IEDs.grid_configure(columnspan=1)
             self.frm_blew.grid()
         else:
@@ -109,7 +257,11 @@ class GUI(tk.Tk):
             self.taco_bell,
             self.hinter.show,
             self.clueshelper.show,
-            self.check_allow_hits
+            self.check_allow_hits,
+            lambda _: self.build_field(self.options.mode.get()),
+            self.field.allow_opening,
+            self.show_probability,
+            self.top_up_no_guess
         ]
         try:
             # pylint: disable=protected-access
@@ -141,6 +293,9 @@ class GUI(tk.Tk):
                 variable=self.options.mode
             )
 
+        norm_modes.add_separator()
+        norm_modes.add_command(label='Custom...', command=self.ask_for_custom)
+
         # Adding difficulty menu...
         diff_menu = tk.Menu(self, tearoff=0)
         diff_menu.add_cascade(label='☺ Normal', menu=norm_modes)
@@ -155,6 +310,10 @@ class GUI(tk.Tk):
         o = self.options
         self.options_menu.add_command(label='Retry/Use seed...', command=self.ask_for_seed)
         self.options_menu.add_checkbutton(label=o.sound._name, variable=o.sound)            #pylint: disable=protected-access
+        self.options_menu.add_checkbutton(label=o.canvas._name, variable=o.canvas)          #pylint: disable=protected-access
+        self.options_menu.add_checkbutton(label=o.opening._name, variable=o.opening)        #pylint: disable=protected-access
+        self.options_menu.add_checkbutton(label=o.probability._name, variable=o.probability)    #pylint: disable=protected-access
+        self.options_menu.add_checkbutton(label=o.no_guess._name, variable=o.no_guess)      #pylint: disable=protected-access
         self.special_menu.add_checkbutton(label=o.mouseover._name, variable=o.mouseover)    #pylint: disable=protected-access
         self.special_menu.add_checkbutton(label=o.tracker._name, variable=o.tracker)        #pylint: disable=protected-access
 
@@ -168,18 +327,96 @@ class GUI(tk.Tk):
         # Compile the menus together...
         menubar.add_cascade(label='Modes', menu=diff_menu)
         menubar.add_cascade(label='Options', menu=self.options_menu)
-        menubar.add_command(label='Highscores', command=lambda x=self.options.mode: self.record_keeper.show(x.get()))
+        menubar.add_command(label='Highscores', command=lambda: self.record_keeper.show(self.current_mode()))
         self.config(menu=menubar)
+        self.menubar = menubar
+
+    def show_debug_menu(self, evt=None):
+        ''' Add the hidden debug menu (Ctrl+Shift+D) to the menu bar '''
+        # pylint: disable=unused-argument
+        if self.debug_menu is not None:
+            return
+        self.instruments = instrument.Instruments(HOT_PATHS, inputs=HOT_PATH_INPUTS, redraw=(Refresher, 'flush'))
+        self.instrumenting = tk.BooleanVar(self, name='Instrument Hot Paths')
+        self.profiling = tk.BooleanVar(self, name='Profile Session')
+        self.debug_menu = tk.Menu(self, tearoff=0)
+        self.debug_menu.add_checkbutton(
+            label=self.instrumenting._name, variable=self.instrumenting, command=self.toggle_instruments   #pylint: disable=protected-access
+        )
+        self.debug_menu.add_command(label='Dump Instrumentation...', command=self.dump_instruments)
+        self.debug_menu.add_command(label='Reset Instrumentation', command=self.instruments.reset)
+        self.debug_menu.add_separator()
+        self.debug_menu.add_checkbutton(
+            label=self.profiling._name, variable=self.profiling, command=self.toggle_profile       #pylint: disable=protected-access
+        )
+        self.menubar.add_cascade(label='Debug', menu=self.debug_menu)
+
+    def toggle_instruments(self):
+        ''' Time the hot paths, the methods are only wrapped while it is on '''
+        if self.instrumenting.get():
+            self.instruments.enable()
+        else:
+            self.instruments.disable()
+
+    def dump_instruments(self):
+        ''' Save the call counts and latency histograms as JSON '''
+        filename = asksaveasfilename(
+            parent=self, title='Dump Instrumentation', defaultextension='.json', filetypes=[('JSON', '*.json')]
+        )
+        if filename:
+            self.instruments.dump(filename)
+
+    def toggle_profile(self):
+        ''' Start the cProfile capture, or stop and save it '''
+        if self.profiling.get():
+            self.instruments.start_profile()
+        else:
+            filename = asksaveasfilename(
+                parent=self, title='Save Profile', defaultextension='.prof', filetypes=[('cProfile', '*.prof')]
+            )
+            self.instruments.stop_profile(filename)
+
+    def show_probability(self, state):
+        ''' Toggle the IED probability hint, only shown in the Normal modes '''
+        self.field.track_probability(state)
+        if not self.field.mode.special:
+            self.hinter.show(state)
+
+    def top_up_no_guess(self, state=True, mode: c.MODE_CONFIG = None):
+        ''' Search for more no guess seeds of the mode (current by default) in the background '''
+        if state:
+            if self.seed_filler is None:
+                self.seed_filler = noguess.Filler()
+                self.seed_filler.start()
+            self.seed_filler.request(mode or self.current_mode())
+
+    def pop_no_guess(self, mode: c.MODE_CONFIG):
+        ''' Take a no guess seed of the mode from the index, None if there are none found yet '''
+        if self.seed_index is None:
+            self.seed_index = noguess.SeedIndex()
+        found = self.seed_index.pop(mode)
+        self.top_up_no_guess(mode=mode)
+        if found is None and self.seed_filler.gave_up_on(mode) and noguess.SeedIndex.key(mode) not in self.no_guess_told:
+            self.no_guess_told.add(noguess.SeedIndex.key(mode))
+            showinfo(
+                'No Guess Boards',
+                'No guess boards of {} are too rare for the background search to keep up with, '
+                'regular boards are played instead for the rest of the session.\n'
+                'They can still be searched for ahead of time with: python -m pyms noguess'.format(mode.name)
+            )
+        return found
 
     def ask_for_seed(self):
         ''' Dialog window to request and validate seed from user '''
         cur_seed = self.field.seed
         prev_seed = self.field.previous_seed
         default_seed = cur_seed if cur_seed else prev_seed if prev_seed else ''
-        seed = askinteger(
+        seed = askstring(
             'Generate from seed',
             '\n'.join((
-                'Please enter the seed number you wish to use.\n',
+                'Please enter the seed number you wish to use.',
+                '(Seeds from older versions have no "#:" generator prefix,',
+                'the start cell follows the "@" with the opening or the "#" without)\n',
                 'Previous seed: {prev}{default}'.format(
                     prev=str(prev_seed),
                     default=' <-' if default_seed == prev_seed else ''
@@ -190,13 +427,31 @@ class GUI(tk.Tk):
                     ),
                 '\nNote: Highscores will NOT be recorded!'
             )),
-            minvalue=0,
-            maxvalue=maxsize,
             parent=self,
             initialvalue=default_seed
         )
         if seed:
-            self.build_field(mode=self.options.mode.get(), seed=seed)
+            try:
+                seed, generator, start, opening = engine.parse_seed(seed)
+            except ValueError:
+                showerror('Invalid seed', 'The seed should be a number, optionally prefixed by the generator, e.g. "1:12345".')
+                return
+            self.build_field(mode=self.options.mode.get(), seed=seed, generator=generator, start=start, opening=opening)
+
+    def ask_for_custom(self):
+        ''' Dialog window to request the grid size and IEDs of the custom mode '''
+        dialog = CustomModeDialog(self, self.custom_mode)
+        if dialog.result:
+            self.custom_mode = dialog.result
+            # Setting the mode triggers the rebuild, even if custom mode was already selected
+            self.options.mode.set(c.CUSTOM)
+
+    def get_mode(self, mode: int) -> c.MODE_CONFIG:
+        ''' Convert the mode option to MODE_CONFIG '''
+        return self.custom_mode if mode == c.CUSTOM else c.MODES.get(mode)
+
+    def current_mode(self) -> c.MODE_CONFIG:
+        return self.get_mode(self.options.mode.get())
 
     def build_status_bar(self):
         ''' Build the timer, big button and counter '''
@@ -207,7 +462,7 @@ class GUI(tk.Tk):
         self.btn_main = tk.Button(
             self.frm_status,
             image=self.empty_image,
-            command=lambda: self.build_field(c.MODES.get(self.options.mode.get())),
+            command=lambda: self.build_field(self.current_mode()),
             width=32,
             height=32,
             compound='c',
@@ -231,13 +486,21 @@ class GUI(tk.Tk):
         self.lbl_IEDs.pack()
         self.lbl_blew.pack()
 
-    def build_field(self, mode: c.MODE_CONFIG, seed=None):
-        ''' Build the field frame, stop the timer and update the counters '''
+    def build_field(self, mode: c.MODE_CONFIG, seed=None, generator=None, start=None, opening=None):
+        '''
+        Build the field frame, stop the timer and update the counters.
+        The opening of a seed with a start cell is the one it was placed with, no guess boards always have it.
+        '''
         # Quick check if int is provided, convert to MODE_CONFIG.
         if isinstance(mode, int):
-            mode = c.MODES.get(mode)
+            mode = self.get_mode(mode)
+        used_seed = seed is not None
+        if not used_seed and self.options.no_guess.get():
+            # Falls back to a regular board until the background search finds some
+            seed, generator, start = self.pop_no_guess(mode) or (None, None, None)
 
         # See if possible to seperate the special mode later....
+        self.hinter.arrange(mode.special)
         if mode.special:
             self.clueshelper.build(mode.amount // 13)
             self.options_menu.entryconfig('♠ ⃞ Blackjack', state=tk.NORMAL)
@@ -246,9 +509,9 @@ class GUI(tk.Tk):
         else:
             self.options_menu.entryconfig('♠ ⃞ Blackjack', state=tk.DISABLED)
             if self.hinter.exists:
-                self.hinter.show(False)
+                self.hinter.show(self.options.probability.get())
             if self.clueshelper.exists:
-                self.clueshelper.destroy()
+                self.clueshelper.deactivate()
 
         # See if allow_hit frame needs to be hidden or shown
         self.check_allow_hits(self.options.allow_hits.get())
@@ -257,7 +520,9 @@ class GUI(tk.Tk):
         # if not self.field is None:
         #     self.field.destroy()
         # self.field = Field(self, mode, seed=seed)
-        self.field.build(mode=mode, seed=seed)
+        self.field.build(mode=mode, seed=seed, generator=generator, start=start, opening=opening, used_seed=used_seed)
+        if not self.options.no_guess.get():
+            self.board_maker.request(mode, opening=self.options.opening.get())
         self.lbl_IEDs.config(textvariable=self.field.IED_current)
         self.lbl_blew.config(textvariable=self.field.IED_hit)
         self.update_status(c.STATUS_OKAY)
@@ -265,7 +530,8 @@ class GUI(tk.Tk):
 
     def update_status(self, status:c.STATUS):
         ''' Update main happy face button '''
-        self.btn_main.config(
+        self.refresher.config(
+            self.btn_main,
             text=status.icon,
             fg=status.fg,
             bg=status.bg,
@@ -274,6 +540,14 @@ class GUI(tk.Tk):
 
     def exit(self, save=True):
         if save: self.record_keeper.save()
+        self.record_keeper.close()
+        self.board_maker.close()
+        if self.instruments is not None:
+            self.instruments.stop_profile()
+        if self.seed_filler is not None:
+            self.seed_filler.close()
+        if self.seed_index is not None:
+            self.seed_index.close()
         self.destroy()
         self.quit()
 
@@ -283,48 +557,55 @@ class GUI(tk.Tk):
 class Timer:
     '''
     Timer object to manage... the timer...
-    Most of the methods are rather self explanatory
+    Ticks on each whole second since the start on the scheduler clock, so the seconds never drift, skip or repeat.
     '''
     def __init__(self, parent):
         self.parent = parent
         self.string = tk.StringVar()
-        self._job = None
-        self.start_time = 0
+        self._tick = None
+        self.start_time = None
         self.end_time = 0
         self.active = False
         self.reset()
 
     def stop_update(self):
         self.active = False
-        if self._job is not None:
-            self.parent.after_cancel(self._job)
-            self._job = None
+        self.parent.scheduler.cancel(self._tick)
+        self._tick = None
 
     def reset(self):
         self.stop_update()
         self.string.set('00:00:00')
-        self.start_time = 0
+        self.start_time = None
         self.end_time = 0
 
     def start(self):
-        self.start_time = time()
+        self.start_time = self.parent.scheduler.now()
         self.active = True
         self._update()
 
+    def elapsed(self) -> float:
+        ''' Seconds since the start '''
+        return 0.0 if self.start_time is None else self.parent.scheduler.now() - self.start_time
+
     def _update(self):
         if self.active:
-            self.to_string()
-            self._job = self.parent.after(ms=1000, func=self._update)
+            current = self.elapsed()
+            self.to_string(current)
+            self._tick = self.parent.scheduler.at(self.start_time + int(current) + 1, self._update)
 
-    def to_string(self):
-        ''' Format and set the string variable to the time '''
-        current = time() - self.start_time
+    def to_string(self, current: float, precise: bool = False):
+        ''' Format and set the string variable to the time, down to the ms if precise '''
         h, m, s = int(current // 3600), int(current % 3600 // 60), int(current % 60)
-        self.string.set('{h:02}:{m:02}:{s:02}'.format(h=h, m=m, s=s))
+        text = '{h:02}:{m:02}:{s:02}'.format(h=h, m=m, s=s)
+        if precise:
+            text += '.{:03}'.format(int(current * 1000) % 1000)
+        self.string.set(text)
 
     def stop(self):
-        self.end_time = time() - self.start_time
-        self.to_string()
+        ''' Stop at the time to the ms, as recorded with the highscores '''
+        self.end_time = round(self.elapsed(), 3)
+        self.to_string(self.end_time, precise=True)
         self.stop_update()
 
 
@@ -337,10 +618,25 @@ class Field:
     def __init__(self, parent: GUI):
         self.parent = parent
         self.frame = None
+        self.board = None
+        self.layout = None
+        self.probabilities = None
         self.__used_seed = False
-        self.seed = None
+        # the next wave of the IEDs exposed at the end
+        self._reveal = None
         self.previous_seed = None
-    
+
+    @property
+    def seed(self):
+        ''' The seed along with its generator version, as shown to the user '''
+        if self.board is None or self.board.seed is None:
+            return None
+        return engine.format_seed(self.board.seed, self.board.generator, self.board.start, self.board.opening)
+
+    @property
+    def is_over(self):
+        return self.board.is_over
+
     @property
     def used_seed(self):
         return self.__used_seed
@@ -361,150 +657,270 @@ class Field:
 
     def allow_threshold(self, state=0):
         ''' Enable or disable hits threshold '''
-        self.IED_threshold = 21 if state > 0 else 0
-
-    def build(self, mode: c.MODE_CONFIG = c.MODES.get(0), seed: int = None):
-        ''' Build the frame and map elements '''
+        self.board.allow_threshold(state)
+
+    def allow_opening(self, state):
+        ''' Toggle the first click opening, only takes effect until the IEDs are set '''
+        # The boards placed around a start cell keep the opening they were placed with
+        if self.board.start is None:
+            self.board.opening = bool(state)
+
+    def track_probability(self, state):
+        ''' Keep the IED probabilities of the board up to date for the hint, only in the Normal modes '''
+        self.probabilities = solver.Probabilities(self.board) if state and not self.mode.special else None
+        self.parent.hinter.clear_probability()
+
+    def get_layout(self, mode: c.MODE_CONFIG) -> tuple:
+        ''' How the field of the mode is drawn, the widgets can be reused as long as it stays the same '''
+        if mode.x > ViewportCanvas.MAX_COLS or mode.y > ViewportCanvas.MAX_ROWS:
+            kind = ViewportCanvas
+        elif self.parent.options.canvas.get():
+            kind = BoardCanvas
+        else:
+            kind = tk.Frame
+        return (kind, mode.x, mode.y, mode.special)
+
+    def build(self, mode: c.MODE_CONFIG = c.MODES.get(0), seed: int = None, generator: int = None,
+              start: int = None, opening: bool = None, used_seed: bool = None):
+        '''
+        Build the frame and map elements, or reset them if the layout is unchanged.
+        A no guess board has its start cell, it only counts as a used seed if the seed was picked by the user.
+        A seed with a start cell is placed with the opening it was played with, the no guess ones always have it.
+        '''
+        self.parent.scheduler.cancel(self._reveal)
+        self._reveal = None
+        layout = self.get_layout(mode)
+        reuse = self.frame is not None and layout == self.layout
         if not self.frame is None:
-            self.frame.destroy()
+            if not reuse:
+                # The viewport canvas goes along with the frame of its scrollbars
+                (self.frame.container if isinstance(self.frame, ViewportCanvas) else self.frame).destroy()
             self.previous_seed = self.seed
         self.mode = mode
-        self.frame = tk.Frame(master=self.parent.frm_main)
-        self.is_over = False
-        self.seed = seed
-        self.used_seed = seed is not None
-
-        # The original intent was to use rate to determine amount,
-        # left here as a legacy, might be revisited
-        if self.mode.amount:
-            self.IED_count = self.mode.amount
-        else:
-            self.IED_count = int(self.mode.x * self.mode.y * self.mode.rate)
-        self.IED_current = MyIntVar(value=self.IED_count)
-        self.IED_guessed = 0
-        self.IEDs = set()
-        self._IEDs_are_set = False
-        self.map_cleared = 0
-        self.map = {
-            (x, y): NumbedMapElem(self, (x, y)) if self.mode.special else MapElem(self, (x, y)) 
-            for x in range(self.mode.x)
-            for y in range(self.mode.y)
-        }
-        if mode.special:
-            self.allow_threshold(self.parent.options.allow_hits.get())
-        else:
-            self.IED_threshold = 0
+        self.board = self.parent.board_maker.take(
+            mode,
+            seed=seed,
+            generator=generator,
+            start=start,
+            allow_hits=self.parent.options.allow_hits.get(),
+            opening=self.parent.options.opening.get() if start is None else opening is not False
+        )
+        if used_seed is not None:
+            self.board.used_seed = used_seed
+        self.board.replay = replay.Replay(used_seed=self.board.used_seed)
+        self.track_probability(self.parent.options.probability.get())
+        self.used_seed = self.board.used_seed
+        self.IED_current = MyIntVar(value=self.board.IED_current)
         self.IED_hit = MyIntVar(value=0)
-        self.IED_blew = 0
-        self.map_goal = self.mode.x * self.mode.y - self.IED_count
-        for elem in self.map.values():
-            elem.build_surprise_box()
-        self.frame.pack_propagate(False)
+        if reuse:
+            self.reset()
+            return
+        self.layout = layout
+        if layout[0] is ViewportCanvas:
+            # Too large to draw in full, only the cells in view are drawn and no elements are kept around
+            self.frame = ViewportCanvas(self)
+            self.map = VirtualMap(self, NumbedVirtualMapElem if self.mode.special else VirtualMapElem)
+            self.frame.redraw()
+        else:
+            if layout[0] is BoardCanvas:
+                # Draw the whole field on a single canvas instead of a few widgets per cell
+                self.frame = BoardCanvas(self)
+                elem_class = NumbedCanvasMapElem if self.mode.special else CanvasMapElem
+            else:
+                self.frame = tk.Frame(master=self.parent.frm_main)
+                self.frame.pack_propagate(False)
+                elem_class = NumbedMapElem if self.mode.special else MapElem
+            self.map = {idx: elem_class(self, idx) for idx in range(self.board.size)}
+            for elem in self.map.values():
+                elem.build_surprise_box()
         self.frame.pack()
+        self.mark_start()
 
-    def set_IEDs(self, current_coord: tuple = None):
-        ''' Initial planting of IEDs on first click '''
-        # check if set_IEDs has already been called
-        if not self._IEDs_are_set:
-            # check if seed was provided, if not, generate a new seed
-            if self.seed is None:
-                self.seed = randrange(maxsize)
-            rnd = Random(self.seed)
-            # Randomize coord and add set if it's not the current location
-            while len(self.IEDs) < self.IED_count:
-                coord = (rnd.randrange(self.mode.x), rnd.randrange(self.mode.y))
-
-                # if seed was used, ignore validation of current coord 
-                if coord != current_coord or self.used_seed:
-                    self.IEDs.add(coord)
-
-            # Use card values if Blackjack mode, else IEDs are assigned default value of 1 (True)
-            if self.mode.special:
-                cards = list(range(1, 10)) + [10] * 4
-                cards = cards * (self.mode.amount // 13)
-                rnd.shuffle(cards)
-                for IED in sorted(self.IEDs):
-                    self.map.get(IED).is_IED = cards.pop()
-            else:
-                for IED in sorted(self.IEDs):
-                    self.map.get(IED).is_IED = 1
+    def reset(self):
+        ''' Conceal the existing cells again for the new board instead of rebuilding them '''
+        if isinstance(self.frame, BoardCanvas):
+            self.frame.reset()
+        if isinstance(self.map, dict):
+            for elem in self.map.values():
+                elem.reset()
+        self.mark_start()
 
-            self._IEDs_are_set = True
-            self._cached_options = [opt.get() for opt in self.parent.options]
-            # Start the timer once everything is set up
-            self.parent.timer.start()
+    def mark_start(self):
+        ''' Highlight the start cell the board is placed around, the first click has to be on it '''
+        if self.board.start is not None:
+            self.map[self.board.start].box.config(bg='pale green')
 
-    def expose_IEDs(self, clear, show_false_flags=False):
-        ''' Reveal unflagged IEDs and false flags when over '''
-        for IED in self.IEDs:
-            self.map[IED].reveal(over_and_clear=clear)
-        if show_false_flags:
-            for elem in self.map.values():
-                if elem.flagged:
-                    elem.check_false_flag()
-
-    def check_threshold(self, elem, guess_safe=None):
-        ''' Check if threshold is exceeded '''
-        # # Added guessed argument to support mid-click guesses
-        # if guessed:
-        #     self.IED_guessed += 1
-        # else:
-        #     self.IED_current.decrease()
-        if not guess_safe:
-            self.IED_hit.increase(elem.is_IED)
-            self.IED_blew += 1
-        current_hit = self.IED_hit.get()
-        if current_hit > self.IED_threshold or (self.parent.options.allow_hits.get() < 2 and guess_safe is None):
-            self.bewm(elem)
-        elif current_hit >= 17:
+    def start(self):
+        ''' Cache the options and start the timer once the IEDs are set '''
+        self._cached_options = [opt.get() for opt in self.parent.options]
+        self.parent.timer.start()
+        # Trying the seed again places the IEDs around the same start, have it ready
+        board = self.board
+        self.parent.board_maker.warm(self.mode, board.seed, board.generator, board.start, board.opening)
+
+    def cached_hint_options(self):
+        ''' The hint options as cached throughout the game, to be saved with the record '''
+        options = c.OPTIONS(*self._cached_options)
+        return options.mouseover, options.tracker, options.allow_hits
+
+    def flag(self, elem, num=None):
+        ''' Flag the cell on the board and update the concealer box and helpers '''
+        previous = elem.flagged
+        if self.board.flag(elem.idx, num):
+            elem.update_box()
+            if previous:
+                self.parent.clueshelper.change_flag(previous, -1)
+            if elem.flagged:
+                self.parent.clueshelper.change_flag(elem.flagged, 1)
+            self.parent.refresher.set(self.IED_current, self.board.IED_current)
+
+    def off_start(self, elem) -> bool:
+        '''
+        Whether the first click misses the start cell the board is placed around, only the start is sure to be clear.
+        The click is refused with a bell.
+        '''
+        if not self.board.IEDs_are_set and self.board.start is not None and elem.idx != self.board.start:
+            self.parent.bell()
+            return True
+        return False
+
+    def click(self, elem, guess_safe=None):
+        ''' Reveal the clicked cell and any opened adjacent cells '''
+        if self.off_start(elem):
+            return
+        flagged = elem.flagged
+        is_set = self.board.IEDs_are_set
+        revealed = self.board.clicked(elem.idx, guess_safe=guess_safe)
+        self.update_revealed(elem, revealed, is_set, flagged=flagged, guess_safe=guess_safe)
+
+    def guess(self, elem):
+        ''' Mid click guess on the cell, safe if the flagged value matches '''
+        if self.off_start(elem):
+            return
+        flagged = elem.flagged
+        is_set = self.board.IEDs_are_set
+        revealed = self.board.guess(elem.idx)
+        self.update_revealed(elem, revealed, is_set, flagged=flagged, guess_safe=flagged == elem.is_IED)
+
+    def chord(self, elem):
+        ''' Open adjacent cells if the flags add up to the clue '''
+        revealed = self.board.chord(elem.idx)
+        if revealed is None:
+            if elem.lbl is not None:
+                elem._update_lbl_from_failed_reveal()     # pylint: disable=protected-access
+            self.parent.bell()
+        else:
+            self.update_revealed(elem, revealed, True)
+
+    def update_revealed(self, origin, revealed: list, is_set: bool, flagged=0, guess_safe=None):
+        ''' Swap the revealed cells to their underlayer and check the outcome '''
+        if not is_set and self.board.IEDs_are_set:
+            self.start()
+        clueshelper = self.parent.clueshelper
+        for idx in revealed:
+            elem = self.map[idx]
+            # the virtual map makes a new element on every lookup, so compare the cells
+            if elem.idx == origin.idx:
+                elem.uncover(guess_safe=guess_safe)
+                if flagged:
+                    clueshelper.change_flag(flagged, -1)
+                if elem.is_IED:
+                    clueshelper.guessed_flag(elem.is_IED, guess_safe=guess_safe)
+            else:
+                elem.uncover()
+                if elem.is_IED:
+                    clueshelper.guessed_flag(elem.is_IED)
+        self.parent.refresher.set(self.IED_current, self.board.IED_current)
+        self.parent.refresher.set(self.IED_hit, self.board.IED_hit)
+        if self.probabilities is not None and not self.board.is_over:
+            # Only the components the revealed cells touched are counted again
+            self.probabilities.update(revealed)
+            self.parent.hinter.refresh_probability()
+
+        if self.board.is_over:
+            if self.board.is_won:
+                self.check_clear()
+            else:
+                self.bewm(self.map[self.board.last])
+        elif self.board.IED_hit >= 17:
             self.parent.update_status(c.STATUS_WOAH)
 
+    def expose_IEDs(self, clear, show_false_flags=False):
+        '''
+        Reveal unflagged IEDs and false flags when over.
+        The IEDs are uncovered in waves spreading out from the last cell (the middle if cleared), a few waves a frame.
+        '''
+        board = self.board
+        x, y = board.coord(board.index((board.width // 2, board.height // 2)) if board.last is None else board.last)
+        waves = {}
+        for IED in board.expose_IEDs(clear):
+            ix, iy = board.coord(IED)
+            waves.setdefault(max(abs(ix - x), abs(iy - y)), []).append(IED)
+        waves = [waves[distance] for distance in sorted(waves)]
+        per_frame = max(1, ceil(len(waves) * REVEAL_FRAME / REVEAL_SECONDS))
+        false_flags = board.false_flags() if show_false_flags else []
+        self._expose_wave(waves[::-1], per_frame, clear, false_flags, self.parent.scheduler.now())
+
+    def _expose_wave(self, waves: list, per_frame: int, clear, false_flags: list, due: float):
+        ''' Uncover the next waves, the false flags are shown once they are all out '''
+        for _ in range(min(per_frame, len(waves))):
+            for IED in waves.pop():
+                self.map[IED].uncover(over_and_clear=clear)
+        if waves:
+            due += REVEAL_FRAME
+            self._reveal = self.parent.scheduler.at(
+                due, lambda: self._expose_wave(waves, per_frame, clear, false_flags, due)
+            )
+        else:
+            self._reveal = None
+            for idx in false_flags:
+                self.map[idx].check_false_flag()
+
     def bewm(self, last):
         ''' When the field blows up '''
         self.parent.timer.stop()
         last.is_final()
         self.parent.update_status(c.STATUS_BOOM)
-        self.is_over = True
         self.expose_IEDs(clear=False, show_false_flags=True)
 
-    def check_clear(self, guessed=False):
-        ''' Check for when the field is cleared '''
-        self.map_cleared += 1
-        if guessed:
-            self.IED_guessed += 1
-        if self.map_cleared >= self.map_goal:
-            self.parent.timer.stop()
-            self.is_over = True
-            self.parent.update_status(c.STATUS_YEAH)
-            self.expose_IEDs(clear=True)
-            congrats = 'You did it!\nTotal Time: {time}'.format(time=self.parent.timer.string.get())
-            if self.IED_threshold > 0:
-                congrats += '\n\nYou took {n} guess{plural}.'.format(n=self.IED_guessed, plural='es' if self.IED_guessed > 1 else '')
-                hit = self.IED_hit.get()
-                if hit:
-                    congrats += '\n... And you hit {hit} point{plural}.\nAim for 0 next time!'.format(hit=hit, plural="s" if hit > 1 else "")
-                else:
-                    congrats += '\nAnd you managed to remain clear without hitting any mines.\nCongrats!'
-            if self.used_seed:
-                congrats += '\n\n(Highscore not added as seed has been used)'
+    def check_clear(self):
+        ''' When the field is cleared '''
+        board = self.board
+        self.parent.timer.stop()
+        self.parent.update_status(c.STATUS_YEAH)
+        self.expose_IEDs(clear=True)
+        congrats = 'You did it!\nTotal Time: {time}'.format(time=self.parent.timer.string.get())
+        if board.IED_threshold > 0:
+            congrats += '\n\nYou took {n} guess{plural}.'.format(n=board.IED_guessed, plural='es' if board.IED_guessed > 1 else '')
+            hit = board.IED_hit
+            if hit:
+                congrats += '\n... And you hit {hit} point{plural}.\nAim for 0 next time!'.format(hit=hit, plural="s" if hit > 1 else "")
             else:
-                self.parent.record_keeper.add_record(
-                    self.mode,
-                    c.RECORD(
-                        self.parent.timer.end_time,
-                        self.seed,
-                        self.parent.timer.string.get(),
-                        *(
-                            (
-                                self.IED_guessed,
-                                self.IED_hit.get(),
-                                self.IED_blew,
-                                *self._cached_options[-3:]
-                            ) if self.mode.special else (0, ) * 6
-                        )
-                    )
-                )
-            showinfo('Awesome!', congrats)
+                congrats += '\nAnd you managed to remain clear without hitting any mines.\nCongrats!'
+        if self.used_seed:
+            congrats += '\n\n(Highscore not added as seed has been used)'
+        else:
+            self.parent.record_keeper.add_record(
+                self.mode,
+                c.RECORD(
+                    self.parent.timer.end_time,
+                    board.seed,
+                    self.parent.timer.string.get(),
+                    *(
+                        (
+                            board.IED_guessed,
+                            board.IED_hit,
+                            board.IED_blew,
+                            *self.cached_hint_options()
+                        ) if self.mode.special else (0, ) * 6
+                    ),
+                    board.generator,
+                    board.start,
+                    board.opening
+                ),
+                board.replay.to_bytes()
+            )
+        showinfo('Awesome!', congrats)
 
 def gradient_colour(main:int, increm=0x080808, n=8, darken=True, as_string=False) -> list:
     '''
@@ -558,37 +974,40 @@ class MapElem:
         9: 'goldenrod',
         10: 'pink4'
     }
-    def __init__(self, field: Field, coord):
+    def __init__(self, field: Field, idx: int):
         self.field = field
-        self.coord = coord
+        self.board = field.board
+        self.idx = idx
+        self.coord = self.board.coord(idx)
         self.frame = tk.Frame(self.field.frame, width=24, height=24)
         self.frame.pack_propagate(False)
-        self.is_IED = 0
-        self.clue = 0
-        self._flagged = 0
-        self.revealed = False
         self.clueshelper = self.field.parent.clueshelper
         self.box = None
         self.lbl = None
-        self._adjacents = None
+        # the underlayer label kept from the previous game to be reused
+        self.spare_lbl = None
+        # the scheduled end of the failed chord flash
+        self.flash = None
+
+    @property
+    def is_IED(self):
+        ''' Returns the IED value of the cell (0 if safe) '''
+        return int(self.board.values[self.idx])
+
+    @property
+    def clue(self):
+        ''' Returns the clue of the cell '''
+        return int(self.board.clues[self.idx])
+
+    @property
+    def revealed(self):
+        ''' Returns whether the cell is revealed '''
+        return bool(self.board.revealed[self.idx])
 
     @property
     def flagged(self):
         ''' Returns whether the cell is flagged '''
-        return self._flagged
-
-    @flagged.setter
-    def flagged(self, num):
-        ''' Flag cells and manage clue tracker, and IED count '''
-        # slightly ugly way to standardize the flag handling below instead of a bunch of if/else statements.
-        for i, check in enumerate((self._flagged, num)):
-            i = i * 2 - 1   
-            # so that 0 = -1, 1 = 1; i.e. num=0 will decrease flag and IED, num=1 will increase.
-            if check != 0:
-                self.clueshelper.change_flag(check, i)
-            elif not self.revealed:
-                self.field.IED_current.change(i)
-        self._flagged = num
+        return int(self.board.flags[self.idx])
 
     def get_flag_config(self, num=None):
         ''' Config how the flag should display '''
@@ -598,15 +1017,15 @@ class MapElem:
         return {'text': '⚑'}
 
     def flag(self, num=None):
+        ''' Flag the cell, the field updates the concealer box '''
+        self.field.flag(self, num)
+
+    def update_box(self):
         ''' Handles updating of the concealer box visual '''
-        if num is None:
-            num = 1
-        if self.flagged == num:
-            self.box.config(text=' ')
-            self.flagged = 0
+        if self.flagged:
+            self.box.config(**self.get_flag_config(self.flagged))
         else:
-            self.box.config(**self.get_flag_config(num))
-            self.flagged = num
+            self.box.config(text=' ')
 
     def check_false_flag(self):
         ''' Check if box is false flagged '''
@@ -624,23 +1043,13 @@ class MapElem:
         self.box.pack()
         return self.box
 
-    @property
-    def adjacents(self):
-        ''' Set or initialize adjacent cell references '''
-        if self._adjacents is None:
-            cx, cy = self.coord
-            mapper = self.field.map
-            self._adjacents = [mapper.get((rx, ry)) for rx in range(cx-1, cx+2) for ry in range(cy-1, cy+2) if mapper.get((rx, ry))]
-            self._adjacents.remove(self)
-        return self._adjacents
-
     def adjacent_IEDs(self):
         ''' Find adjacent IED totals '''
-        return 0 if self.is_IED else sum(adj.is_IED for adj in self.adjacents)
+        return self.board.adjacent_IEDs(self.idx)
 
     def adjacent_flags(self):
         ''' Find adjacent Flag totals '''
-        return sum(adj.flagged + (adj.is_IED * int(adj.revealed)) for adj in self.adjacents)
+        return self.board.adjacent_flags(self.idx)
 
     def get_IED_config(self, final=False):
         ''' Provide the config of how the IED is represented '''
@@ -660,75 +1069,61 @@ class MapElem:
             if self.clue:
                 self.lbl.config(text=self.clue)
 
+    def actual_config(self):
+        ''' Provide the config of how the underlayer is represented '''
+        if self.is_IED:
+            return self.get_IED_config()
+        return {
+            'text' : self.clue if self.clue else '',
+            'fg' : self.__class__.clue_colours.get(self.clue, DEFAULT_FG),
+            'font' : ('tkDefaultFont', 10, 'bold'),
+        }
+
     def label_actual(self):
         ''' Set up the underlayer label '''
         # This is separated so it's easier to manage the subclass
-        if self.is_IED:
-            actual = self.get_IED_config()
+        if self.spare_lbl is None:
+            lbl = tk.Label(master=self.frame, **self.actual_config())
         else:
-            actual = {
-                'text' : self.clue if self.clue else '',
-                'fg' : self.__class__.clue_colours.get(self.clue, DEFAULT_FG),
-                'font' : ('tkDefaultFont', 10, 'bold'),
-            }
-
-        lbl = tk.Label(master=self.frame, **actual)
+            lbl, self.spare_lbl = self.spare_lbl, None
+            lbl.config(**dict({'fg': DEFAULT_FG, 'bg': DEFAULT_BG, 'relief': tk.FLAT}, **self.actual_config()))
         return lbl
 
+    def bind_actual(self):
+        ''' Only the safe cells take clicks on the underlayer, a reused label might have been either '''
+        for event in ('<ButtonRelease-1>', '<ButtonRelease-3>'):
+            if self.is_IED:
+                self.lbl.unbind(event)
+            else:
+                self.lbl.bind(event, self.omni_click)
+
     def create_actual(self):
-        ''' Create the underlayer label '''
+        ''' Create the underlayer label in place of the concealer box '''
         self.lbl = self.label_actual()
-        if self.is_IED == 0:
-            self.lbl.bind('<ButtonRelease-1>', self.omni_click)
-            self.lbl.bind('<ButtonRelease-3>', self.omni_click)
+        self.bind_actual()
         self.lbl.pack(fill=tk.BOTH, expand=True)
+        self.box.pack_forget()
 
-    def clicked(self, guess_safe=None):
-        ''' Concealer box was clicked '''
-        go_ahead = self.reveal(guess_safe=guess_safe)
-        if go_ahead:
-            # Open adjacent cells if current is empty
-            if self.clue == 0 and not self.is_IED:
-                for adj in self.adjacents:
-                    adj.clicked()
-
-            # Do the check regardless if guessed, safe or not.
-            if self.is_IED:
-                self.field.check_threshold(self, guess_safe=guess_safe)
-            elif guess_safe is False: # and is not IED
-                self.field.bewm(self)
-            else:
-                self.field.check_clear()
-
-    def reveal(self, guess_safe=None, over_and_clear=None):
-        ''' Reveal the block if not already revealed '''
-        # This go_ahead is needed to stop the recursion of adjacent clicking from happening
-        # It removes the need to do the same check twice in both methods
-        go_ahead = (not self.revealed and (self.flagged == 0 or guess_safe is not None))
-        if go_ahead:
-            if self.field.map_cleared == 0:
-                self.field.set_IEDs(self.coord)
-            self.revealed = True
-            if self.flagged:
-                self.flagged = 0
-            elif self.is_IED and over_and_clear is None:   # and not flagged
-                self.field.IED_current.decrease()
-            self.clue = self.adjacent_IEDs()
-            self.create_actual()
-            self.box.pack_forget()
-
-            # Check if it's guess_safe and in a winning condition to highlight mines
-            if guess_safe:  # or over_and_clear:
-                self.lbl.config(bg='pale green')
-            if over_and_clear:
-                self.lbl.config(bg='lightblue')
-
-            # If the game is over, skip updating the hinter.
-            if self.is_IED and over_and_clear is None:
-                self.clueshelper.guessed_flag(self.is_IED, guess_safe=guess_safe)
-
-        # pass the condition back to self.clicked
-        return go_ahead
+    def reset(self):
+        ''' Conceal the cell again for the new board, keeping the widgets '''
+        self.field.parent.scheduler.cancel(self.flash)
+        self.flash = None
+        self.board = self.field.board
+        if self.lbl is not None:
+            self.lbl.pack_forget()
+            self.box.pack()
+            self.spare_lbl, self.lbl = self.lbl, None
+        self.box.reset()
+
+    def uncover(self, guess_safe=None, over_and_clear=None):
+        ''' Swap the concealer box for the underlayer label once revealed on the board '''
+        self.create_actual()
+
+        # Check if it's guess_safe and in a winning condition to highlight mines
+        if guess_safe:
+            self.lbl.config(bg='pale green')
+        if over_and_clear:
+            self.lbl.config(bg='lightblue')
 
     def omni_click(self, evt, ignore=False):
         ''' Main handler for clicking, branches off to sub methods... '''
@@ -736,22 +1131,24 @@ class MapElem:
             # Make sure the cursor is within the same block, allow users to change their mind.
             w, h = evt.widget.winfo_geometry().replace('+', 'x').split('x')[:2]
             if evt.x in range(int(w)) and evt.y in range(int(h)):
-                # Both buttons are pressed
-                if (evt.num == 1 and evt.state & c.MOUSE_RIGHT) or (evt.num == 3 and evt.state & c.MOUSE_LEFT):
-                    self.both_release()
-                elif evt.num == 1:
-                    self.left_release()
-                # Mid click for special mode
-                elif evt.num == 2:
-                    # if self.flagged:
-                    self.field.IED_guessed += 1
-                    self.clicked(guess_safe=self.flagged == self.is_IED)
-                elif evt.num == 3 and not ignore:
-                    self.right_release()
+                self.release(evt.num, evt.state, ignore=ignore)
+
+    def release(self, num, state, ignore=False):
+        ''' Branch off the mouse button released over the cell '''
+        # Both buttons are pressed
+        if (num == 1 and state & c.MOUSE_RIGHT) or (num == 3 and state & c.MOUSE_LEFT):
+            self.both_release()
+        elif num == 1:
+            self.left_release()
+        # Mid click for special mode
+        elif num == 2:
+            self.field.guess(self)
+        elif num == 3 and not ignore:
+            self.right_release()
 
     def left_release(self):
         ''' Remove the concealer '''
-        self.clicked()
+        self.field.click(self)
 
     def right_release(self):
         ''' Flag the concealer '''
@@ -763,14 +1160,7 @@ class MapElem:
 
     def both_release(self):
         ''' Open adjacent blocks '''
-        if self.adjacent_flags() == self.clue and self.revealed:
-            self.clicked()
-            for adj in self.adjacents:
-                adj.clicked()
-        else:
-            if self.lbl is not None:
-                self._update_lbl_from_failed_reveal()
-            self.field.parent.bell()
+        self.field.chord(self)
 
     def _update_lbl_from_failed_reveal(self, previous=None):
         ''' Flip the states of the current label '''
@@ -780,10 +1170,14 @@ class MapElem:
             if not current == wrong_colour:
                 # to handle multiple clicks; if already changed, don't set a new task.
                 self.lbl.config(bg=wrong_colour)
-                self.field.parent.after(ms=250, func=lambda: self._update_lbl_from_failed_reveal(current))
+                self.flash = self.field.parent.scheduler.after(
+                    FLASH_SECONDS, lambda: self._update_lbl_from_failed_reveal(current)
+                )
         else:
-            # return to the original colour.
-            self.lbl.config(bg=previous)
+            self.flash = None
+            # return to the original colour, unless the cell was concealed for a new board since
+            if self.lbl is not None and self.board is self.field.board:
+                self.lbl.config(bg=previous)
 
 
 class NumbedMapElem(MapElem):
@@ -840,9 +1234,12 @@ class NumbedMapElem(MapElem):
             'font': ('tkDefaultFont', 12)
         }
 
-    def create_actual(self):
-        super().create_actual()
-        if self.is_IED == 0:
+    def bind_actual(self):
+        super().bind_actual()
+        if self.is_IED:
+            self.lbl.unbind('<Enter>')
+            self.lbl.unbind('<Leave>')
+        else:
             self.lbl.bind('<Enter>', lambda e: self.field.parent.hinter.update(self))
             self.lbl.bind('<Leave>', self.field.parent.hinter.reset)
 
@@ -859,6 +1256,400 @@ class NumbedMapElem(MapElem):
         super().check_false_flag()
 
 
+class CanvasCell:
+    '''
+    Stand-in for the concealer box and underlayer label of a cell drawn on the BoardCanvas.
+    Takes the same config options as the widgets so the MapElem visuals can be reused as is.
+    '''
+    BOX_BG = 'gray80'
+    BOX_FG = 'orange red'
+    BOX_FONT = ('tkDefaultFont', 10)
+    BOX_OUTLINE = 'gray55'
+    SUNKEN_OUTLINE = 'gray40'
+
+    def __init__(self, canvas, coord):
+        self.canvas = canvas
+        size = BoardCanvas.CELL_SIZE
+        x0, y0 = coord[0] * size, coord[1] * size
+        self.rect = canvas.create_rectangle(
+            x0 + 1, y0 + 1, x0 + size - 1, y0 + size - 1,
+            fill=CanvasCell.BOX_BG,
+            outline=CanvasCell.BOX_OUTLINE
+        )
+        self.text = canvas.create_text(
+            x0 + size // 2, y0 + size // 2,
+            text=' ',
+            fill=CanvasCell.BOX_FG,
+            font=CanvasCell.BOX_FONT
+        )
+        self._bg = CanvasCell.BOX_BG
+
+    @staticmethod
+    def concealed(**flag):
+        ''' Full config of the concealer box look '''
+        return dict(
+            {'text': ' ', 'fg': CanvasCell.BOX_FG, 'bg': CanvasCell.BOX_BG, 'font': CanvasCell.BOX_FONT, 'relief': tk.GROOVE},
+            **flag
+        )
+
+    @staticmethod
+    def uncovered(**actual):
+        ''' Full config of the underlayer look '''
+        return dict({'fg': DEFAULT_FG, 'bg': DEFAULT_BG, 'relief': tk.FLAT}, **actual)
+
+    def config(self, text=None, fg=None, bg=None, font=None, relief=None):
+        ''' Translate the widget options to the canvas items '''
+        text_opts = {}
+        if text is not None:
+            text_opts['text'] = text
+        if fg is not None:
+            text_opts['fill'] = fg
+        if font is not None:
+            text_opts['font'] = font
+        if text_opts:
+            self.canvas.itemconfig(self.text, **text_opts)
+        if bg is not None:
+            self._bg = bg
+            self.canvas.itemconfig(self.rect, fill=bg)
+        if relief is not None:
+            outline = {tk.SUNKEN: CanvasCell.SUNKEN_OUTLINE, tk.GROOVE: CanvasCell.BOX_OUTLINE}.get(relief, '')
+            self.canvas.itemconfig(self.rect, outline=outline)
+
+    def cget(self, option):
+        ''' Only the background is ever queried '''
+        if option == 'bg':
+            return self._bg
+        raise tk.TclError('unknown option "{}"'.format(option))
+
+    def uncover(self, **actual):
+        ''' Flatten the box into the underlayer look '''
+        self.config(**CanvasCell.uncovered(**actual))
+
+    def reset(self):
+        ''' Back to the concealer box look '''
+        self.config(**CanvasCell.concealed())
+
+
+class VirtualCell:
+    '''
+    Stand-in for the cell widgets on the ViewportCanvas.
+    The config is kept as an override on top of the board state and only drawn while in view.
+    '''
+    def __init__(self, view, idx):
+        self.view = view
+        self.idx = idx
+
+    def config(self, **kwargs):
+        self.view.styles.setdefault(self.idx, {}).update(kwargs)
+        self.view.draw(self.idx)
+
+    def cget(self, option):
+        return self.view.cell_config(self.idx).get(option, '')
+
+
+class CanvasMapElem(MapElem):
+    ''' Map element drawn on the BoardCanvas instead of its own Frame and Button '''
+
+    def __init__(self, field: Field, idx: int):
+        # pylint: disable=super-init-not-called
+        # The base init creates the cell frame, which is exactly what the canvas avoids.
+        self.field = field
+        self.board = field.board
+        self.idx = idx
+        self.coord = self.board.coord(idx)
+        self.canvas = field.frame
+        self.clueshelper = self.field.parent.clueshelper
+        self.box = None
+        self.lbl = None
+        self.flash = None
+
+    def build_surprise_box(self):
+        ''' Draw the concealer box '''
+        self.box = CanvasCell(self.canvas, self.coord)
+        return self.box
+
+    def create_actual(self):
+        ''' Turn the concealer box items into the underlayer '''
+        self.lbl = self.box
+        self.lbl.uncover(**self.actual_config())
+
+    def reset(self):
+        self.field.parent.scheduler.cancel(self.flash)
+        self.flash = None
+        self.board = self.field.board
+        self.lbl = None
+        self.box.reset()
+
+
+class NumbedCanvasMapElem(CanvasMapElem, NumbedMapElem):
+    ''' Numbered Map element drawn on the BoardCanvas for Blackjack mode '''
+
+
+class VirtualMapElem(CanvasMapElem):
+    ''' Map element on the ViewportCanvas, created on demand and drawn from the board state '''
+
+    def __init__(self, field: Field, idx: int):
+        super().__init__(field, idx)
+        self.box = VirtualCell(self.canvas, idx)
+        if self.revealed:
+            self.lbl = self.box
+
+    def build_surprise_box(self):
+        return self.box
+
+    def update_box(self):
+        self.canvas.draw(self.idx)
+
+    def create_actual(self):
+        ''' Drop the overrides of the concealer box and draw the underlayer '''
+        self.lbl = self.box
+        self.canvas.styles.pop(self.idx, None)
+        self.canvas.draw(self.idx)
+
+
+class NumbedVirtualMapElem(VirtualMapElem, NumbedMapElem):
+    ''' Numbered Map element on the ViewportCanvas for Blackjack mode '''
+
+
+class VirtualMap:
+    ''' The map of a ViewportCanvas field, creates the Map elements on demand instead of holding them all '''
+
+    def __init__(self, field: Field, elem_class):
+        self.field = field
+        self.elem_class = elem_class
+
+    def __getitem__(self, idx):
+        return self.elem_class(self.field, idx)
+
+    def __len__(self):
+        return self.field.board.size
+
+
+class BoardCanvas(tk.Canvas):
+    ''' Single canvas that draws every cell of the field and maps the events back to the cells '''
+    CELL_SIZE = 24
+
+    def __init__(self, field: Field, master=None, cols=None, rows=None):
+        self.field = field
+        board = field.board
+        super().__init__(
+            master=master or field.parent.frm_main,
+            width=(cols or board.width) * BoardCanvas.CELL_SIZE,
+            height=(rows or board.height) * BoardCanvas.CELL_SIZE,
+            bg=DEFAULT_BG,
+            highlightthickness=0
+        )
+        # top left cell in view
+        self.origin = (0, 0)
+        self._pressed = None
+        self._hovered = None
+        for num in (1, 2, 3):
+            self.bind('<ButtonPress-{}>'.format(num), self.pressed)
+            self.bind('<ButtonRelease-{}>'.format(num), self.released)
+        self.bind('<Motion>', lambda e: self.hover(self.cell_at(e.x, e.y)))
+        self.bind('<Enter>', lambda e: self.focus_set())
+        self.bind('<Leave>', lambda e: self.hover(None))
+        self.bind('<Key>', self.key_pressed)
+
+    def cell_at(self, x, y):
+        ''' Find the cell index under the canvas coordinates '''
+        board = self.field.board
+        if x < 0 or y < 0:
+            return None
+        cx = int(x // BoardCanvas.CELL_SIZE) + self.origin[0]
+        cy = int(y // BoardCanvas.CELL_SIZE) + self.origin[1]
+        if cx < board.width and cy < board.height:
+            return board.index((cx, cy))
+        return None
+
+    def reset(self):
+        ''' Forget the cells pressed and hovered on the previous board '''
+        self._pressed = None
+        self._hovered = None
+
+    def pressed(self, evt):
+        self._pressed = self.cell_at(evt.x, evt.y)
+
+    def released(self, evt):
+        ''' Same as the widget bindings, only act if released on the pressed cell '''
+        idx = self.cell_at(evt.x, evt.y)
+        if idx is None or idx != self._pressed or self.field.is_over:
+            return
+        elem = self.field.map[idx]
+        if elem.revealed:
+            # The underlayer labels don't take mid clicks, and IEDs don't take any clicks.
+            if evt.num == 2 or elem.is_IED:
+                return
+        elif evt.num == 2 and not self.field.mode.special:
+            return
+        elem.release(evt.num, evt.state)
+
+    def hover(self, idx):
+        ''' Track the hovered cell for keyboard flags and mouseover hints '''
+        if idx == self._hovered:
+            return
+        previous, self._hovered = self._hovered, idx
+        if self.field.mode.special:
+            hinter = self.field.parent.hinter
+            board = self.field.board
+            if previous is not None and board.revealed[previous] and not board.values[previous]:
+                hinter.reset()
+            if idx is not None and board.revealed[idx] and not board.values[idx]:
+                hinter.update(self.field.map[idx])
+        elif self.field.probabilities is not None:
+            hinter = self.field.parent.hinter
+            if idx is not None and not self.field.board.revealed[idx]:
+                hinter.probability(idx)
+            elif previous is not None:
+                hinter.clear_probability()
+
+    def key_pressed(self, evt):
+        ''' Flag the hovered cell from the keyboard '''
+        if self._hovered is None:
+            return
+        elem = self.field.map[self._hovered]
+        if elem.revealed:
+            return
+        if self.field.mode.special:
+            num = c.FLAG_KEYS.get(evt.char)
+            if num is not None:
+                elem.flag(num)
+        elif evt.char == '1':
+            elem.flag(None)
+
+
+class ViewportCanvas(BoardCanvas):
+    '''
+    Canvas that only draws the cells in view, for fields too large to be drawn in full.
+    The viewport cells are drawn from the board state as the view scrolls,
+    so the amount of canvas items depends on the viewport instead of the field size.
+    '''
+    MAX_COLS = 40
+    MAX_ROWS = 25
+
+    def __init__(self, field: Field):
+        board = field.board
+        self.cols = min(board.width, ViewportCanvas.MAX_COLS)
+        self.rows = min(board.height, ViewportCanvas.MAX_ROWS)
+        # The scrollbars need a frame to go along with the canvas
+        self.container = tk.Frame(master=field.parent.frm_main)
+        super().__init__(field, master=self.container, cols=self.cols, rows=self.rows)
+        self.styles = {}
+        self.slots = {
+            (col, row): CanvasCell(self, (col, row))
+            for col in range(self.cols)
+            for row in range(self.rows)
+        }
+        self.bars = (
+            tk.Scrollbar(self.container, orient=tk.HORIZONTAL, command=lambda *args: self.scroll(0, *args)),
+            tk.Scrollbar(self.container, orient=tk.VERTICAL, command=lambda *args: self.scroll(1, *args))
+        )
+        self.grid(row=0, column=0)
+        self.bars[0].grid(row=1, column=0, sticky=tk.EW)
+        self.bars[1].grid(row=0, column=1, sticky=tk.NS)
+
+        # Mouse wheel scrolls vertically, horizontally with shift. Button-4/5 are the X11 wheel.
+        for axis, modifier in enumerate(('Shift-', '')):
+            self.bind('<{}MouseWheel>'.format(modifier), lambda e, a=axis: self.scroll(a, 'scroll', -3 if e.delta > 0 else 3, 'units'))
+            self.bind('<{}Button-4>'.format(modifier), lambda e, a=axis: self.scroll(a, 'scroll', -3, 'units'))
+            self.bind('<{}Button-5>'.format(modifier), lambda e, a=axis: self.scroll(a, 'scroll', 3, 'units'))
+        for key, axis, step in (('Left', 0, -1), ('Right', 0, 1), ('Up', 1, -1), ('Down', 1, 1), ('Prior', 1, -1), ('Next', 1, 1)):
+            unit = 'pages' if key in ('Prior', 'Next') else 'units'
+            self.bind('<{}>'.format(key), lambda e, a=axis, s=step, u=unit: self.scroll(a, 'scroll', s, u))
+
+    def pack(self, **kwargs):       # pylint: disable=arguments-differ
+        self.container.pack(**kwargs)
+
+    def reset(self):
+        ''' Drop the overrides of the previous board and draw the new one from the top left '''
+        super().reset()
+        self.styles.clear()
+        self.origin = (0, 0)
+        self.redraw()
+
+    def scroll(self, axis, action, amount, what=None):
+        ''' Scrollbar command, also used by the wheel and keys bindings '''
+        total = (self.field.board.width, self.field.board.height)[axis]
+        visible = (self.cols, self.rows)[axis]
+        current = self.origin[axis]
+        if action == 'moveto':
+            target = round(float(amount) * total)
+        elif what == 'pages':
+            target = current + int(amount) * max(visible - 1, 1)
+        else:
+            target = current + int(amount)
+        target = max(0, min(target, total - visible))
+        if target != current:
+            origin = list(self.origin)
+            origin[axis] = target
+            self.origin = tuple(origin)
+            self.redraw()
+
+    def redraw(self):
+        ''' Draw all the cells in view and update the scrollbars '''
+        board = self.field.board
+        ox, oy = self.origin
+        for (col, row), slot in self.slots.items():
+            slot.config(**self.cell_config(board.index((ox + col, oy + row))))
+        for axis, bar in enumerate(self.bars):
+            total = (board.width, board.height)[axis]
+            visible = (self.cols, self.rows)[axis]
+            bar.set(self.origin[axis] / total, (self.origin[axis] + visible) / total)
+        self._hovered = None
+
+    def cell_config(self, idx):
+        ''' Full config of the cell from the board state and any overrides '''
+        elem = self.field.map[idx]
+        if elem.revealed:
+            config = CanvasCell.uncovered(**elem.actual_config())
+        elif elem.flagged:
+            config = CanvasCell.concealed(**elem.get_flag_config(elem.flagged))
+        else:
+            config = CanvasCell.concealed()
+        config.update(self.styles.get(idx, {}))
+        return config
+
+    def draw(self, idx):
+        ''' Draw the cell if it is in view '''
+        x, y = self.field.board.coord(idx)
+        slot = self.slots.get((x - self.origin[0], y - self.origin[1]))
+        if slot is not None:
+            slot.config(**self.cell_config(idx))
+
+
+class CustomModeDialog(simpledialog.Dialog):
+    ''' Dialog to request the grid size and IEDs (amount or rate) of the custom mode '''
+
+    def __init__(self, parent, mode: c.MODE_CONFIG):
+        self.mode = mode
+        self.entries = []
+        super().__init__(parent, title='Custom mode')
+
+    def body(self, master):
+        IEDs = '{:g}%'.format(self.mode.rate * 100) if self.mode.rate else self.mode.amount
+        fields = (
+            ('Width (max {}):'.format(c.CUSTOM_MAX), self.mode.x),
+            ('Height (max {}):'.format(c.CUSTOM_MAX), self.mode.y),
+            ('IEDs (amount, % or rate):', IEDs)
+        )
+        for row, (text, value) in enumerate(fields):
+            tk.Label(master, text=text).grid(row=row, column=0, sticky=tk.E)
+            entry = tk.Entry(master, width=10)
+            entry.insert(0, value)
+            entry.grid(row=row, column=1, sticky=tk.W)
+            self.entries.append(entry)
+        return self.entries[0]
+
+    def validate(self):
+        try:
+            self.result = engine.custom_mode(*(entry.get() for entry in self.entries))
+        except ValueError as e:     # pylint: disable=invalid-name
+            showerror('Invalid custom mode', str(e), parent=self)
+            self.result = None
+            return False
+        return True
+
+
 class Surprise(tk.Button):
     ''' Concealer button object to handle bindings '''
 
@@ -878,9 +1669,27 @@ class Surprise(tk.Button):
 
         self.bind('<ButtonRelease-1>', self.parent.omni_click)
         self.bind('<ButtonRelease-3>', self.parent.omni_click)
-        self.bind('<Enter>', lambda e: self.focus_set())
-        self.bind('<Leave>', lambda e: self.parent.frame.focus_set())
+        self.bind('<Enter>', self.entered)
+        self.bind('<Leave>', self.left)
         self.set_other_bindings()
+        # the look to return to when the button is reused for a new board
+        self.defaults = {opt: self.cget(opt) for opt in ('text', 'fg', 'bg', 'font', 'relief')}
+
+    def entered(self, evt):
+        ''' Take the keyboard flags, and show the probability hint if tracked '''
+        # pylint: disable=unused-argument
+        self.focus_set()
+        if self.parent.field.probabilities is not None:
+            self.parent.field.parent.hinter.probability(self.parent.idx)
+
+    def left(self, evt):
+        # pylint: disable=unused-argument
+        self.parent.frame.focus_set()
+        if self.parent.field.probabilities is not None:
+            self.parent.field.parent.hinter.clear_probability()
+
+    def reset(self):
+        self.config(**self.defaults)
     
     def set_other_bindings(self):
         self.bind('1', lambda evt: self.flag(None))
@@ -892,16 +1701,9 @@ class NumbedSurprise(Surprise):
     def set_other_bindings(self):
         self.bind('<ButtonRelease-2>', self.parent.omni_click)
 
-        # NUM binding
-        for i, s in enumerate('1234567890', 1):
-            if i > 10: i = 10
-            self.bind(s, lambda e, x=i: self.flag(x))
-
-        # WASD binding
-        for i, s in enumerate('qweasdzxc', 4):
-            if i > 10: i = 10
-            self.bind(s, lambda e, x=i: self.flag(x))
-            self.bind(s.upper(), lambda e, x=i: self.flag(x))
+        # NUM and WASD binding
+        for key, num in c.FLAG_KEYS.items():
+            self.bind(key, lambda e, x=num: self.flag(x))
 
 class HintBar:
     ''' Hint bar to help users calculate remaining flags '''
@@ -911,7 +1713,10 @@ class HintBar:
         self.frame = None
         self.parent_frame = parent_frame
         self.hints = None
-        self.exists = False    
+        self.chance = None
+        # the concealed cell the probability is shown for
+        self.hovered = None
+        self.exists = False
 
     def build(self):
         ''' build the HintBar frame '''
@@ -922,13 +1727,20 @@ class HintBar:
             k: self.create_inner_frame(k)
             for k in ('Total', 'Flags/Hits', 'Remaining')
         }
-        for i, hint in enumerate(self.hints.values()):
+        self.chance = self.create_inner_frame('IED Probability', tk.StringVar)
+        for i, hint in enumerate((*self.hints.values(), self.chance)):
             hint.frame.grid(row=0, column=i, sticky=tk.NSEW)
             hint.label.pack(fill=tk.BOTH, expand=True)
-        for i in range(3):
+        for i in range(4):
             self.frame.columnconfigure(index=i, weight=1)
         self.exists = True
 
+    def arrange(self, special):
+        ''' The clue hints are for the Blackjack modes, the probability hint for the Normal modes '''
+        for hint in self.hints.values():
+            hint.frame.grid() if special else hint.frame.grid_remove()
+        self.chance.frame.grid_remove() if special else self.chance.frame.grid()
+
     def show(self, state):
         ''' Toggler to show or hide the frame '''
         if state:
@@ -936,17 +1748,18 @@ class HintBar:
         else:
             self.frame.grid_remove()
 
-    def create_inner_frame(self, ctype):
+    def create_inner_frame(self, ctype, var_class=tk.IntVar):
         def validate(hinter):
             if hinter.counter.get() < 0:
                 hinter.label.config(bg='yellow')
             else:
                 hinter.label.config(bg=DEFAULT_BG)
         frame = tk.LabelFrame(master=self.frame, text='{}:'.format(ctype))
-        counter = tk.IntVar()
+        counter = var_class()
         label = tk.Label(master=frame, textvariable=counter)
         hinter = c.HINT(frame, label, counter)
-        counter.trace('w', lambda *args: validate(hinter))
+        if var_class is tk.IntVar:
+            counter.trace('w', lambda *args: validate(hinter))
         return hinter
 
     def update(self, hinter: NumbedMapElem):
@@ -954,9 +1767,35 @@ class HintBar:
             total = hinter.clue
             flags_hits = hinter.adjacent_flags()
             remaining = total - flags_hits
-            self.hints['Total'].counter.set(total)
-            self.hints['Flags/Hits'].counter.set(flags_hits)
-            self.hints['Remaining'].counter.set(remaining)
+            refresher = self.gui.refresher
+            refresher.set(self.hints['Total'].counter, total)
+            refresher.set(self.hints['Flags/Hits'].counter, flags_hits)
+            refresher.set(self.hints['Remaining'].counter, remaining)
+
+    def probability(self, idx: int):
+        ''' Show the IED probability of the hovered concealed cell, as computed on the last move '''
+        probabilities = self.gui.field.probabilities
+        if probabilities is None or self.gui.field.is_over:
+            return
+        chance = probabilities.probability(idx)
+        if chance is None:
+            self.clear_probability()
+            return
+        self.hovered = idx
+        # Only the certain cells show 0% or 100%
+        text = '{:.0%}'.format(chance) if chance in (0, 1) else '{:.1%}'.format(min(max(chance, .001), .999))
+        self.gui.refresher.set(self.chance.counter, text)
+
+    def refresh_probability(self):
+        ''' The probabilities changed with the move, update the cell still hovered '''
+        if self.hovered is not None:
+            self.probability(self.hovered)
+
+    def clear_probability(self, *args):
+        ''' Clear the probability once the cell isn't hovered anymore '''
+        #pylint: disable=unused-argument
+        self.hovered = None
+        self.gui.refresher.set(self.chance.counter, '')
 
     def reset(self, *args):
         ''' Reset hintbar to zeroes '''
@@ -964,7 +1803,7 @@ class HintBar:
         # The star arugment is to bypass the binding events.
         if not self.gui.field.is_over:
             for hint in self.hints.values():
-                hint.counter.set(0)
+                self.gui.refresher.set(hint.counter, 0)
 
     def destroy(self):
         self.exists = False
@@ -994,18 +1833,44 @@ class NumbTracker:
     def lock(self):
         self.lock_count += 1
 
-class NumbHelper(tk.Frame):
-    ''' Helper Frame object to help track flags '''
+class TrackerItem:
+    '''
+    Stand-in for a label of the NumbHelper, drawn as an item of its canvas:
+    the text of a flag slot or the background of a number column.
+    Only the items whose colour changed are repainted.
+    '''
+    __slots__ = ('canvas', 'item', 'colour')
+
+    def __init__(self, canvas, item, colour):
+        self.canvas = canvas
+        self.item = item
+        self.colour = colour
+
+    def config(self, colour):
+        # the item is None once its slot is deleted, with its update still queued
+        if self.item is not None and colour != self.colour:
+            self.colour = colour
+            self.canvas.itemconfig(self.item, fill=colour)
+
+class NumbHelper(tk.Canvas):
+    ''' Helper canvas to help track flags, each flag is a slot drawn on it '''
     FLAG_ACTIVE = 'forestgreen'
     FLAG_LOCK = 'dodger blue'
     FLAG_BLEW = 'red2'
     FLAG_OVER = 'gold'
     FLAG_INACTIVE = 'LightCyan3'
+    FLAG_FONT = ('tkDefaultFont', 12)
+    SLOT_WIDTH = 18
+    SLOT_HEIGHT = 16
+    # 1 to 9 take a column each, the 10s are spread over 4
+    COLUMNS = 13
     def __init__(self, parent, parent_frame):
         self.parent = parent
         self.parent_frame = parent_frame
         self.nrows = None
         self.trackers = None
+        self.lbls = None
+        self.columns = None
         self.exists = False
         self.tracker_configs = {
             1: c.TRACKER_CONFIG(1, NumbHelper.FLAG_OVER, 0, NumbHelper.FLAG_ACTIVE),
@@ -1013,41 +1878,74 @@ class NumbHelper(tk.Frame):
         }
 
     def build(self, nrows):
-        if self.exists:
-            self.destroy()
-        self.nrows = nrows
         self.trackers = {
-            i: NumbTracker(self.nrows * (4 if i >= 10 else 1))
+            i: NumbTracker(nrows * (4 if i >= 10 else 1))
             for i in range(1, 11)
         }
-        super().__init__(master=self.parent_frame)
-        self.create_labels()
+        if self.lbls is not None and nrows == self.nrows:
+            # Same deck size, just reset the slots
+            self.reset_labels()
+        else:
+            if self.lbls is None:
+                super().__init__(master=self.parent_frame, bg=DEFAULT_BG, highlightthickness=0)
+            else:
+                # The canvas is kept, only the slots are drawn again
+                for lbl in chain(self.lbls.values(), self.columns.values()):
+                    lbl.item = None
+                self.delete('all')
+            self.nrows = nrows
+            self.create_labels()
         self.exists = True
 
-    def show(self, state=True):        
+    def deactivate(self):
+        ''' Hide the helper when not needed, the slots are kept to be reused '''
+        self.exists = False
+        self.grid_remove()
+
+    def reset_labels(self):
+        ''' Return all the slots to the inactive state, only the ones used last game get repainted '''
+        for lbl in self.lbls.values():
+            self.parent.refresher.config(lbl, colour=NumbHelper.FLAG_INACTIVE)
+        for column in self.columns.values():
+            self.parent.refresher.config(column, colour=DEFAULT_BG)
+
+    def show(self, state=True):
         self.grid(row=1, column=0) if state else self.grid_remove()
 
+    @staticmethod
+    def slot_position(num, count):
+        ''' Grid (column, row) of the slot '''
+        if num < 10:
+            return num - 1, count - 1
+        return 9 + (count - 1) % 4, (count - 1) // 4
+
     def create_labels(self):
-        self.lbls = {
-            # tuple key set up as (number, count=1, 2, 3, 4...)
-            (num, count + 1) : tk.Label(
-                master=self,
-                image=self.parent.empty_image,
-                text=c.NEG_CIRCLED_NUMBERS.get(num),
-                font=('tkDefaultFont', 12),
-                compound='c',
-                width=16,
-                height=12,
-                fg=NumbHelper.FLAG_INACTIVE
-            ) for num in range(1, 11) for count in range(self.nrows if num < 10 else self.nrows * 4)
-        }
-        for (num, count), lbl in self.lbls.items():
-            num -= 1
-            count -= 1
-            if num < 9: # no longer checking 10 because of count -=1
-                lbl.grid(row=count, column=num)
-            else:
-                lbl.grid(row=count // 4, column=num + count % 4)
+        width, height = NumbHelper.SLOT_WIDTH, NumbHelper.SLOT_HEIGHT
+        self.config(width=NumbHelper.COLUMNS * width, height=self.nrows * height)
+        # the column backgrounds go under the slots, so a column over the maximum is a single item
+        self.columns = {}
+        for num in range(1, 11):
+            first, last = (num - 1, num) if num < 10 else (9, NumbHelper.COLUMNS)
+            self.columns[num] = TrackerItem(
+                self,
+                self.create_rectangle(first * width, 0, last * width, self.nrows * height, fill=DEFAULT_BG, width=0),
+                DEFAULT_BG
+            )
+        self.lbls = {}
+        for num in range(1, 11):
+            for count in range(1, (self.nrows if num < 10 else self.nrows * 4) + 1):
+                # tuple key set up as (number, count=1, 2, 3, 4...)
+                col, row = NumbHelper.slot_position(num, count)
+                self.lbls[(num, count)] = TrackerItem(
+                    self,
+                    self.create_text(
+                        col * width + width // 2, row * height + height // 2,
+                        text=c.NEG_CIRCLED_NUMBERS.get(num),
+                        font=NumbHelper.FLAG_FONT,
+                        fill=NumbHelper.FLAG_INACTIVE
+                    ),
+                    NumbHelper.FLAG_INACTIVE
+                )
 
     def change_flag(self, num, change):
         ''' Update the flag in the helper '''
@@ -1059,7 +1957,7 @@ class NumbHelper(tk.Frame):
                 self.update_batch(num, cfg.over_state)
             elif not tracker.over:
                 lbl = self.lbls.get((num, tracker.total + cfg.tracked_num))
-                lbl.config(fg=cfg.flag_state)
+                self.parent.refresher.config(lbl, colour=cfg.flag_state)
 
     def guessed_flag(self, num, guess_safe=None):
         ''' Update the flags related to guesses (flag as OKAY or BLEW) on the helper '''
@@ -1068,24 +1966,42 @@ class NumbHelper(tk.Frame):
             tracker.lock() if guess_safe else tracker.blew()
             revealed = tracker.blew_count + tracker.lock_count
             lbl = self.lbls.get((num, revealed))
-            lbl.config(fg=NumbHelper.FLAG_LOCK if guess_safe else NumbHelper.FLAG_BLEW)
+            self.parent.refresher.config(lbl, colour=NumbHelper.FLAG_LOCK if guess_safe else NumbHelper.FLAG_BLEW)
             if tracker.flag_count > 0:
                 for flag in range(tracker.flag_count):
-                    try:
-                        self.lbls.get((num, revealed + flag + 1)).config(fg=NumbHelper.FLAG_ACTIVE)
-                    except AttributeError:
+                    lbl = self.lbls.get((num, revealed + flag + 1))
+                    if lbl is None:
                         self.update_batch(num, NumbHelper.FLAG_OVER)
                         break
-            
+                    self.parent.refresher.config(lbl, colour=NumbHelper.FLAG_ACTIVE)
+
     def update_batch(self, num, colour):
-        ''' Batch update when tracker exceeds/resume from maximum '''
-        for i in range(self.nrows * (4 if num >= 10 else 1)):
-            self.lbls.get((num, i + 1)).config(bg=colour)
-            
+        ''' Batch update when tracker exceeds/resume from maximum, the column background is a single item '''
+        self.parent.refresher.config(self.columns.get(num), colour=colour)
+
     def destroy(self):
         self.exists = False
+        self.lbls = None
+        self.columns = None
         super().destroy()
 
+# The hot paths timed by the instrumentation of the debug menu, as (class, method name).
+# The handlers bound to the widgets are kept as is, the methods they call are wrapped instead.
+HOT_PATHS = (
+    (MapElem, 'release'),
+    (Field, 'flag'),
+    (engine.Board, 'clicked'),
+    (engine.Board, 'reveal'),
+    (Field, 'build'),
+    (NumbHelper, 'change_flag'),
+    (HintBar, 'update'),
+    (recorder.RecordKeeper, 'save'),
+    (Refresher, 'flush'),
+)
+# The clicks and flags open the span to the next redraw
+HOT_PATH_INPUTS = HOT_PATHS[:2]
+
+
 def run():
     gui = GUI()
     gui.run()
@@ -0,0 +1,133 @@
+'''
+Opt-in instrumentation of the hot paths for the debug menu: call counts and latency histograms,
+and cProfile captures of the session.
+The methods are only wrapped while it is on, so the game runs the original methods otherwise.
+'''
+import cProfile
+import json
+from functools import wraps
+from time import perf_counter
+
+# Name of the span from an input event to the end of the next redraw
+INPUT_TO_REDRAW = 'input to redraw'
+
+
+class Latency:
+    ''' Call count and latency histogram of a hot path, the buckets double in size from 1 µs '''
+    __slots__ = ('calls', 'total', 'worst', 'buckets')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.buckets = {}
+
+    def add(self, seconds: float):
+        self.calls += 1
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+        # the bucket of everything up to 2 ** bucket µs
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_us': round(self.total * 1e6 / self.calls, 1) if self.calls else 0.0,
+            'worst_ms': round(self.worst * 1000, 3),
+            'histogram_us': {'<{}'.format(2 ** bucket): self.buckets[bucket] for bucket in sorted(self.buckets)},
+        }
+
+
+class Instruments:
+    '''
+    Times the targets, given as (class, method name), while enabled.
+
+    The calls of the inputs open a span that the next call of the redraw closes,
+    e.g. from the click handler to the end of the idle time flush that draws its updates.
+    '''
+    def __init__(self, targets, inputs=(), redraw=None):
+        self.targets = targets
+        self.inputs = inputs
+        self.redraw = redraw
+        self.stats = {}
+        self.originals = {}
+        self.input_start = None
+        self.profile = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.originals)
+
+    @staticmethod
+    def name(target: tuple) -> str:
+        return '{}.{}'.format(target[0].__name__, target[1])
+
+    def enable(self):
+        ''' Wrap the targets, the stats keep adding up from before '''
+        for target in self.targets:
+            if target in self.originals:
+                continue
+            owner, attr = target
+            original = self.originals[target] = owner.__dict__[attr]
+            setattr(owner, attr, self.timed(target, original))
+
+    def disable(self):
+        ''' Put the original methods back '''
+        for (owner, attr), original in self.originals.items():
+            setattr(owner, attr, original)
+        self.originals.clear()
+        self.input_start = None
+
+    def timed(self, target: tuple, func):
+        ''' Wrap the method to add its latency to the stats '''
+        latency = self.stats.setdefault(Instruments.name(target), Latency())
+        opens = target in self.inputs
+        closes = target == self.redraw
+        spans = self.stats.setdefault(INPUT_TO_REDRAW, Latency())
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            if opens and self.input_start is None:
+                self.input_start = start
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = perf_counter()
+                latency.add(end - start)
+                if closes and self.input_start is not None:
+                    spans.add(end - self.input_start)
+                    self.input_start = None
+        return wrapper
+
+    def reset(self):
+        ''' Clear the stats, the wrapped methods keep adding to them '''
+        for latency in self.stats.values():
+            latency.clear()
+
+    def dump(self, filename: str):
+        ''' Write the stats out as JSON '''
+        with open(filename, 'w') as file:
+            json.dump(
+                {name: latency.as_dict() for name, latency in sorted(self.stats.items()) if latency.calls},
+                file, indent=2
+            )
+
+    def start_profile(self):
+        ''' Start a cProfile capture of the session '''
+        if self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def stop_profile(self, filename: str = None):
+        ''' Stop the capture and save it for pstats (e.g. `python -m pstats <file>`), dropped without a filename '''
+        if self.profile is not None:
+            self.profile.disable()
+            if filename:
+                self.profile.dump_stats(filename)
+            self.profile = None
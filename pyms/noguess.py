@@ -0,0 +1,262 @@
+''' No guess boards, searched for across all the cores and kept in a per mode index on disk '''
+import argparse
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from random import Random, randrange
+from sys import maxsize
+from time import perf_counter
+from . import constants as c
+from . import engine
+from .simulate import parse_mode
+from .solver import create_solver
+
+# Candidate seeds each worker task tries, enough to keep the task overhead down on the small modes
+SEEDS_PER_TASK = 64
+# ... unless it runs out of time first, so the larger modes still check in and stop quickly
+TASK_SECONDS = 0.5
+# No guess seeds kept in the index for each mode, the GUI tops it back up in the background
+INDEX_TARGET = 20
+# The background search gives up on a mode for the session once it has searched it this long ...
+SAMPLE_SECONDS = 30
+# ... and found less than a board for every this many seconds, too rare to keep up with the games
+SECONDS_PER_SEED = 60
+
+
+def solves(mode: c.MODE_CONFIG, seed: int, start: int, generator: int = engine.GENERATOR_LATEST) -> bool:
+    ''' Whether the solver clears the board of the seed from the start cell without a single guess '''
+    board = engine.create_board(mode, seed=seed, generator=generator, opening=True, start=start)
+    solver = create_solver(board)
+    solver.update(board.clicked(start))
+    while solver.safe and not board.is_over:
+        solver.update(board.clicked(solver.safe.pop()))
+    return board.is_won
+
+
+def search(task: tuple) -> tuple:
+    '''
+    Try the candidate seeds of the task, which is (mode, seed of the candidates),
+    returns the amount tried and the (seed, start) found.
+    '''
+    mode, seed = task
+    rnd = Random(seed)
+    size = mode.x * mode.y
+    found = []
+    start_time = perf_counter()
+    for tries in range(1, SEEDS_PER_TASK + 1):
+        candidate, start = rnd.randrange(maxsize), rnd.randrange(size)
+        if solves(mode, candidate, start):
+            found.append((candidate, start))
+        if perf_counter() - start_time > TASK_SECONDS:
+            break
+    return tries, found
+
+
+class SeedIndex:
+    '''
+    The no guess seeds found for each mode, along with the generator and the start cell they were solved from.
+    Kept in its own database next to the records, the searches can add to it from any thread or process.
+    '''
+    default_database = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.noguess.db')
+
+    def __init__(self, database=None):
+        # The background search adds from its own thread, each thread opens its own index
+        self.db = sqlite3.connect(database or SeedIndex.default_database, timeout=10)
+        self.db.execute('PRAGMA journal_mode = WAL')
+        with self.db:
+            self.db.executescript('''
+                CREATE TABLE IF NOT EXISTS seeds (
+                    id INTEGER PRIMARY KEY, x INTEGER, y INTEGER, amount INTEGER, special INTEGER,
+                    seed INTEGER, generator INTEGER, start INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS seeds_by_mode ON seeds (x, y, amount, special);
+            ''')
+
+    @staticmethod
+    def key(mode: c.MODE_CONFIG) -> tuple:
+        ''' The boards only depend on the geometry, the name and rate don't matter '''
+        return mode.x, mode.y, mode.amount, int(mode.special)
+
+    def add(self, mode: c.MODE_CONFIG, found, generator: int = engine.GENERATOR_LATEST):
+        ''' Add the (seed, start) found for the mode '''
+        with self.db:
+            self.db.executemany(
+                'INSERT INTO seeds (x, y, amount, special, seed, generator, start) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((*SeedIndex.key(mode), seed, generator, start) for seed, start in found)
+            )
+
+    def pop(self, mode: c.MODE_CONFIG):
+        ''' Take out the oldest seed of the mode as (seed, generator, start), None if there are none left '''
+        with self.db:
+            row = self.db.execute(
+                'SELECT id, seed, generator, start FROM seeds WHERE x = ? AND y = ? AND amount = ? AND special = ? '
+                'ORDER BY id LIMIT 1',
+                SeedIndex.key(mode)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute('DELETE FROM seeds WHERE id = ?', (row[0], ))
+        return row[1:]
+
+    def count(self, mode: c.MODE_CONFIG) -> int:
+        ''' Seeds left for the mode '''
+        return self.db.execute(
+            'SELECT COUNT(*) FROM seeds WHERE x = ? AND y = ? AND amount = ? AND special = ?', SeedIndex.key(mode)
+        ).fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def generate(mode: c.MODE_CONFIG, wanted: int, index: SeedIndex, workers: int = None, seed: int = None,
+             stop: threading.Event = None, mp_context=None, give_up=None) -> dict:
+    '''
+    Search for the no guess seeds of the mode across a process pool until wanted are found or stop is set,
+    each one is added to the index as soon as it is found. Returns the summary of the search.
+    give_up is called with the seconds searched and the amount found so far, the search ends once it returns True.
+    '''
+    rnd = Random(randrange(maxsize) if seed is None else seed)
+    workers = workers or os.cpu_count() or 1
+    found = searched = 0
+    start = perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+    try:
+        pending = set()
+        while found < wanted and not (stop is not None and stop.is_set()):
+            # Keep every worker busy with one more task lined up
+            while len(pending) < workers * 2:
+                pending.add(executor.submit(search, (mode, rnd.randrange(maxsize))))
+            done, pending = wait(pending, timeout=TASK_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                count, seeds = future.result()
+                searched += count
+                # The tasks finishing together can find more than wanted
+                seeds = seeds[:wanted - found]
+                if seeds:
+                    index.add(mode, seeds)
+                    found += len(seeds)
+            if give_up is not None and give_up(perf_counter() - start, found):
+                break
+    finally:
+        # The tasks still running are short, the ones lined up are dropped
+        executor.shutdown(cancel_futures=True)
+    elapsed = perf_counter() - start
+    return {
+        'found': found,
+        'searched': searched,
+        'workers': workers,
+        'seconds': elapsed,
+        'seeds_per_sec': searched / elapsed if elapsed else 0.0,
+    }
+
+
+class Filler(threading.Thread):
+    '''
+    Tops up the index of the requested modes in the background, so starting a no guess game never searches.
+    The pool is spawned rather than forked from the GUI process, on half the cores to leave the rest to the game.
+    The modes too rare to keep up with are given up on for the session, see hopeless.
+    '''
+    def __init__(self, database=None, target: int = INDEX_TARGET, workers: int = None):
+        super().__init__(name='pyms-noguess', daemon=True)
+        self.database = database
+        self.target = target
+        self.workers = workers or max(1, (os.cpu_count() or 1) // 2)
+        # the (seconds searched, seeds found) of each SeedIndex.key this session
+        self.searched = {}
+        # the SeedIndex.key of the modes given up on, never searched again this session
+        self.gave_up = set()
+        self.wanted = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        # set to stop the current search, to move on to a newer request or to close
+        self.interrupt = threading.Event()
+        # the mode being searched, None while waiting
+        self.current = None
+        self.closing = False
+
+    @staticmethod
+    def hopeless(seconds: float, found: int) -> bool:
+        ''' Whether the mode searched for the seconds with found seeds to show for it is too rare to keep searching '''
+        return seconds >= SAMPLE_SECONDS and (not found or seconds / found > SECONDS_PER_SEED)
+
+    def gave_up_on(self, mode: c.MODE_CONFIG) -> bool:
+        return SeedIndex.key(mode) in self.gave_up
+
+    def request(self, mode: c.MODE_CONFIG):
+        ''' Ask for the mode to be topped up, the latest request goes first '''
+        if self.gave_up_on(mode):
+            return
+        with self.lock:
+            if mode in self.wanted:
+                self.wanted.remove(mode)
+            self.wanted.append(mode)
+            # the search of the same mode carries on with its pool, only another mode stops it
+            if mode != self.current:
+                self.interrupt.set()
+        self.wake.set()
+
+    def run(self):
+        index = SeedIndex(self.database)
+        try:
+            while not self.closing:
+                with self.lock:
+                    mode = self.current = self.wanted.pop() if self.wanted else None
+                    self.interrupt.clear()
+                if mode is None:
+                    self.wake.wait()
+                    self.wake.clear()
+                    continue
+                missing = self.target - index.count(mode)
+                if missing > 0:
+                    key = SeedIndex.key(mode)
+                    before = self.searched.get(key, (0.0, 0))
+                    summary = generate(
+                        mode, missing, index, self.workers, stop=self.interrupt, mp_context=get_context('spawn'),
+                        give_up=lambda seconds, found: Filler.hopeless(before[0] + seconds, before[1] + found)
+                    )
+                    self.searched[key] = before[0] + summary['seconds'], before[1] + summary['found']
+                    with self.lock:
+                        if Filler.hopeless(*self.searched[key]):
+                            # the seeds already found are still played, the GUI falls back to regular boards after
+                            self.gave_up.add(key)
+                            self.wanted = [wanted for wanted in self.wanted if SeedIndex.key(wanted) != key]
+                        elif index.count(mode) < self.target and mode not in self.wanted:
+                            # Interrupted by a newer request, carry on with this one after it
+                            self.wanted.insert(0, mode)
+                        self.current = None
+        finally:
+            index.close()
+
+    def close(self, timeout: float = 2.0):
+        ''' Stop the search, the seeds already found stay in the index '''
+        self.closing = True
+        self.interrupt.set()
+        self.wake.set()
+        self.join(timeout)
+
+
+def main(argv=None):
+    ''' Entry point of `python -m pyms noguess` '''
+    modes = ', '.join('{}={}'.format(key, mode.name) for key, mode in c.MODES.items())
+    parser = argparse.ArgumentParser(prog='python -m pyms noguess', description=__doc__)
+    parser.add_argument('-n', '--seeds', type=int, default=INDEX_TARGET, help='no guess seeds to add to the index')
+    parser.add_argument('-m', '--mode', type=parse_mode, default=c.MODES.get(0),
+                        help='mode ({}) or WIDTHxHEIGHTxIEDS for a custom field'.format(modes))
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (all cores by default)')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the candidate seeds, to repeat a search')
+    parser.add_argument('--index', default=None, help='index database (next to the records by default)')
+    args = parser.parse_args(argv)
+
+    index = SeedIndex(args.index)
+    try:
+        summary = generate(args.mode, args.seeds, index, args.workers, args.seed)
+        summary['total'] = index.count(args.mode)
+    finally:
+        index.close()
+    print(
+        '{found} no guess seeds found out of {searched} on {workers} workers ({seeds_per_sec:.1f} seeds/sec), '
+        '{total} in the index'.format(**summary)
+    )
+    return summary
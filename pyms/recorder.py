@@ -3,10 +3,15 @@
 # TODO - Check over the module to clear up any testing artifacts
 import os
 import pickle
+from bisect import bisect_right
+import sqlite3
+import threading
 import tkinter as tk
 
+from tkinter import ttk
 from tkinter.messagebox import askyesno, showerror
 from .constants import RECORD, MODES, MODE_CONFIG
+from .engine import format_seed
 
 def get_mode(mode):
     ''' Convert to MODE_CONFIG if passed an int '''
@@ -14,9 +19,52 @@ def get_mode(mode):
         mode = MODES.get(mode)
     return mode
 
+class Checkpointer(threading.Thread):
+    '''
+    Folds the write-ahead log back into the database off the UI thread.
+    The records are safe in the log as soon as they are committed, the checkpoint only keeps the log short.
+    '''
+    def __init__(self, database):
+        super().__init__(name='pyms-checkpoint', daemon=True)
+        self.database = database
+        self.wake = threading.Event()
+        self.closing = False
+
+    def run(self):
+        # sqlite connections stay on the thread that made them
+        db = sqlite3.connect(self.database)
+        try:
+            while not self.closing:
+                self.wake.wait()
+                self.wake.clear()
+                try:
+                    db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                except sqlite3.Error:
+                    # Busy or locked, the log just stays longer until the next request tries again
+                    pass
+        finally:
+            db.close()
+
+    def request(self):
+        ''' Ask for a checkpoint, any requests made before it gets around to it are folded into one '''
+        self.wake.set()
+
+    def close(self, timeout: float = 2.0):
+        ''' Stop, the last checkpoint is left to the keeper on its own connection '''
+        self.closing = True
+        self.wake.set()
+        self.join(timeout)
+
+
 class RecordKeeper:
     default_filepath = os.path.dirname(os.path.abspath(__file__))
+    default_database = os.path.join(default_filepath, '.data.db')
+    # The pickled records from before the database, migrated on first load
     default_filename = os.path.join(default_filepath, '.data.pms')
+    # Bump when the tables change, the database keeps it as the user_version
+    schema_version = 4
+    # The (x, y, amount) of the custom mode are kept in the options table under these, below the options
+    custom_indexes = (-3, -2, -1)
 
     @staticmethod
     def mode_str(mode: MODE_CONFIG):
@@ -30,19 +78,116 @@ class RecordKeeper:
             y=mode.y
         )
 
-    def __init__(self, parent, records_to_keep: int = 10):
+    def __init__(self, parent, records_to_keep: int = 1000):
         self.parent = parent
+        # Only bounds what is loaded and shown, the database keeps every record (and its replay) on purpose
+        # so a larger records_to_keep later still has the whole history to rank.
         self._max = records_to_keep
+        self.window = None
+        self.shown = []
+        self.sort_column = None
+        self.sort_reverse = False
         self.is_loaded = False
-
+        self.db = None
+        self.checkpointer = None
+        self.leaderboards = {}
+
+    def connect(self, database=None):
+        ''' Open the database and create the tables if they don't exist yet, returns the schema version found '''
+        database = database or RecordKeeper.default_database
+        self.db = sqlite3.connect(database)
+        version = self.db.execute('PRAGMA user_version').fetchone()[0]
+        # Commits are appended to the write-ahead log and synced, a torn write only loses the last commit.
+        # The log is checkpointed in the background instead of by the commit that fills it up.
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = FULL')
+        self.db.execute('PRAGMA wal_autocheckpoint = 0')
+        record_columns = ', '.join(
+            '{} {}'.format(field, 'TEXT' if field == 'time_str' else 'REAL' if field == 'time_val' else 'INTEGER')
+            for field in RECORD._fields
+        )
+        with self.db:
+            if version == 1:
+                # the replays were added in version 2
+                self.db.execute('ALTER TABLE records ADD COLUMN replay BLOB')
+            if 0 < version < 3:
+                # the start cell of the no guess boards was added in version 3
+                self.db.execute('ALTER TABLE records ADD COLUMN start INTEGER')
+            if 0 < version < 4:
+                # the opening around the start cell was added in version 4, the no guess boards always had it
+                self.db.execute('ALTER TABLE records ADD COLUMN opening INTEGER DEFAULT 1')
+            self.db.executescript('''
+                CREATE TABLE IF NOT EXISTS modes (
+                    mode TEXT PRIMARY KEY, name TEXT, x INTEGER, y INTEGER, rate REAL, amount INTEGER, special INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY, mode TEXT NOT NULL REFERENCES modes, sort_key REAL NOT NULL, {columns},
+                    replay BLOB
+                );
+                CREATE INDEX IF NOT EXISTS records_by_rank ON records (mode, sort_key);
+                CREATE TABLE IF NOT EXISTS options (idx INTEGER PRIMARY KEY, value INTEGER);
+                PRAGMA user_version = {version};
+            '''.format(columns=record_columns, version=RecordKeeper.schema_version))
+            self.db.executemany(
+                'INSERT OR IGNORE INTO modes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((RecordKeeper.mode_str(mode), *mode) for mode in MODES.values())
+            )
+        self.checkpointer = Checkpointer(database)
+        self.checkpointer.start()
+        return version
+
+    def close(self):
+        ''' Stop the checkpoints and close the database '''
+        if self.checkpointer is not None:
+            self.checkpointer.close()
+            self.checkpointer = None
+        if self.db is not None:
+            # Always fold the log back in here, the checkpointer may have stopped mid checkpoint or failed it
+            try:
+                self.db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            except sqlite3.Error:
+                pass
+            self.db.close()
+            self.db = None
 
     def init_records(self):
         ''' Initialize all records '''
         # Perhaps allow partially clearing by mode
         # If allow user to trigger, will need to import dialog.
-        self.records = {RecordKeeper.mode_str(mode): [] for val, mode in MODES.items()}
+        with self.db:
+            self.db.execute('DELETE FROM records')
+        self.leaderboards.clear()
         self.save()
 
+    def modes(self) -> list:
+        ''' All the mode strs, the standard modes first followed by any custom modes with records '''
+        return [row[0] for row in self.db.execute('SELECT mode FROM modes ORDER BY rowid')]
+
+    def mode_config(self, mode_str: str) -> MODE_CONFIG:
+        ''' The MODE_CONFIG saved for the mode str, None if unknown '''
+        row = self.db.execute('SELECT name, x, y, rate, amount, special FROM modes WHERE mode = ?', (mode_str, )).fetchone()
+        return None if row is None else MODE_CONFIG(*row[:5], bool(row[5]))
+
+    def top(self, mode, limit: int = None) -> list:
+        ''' The best RecordEntry of the mode, up to the limit (records_to_keep by default) '''
+        if not isinstance(mode, str):
+            mode = RecordKeeper.mode_str(mode)
+        mode_config = self.mode_config(mode)
+        if mode_config is None:
+            return []
+        rows = self.db.execute(
+            'SELECT sort_key, {} FROM records WHERE mode = ? ORDER BY sort_key, id LIMIT ?'.format(', '.join(RECORD._fields)),
+            (mode, self._max if limit is None else limit)
+        )
+        return [RecordEntry(mode_config, RECORD(*row[1:]), sort_key=row[0]) for row in rows]
+
+    def leaderboard(self, mode_str: str):
+        ''' The Leaderboard of the mode, loaded once and kept up to date as records are added '''
+        board = self.leaderboards.get(mode_str)
+        if board is None:
+            board = self.leaderboards[mode_str] = Leaderboard(self._max, self.top(mode_str))
+        return board
+
     # The decorator needs to be static, so need to surpress the linter warning.
     # pylint: disable=no-self-argument
     def check_loaded(func):
@@ -58,26 +203,37 @@ class RecordKeeper:
 
     @check_loaded
     def show(self, current_mode=None):
+        ''' Show the highscores window, it is only built the first time and hidden when closed '''
+        if self.window is None:
+            self.build_window()
+        else:
+            self.window.deiconify()
+        self.window.focus_force()
+        self.window.grab_set()
+        # custom modes might have been added since
+        self.opt_mode.config(values=self.modes())
+
+        # set the default value, the trace refreshes the records even if it's unchanged
+        if current_mode:
+            self.var_mode.set(RecordKeeper.mode_str(current_mode))
+        else:
+            # fall back scenario - though, shouldn't reach this point unless testing.
+            self.var_mode.set(self.modes()[0])
+
+    def build_window(self):
         ''' Build the main window contents '''
         # build the opt_mode menu
         self.window = tk.Toplevel(master=self.parent, padx=5, pady=5)
         self.window.title('Highscores')
-        self.window.focus_force()
-        self.window.grab_set()
-        self.var_records = [RecordTkVar() for _ in range(self._max)]
+        self.window.protocol('WM_DELETE_WINDOW', self.hide)
         self.var_mode = tk.StringVar(master=self.window)
         self.var_mode.trace('w', self._update_entries)
-        opt_mode = tk.OptionMenu(
-            self.window,
-            self.var_mode,
-            *self.records.keys(),
-        )
-        opt_mode.config(relief=tk.RIDGE)
+        self.opt_mode = ttk.Combobox(self.window, textvariable=self.var_mode, state='readonly', width=45)
         lbl_mode = tk.Label(master=self.window, text="Mode: ")
         self.window.grid_columnconfigure(index=0, weight=1)
         self.window.grid_columnconfigure(index=1, weight=2)
         lbl_mode.grid(row=0, column=0, sticky=tk.E)
-        opt_mode.grid(row=0, column=1, sticky=tk.W)
+        self.opt_mode.grid(row=0, column=1, sticky=tk.W)
 
         # build the records frame
         self.frm_main = tk.Frame(master=self.window, padx=5, pady=5)
@@ -87,12 +243,10 @@ class RecordKeeper:
         btn_clear.grid(row=2, column=0, columnspan=2)
         # self.__build_test_buttons()
 
-        # set the default value
-        if current_mode:
-            self.var_mode.set(RecordKeeper.mode_str(current_mode))
-        else:
-            # fall back scenario - though, shouldn't reach this point unless testing.
-            self.var_mode.set(next(iter(self.records.keys())))
+    def hide(self):
+        ''' Keep the window around for the next time '''
+        self.window.grab_release()
+        self.window.withdraw()
 
     def __build_test_buttons(self):
         ''' buttons for testing '''
@@ -111,93 +265,171 @@ class RecordKeeper:
         self.var_mode.set(self.var_mode.get())  # trigger call back to refresh
 
     @check_loaded
-    def add_record(self, mode: MODE_CONFIG, data):
-        ''' Add record to mode '''
+    def add_record(self, mode: MODE_CONFIG, data, replay: bytes = None):
+        ''' Add record to mode, along with the replay of the game '''
         mode = get_mode(mode)
-        records = self.records[RecordKeeper.mode_str(mode)]
-        records.append(RecordEntry(mode, data))
-        records.sort(key=lambda record: record.sort_key())
-        records[:] = records[:self._max]
-        self.save()
+        mode_str = RecordKeeper.mode_str(mode)
+        with self.db:
+            # Custom modes only get their entry once won
+            self.db.execute('INSERT OR IGNORE INTO modes VALUES (?, ?, ?, ?, ?, ?, ?)', (mode_str, *mode))
+            record = RecordEntry(mode, data)
+            self.insert(mode_str, record, replay)
+        self.checkpointer.request()
+        if mode_str in self.leaderboards:
+            self.leaderboards[mode_str].add(record)
+
+    def insert(self, mode_str: str, record, replay: bytes = None):
+        ''' Insert the single row of the record, within the caller's transaction '''
+        self.db.execute(
+            'INSERT INTO records (mode, sort_key, replay, {}) VALUES (?, ?, ?, {})'.format(
+                ', '.join(RECORD._fields), ', '.join('?' * len(RECORD._fields))
+            ),
+            (mode_str, record.sort_key(), replay, *record.data)
+        )
+
+    def replays(self, mode):
+        ''' All the records of the mode that have a replay, as (RecordEntry, replay bytes) in rank '''
+        if not isinstance(mode, str):
+            mode = RecordKeeper.mode_str(mode)
+        mode_config = self.mode_config(mode)
+        if mode_config is None:
+            return
+        rows = self.db.execute(
+            'SELECT sort_key, replay, {} FROM records WHERE mode = ? AND replay IS NOT NULL ORDER BY sort_key, id'.format(
+                ', '.join(RECORD._fields)
+            ),
+            (mode, )
+        )
+        for row in rows:
+            yield RecordEntry(mode_config, RECORD(*row[2:]), sort_key=row[0]), row[1]
 
     def build_records(self):        # pylint: disable=unused-argument
-        ''' Build the individual records '''
+        ''' Build the records view '''
         frm = self.frm_main
         tk.Label(frm, text='♠ ⃞')   # ??? If I don't add this line, somehow the combining unicode headers will mess up...?!?!
-        headers = ['Rank', 'Seed', 'Time',
-                   '❓', '❗', '✨',
-                   'Σ Hints', '⚑ Track', '♠ ⃞ Hits',
-                   '♥ ⃞  Rating']
-        stickys = [tk.W] + [tk.E] * 9
-        justifys = [tk.LEFT] + [tk.RIGHT] * 9
-        widths = [5, 10, 8] + [5] * 6 + [8]
-        for row in range(self._max):
-            if row == 0:
-                for col, header in enumerate(headers):
-                    tk.Label(frm, text=header, justify=justifys[col]).grid(row=row, column=col, sticky=stickys[col])
-            else:
-                for col in range(len(headers)):
-                    if col == 0:
-                        widget = tk.Label(frm, text=row)
-                    else:
-                        widget = tk.Entry(master=frm,
-                                          textvariable=self.var_records[row-1][col-1],
-                                          justify=justifys[col], state='readonly',
-                                          relief=tk.FLAT, width=widths[col])
-                    widget.grid(row=row, column=col, sticky=stickys[col])
+        self.view = RecordView(frm, self.sort_records)
+        self.view.grid(row=0, column=0)
+        self.view.bar.grid(row=0, column=1, sticky=tk.NS)
 
     def _update_entries(self, *args):
-        ''' Update the record variables with the current mode records '''
-        records = self.records.get(self.var_mode.get(), [])
-        records.sort(key=lambda record: record.sort_key())
-        gen_records = iter(records)
-        # records = iter(self.records.get(self.var_mode.get(), []))
-        # for i, record in enumerate(records):
-        #     self.var_records[i].update(record)
-        for var in self.var_records:
-            # r = next(records, None)
-            # var.update(r)
-            var.update(next(gen_records, None))
-
-    def save(self, filename=None):
+        ''' Show the records of the current mode in rank '''
+        self.sort_column = None
+        self.shown = list(enumerate(self.leaderboard(self.var_mode.get()), 1))
+        self.view.set_rows([record_values(rank, record) for rank, record in self.shown])
+
+    def sort_records(self, column: int):
+        ''' Sort the shown records by the column, sorting the same column again reverses it '''
+        reverse = self.sort_column == column and not self.sort_reverse
+        self.sort_column, self.sort_reverse = column, reverse
+        self.shown.sort(key=RECORD_SORT_KEYS[column], reverse=reverse)
+        self.view.set_rows([record_values(rank, record) for rank, record in self.shown])
+
+    def save(self):
+        ''' Save the options, the records are already saved as they are added '''
         if self.is_loaded:
-            if not filename:
-                filename = RecordKeeper.default_filename
             try:
                 options = [opt.get() for opt in self.parent.options]
             except AttributeError:
                 options = []
-            with open(filename, 'wb') as file:
-                pickle.dump((self.records, options), file)
-
-    def load(self, filename=None):
-        if not filename:
-            filename = RecordKeeper.default_filename
+            custom = getattr(self.parent, 'custom_mode', None)
+            with self.db:
+                self.db.execute('DELETE FROM options')
+                self.db.executemany('INSERT INTO options VALUES (?, ?)', enumerate(options))
+                if custom is not None:
+                    self.db.executemany(
+                        'INSERT INTO options VALUES (?, ?)',
+                        zip(RecordKeeper.custom_indexes, (custom.x, custom.y, custom.amount))
+                    )
+
+    def load(self, database=None):
+        ''' Open the records database and return the saved options '''
         try:
-            with open(filename, 'rb') as file:
-                self.records, options = pickle.load(file)
-                self.is_loaded = True
-                return options
+            if self.connect(database) == 0:
+                self.migrate()
+            self.is_loaded = True
+            options = self.db.execute('SELECT idx, value FROM options WHERE idx >= 0 ORDER BY idx')
+            return [value for _, value in options] or None
 
-        except FileNotFoundError:
-            print('File not found, assuming empty records...')
-    
-        except pickle.UnpicklingError:
+        except sqlite3.DatabaseError:
             result = askyesno('Corrupted',
                 'Records appear to be corrupted and cannot be loaded.\n\nClear ALL records and start fresh?')
             if not result:
                 return None
 
+        # The database can't be read, start over with a new one unless stopped by users.
+        self.close()
+        database = database or RecordKeeper.default_database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(database + suffix):
+                os.remove(database + suffix)
+        self.connect(database)
+        self.is_loaded = True
+        return None
+
+    def custom_size(self):
+        ''' The saved (x, y, amount) of the custom mode, None if there is none '''
+        if not self.is_loaded:
+            return None
+        saved = dict(self.db.execute('SELECT idx, value FROM options WHERE idx < 0'))
+        if any(idx not in saved for idx in RecordKeeper.custom_indexes):
+            return None
+        return tuple(saved[idx] for idx in RecordKeeper.custom_indexes)
+
+    def migrate(self, filename=None):
+        ''' One time import of the pickled records and options into the new database '''
+        try:
+            with open(filename or RecordKeeper.default_filename, 'rb') as file:
+                records, options = pickle.load(file)
+        except FileNotFoundError:
+            return
         except Exception as e:      # pylint: disable=broad-except,invalid-name
-            # suppressing pylint for now, will test to see what exceptions can be expected
-            print('Not sure what went wrong, why not take a look:\n{e}'.format(e=e))
+            # Leave the old file as is, nothing else can be done with it
+            print('Unable to migrate the old records:\n{e}'.format(e=e))
+            return
+        with self.db:
+            for mode_str, entries in records.items():
+                for entry in entries:
+                    self.db.execute('INSERT OR IGNORE INTO modes VALUES (?, ?, ?, ?, ?, ?, ?)', (mode_str, *entry.mode))
+                    # The pickled entries skipped the init, so recreate them to have the rating and key
+                    self.insert(mode_str, RecordEntry(entry.mode, entry.data))
+            self.db.executemany('INSERT INTO options VALUES (?, ?)', enumerate(options))
+
+
+class Leaderboard:
+    '''
+    The best records of a mode, kept in rank by bisecting on their cached sort keys
+    and bounded to the size, so adding a record never sorts the whole list again.
+    Records pushed past the size are only dropped from the board, their rows stay in the database.
+    '''
+    def __init__(self, size: int, records=()):
+        self.size = size
+        self._keys = []
+        self._records = []
+        for record in records:
+            self.add(record)
+
+    def add(self, record) -> int:
+        ''' Insert the record in rank, returns the rank (starting at 0) or None if it didn't make the cut '''
+        key = record.sort_key()
+        # Ties go after the existing records, same as the ORDER BY sort_key, id of the database
+        rank = bisect_right(self._keys, key)
+        if rank >= self.size:
             return None
+        self._keys.insert(rank, key)
+        self._records.insert(rank, record)
+        if len(self._records) > self.size:
+            self._keys.pop()
+            self._records.pop()
+        return rank
 
-        # If no records are loaded for whatever reason, initiate the records unless stopped by users.
-        if not self.is_loaded:
-            self.init_records()
-            self.is_loaded = True
-        return None
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        return self._records[index]
 
 
 class RecordEntry:
@@ -207,13 +439,19 @@ class RecordEntry:
     Attributes:
     rating      - provide a rating derived from the RECORD data
     sort_key()  - provide a ranked index for sorting.
+
+    Both are computed once, the sort_key can be passed in if already known (e.g. stored with the record).
     '''    
-    def __init__(self, mode: MODE_CONFIG, data: RECORD):
+    def __init__(self, mode: MODE_CONFIG, data: RECORD, sort_key: float = None):
         self.data = data
         self.mode = get_mode(mode)
+        self.rating = self.calculate_rating()
+        if sort_key is None:
+            # Increase time by rating, so that there is a penalty to a lower rating.
+            sort_key = 2 * self.data.time_val - self.data.time_val * self.rating
+        self._sort_key = sort_key
 
-    @property
-    def rating(self) -> float:
+    def calculate_rating(self) -> float:
         '''
         Calculate the rating to apply against the duration
         Based on the numerous factors from blackjack mode
@@ -245,9 +483,7 @@ class RecordEntry:
 
     def sort_key(self):
         ''' return the key for sorting '''
-        # Increase time by rating, so that there is a penalty to a lower rating.
-        key = 2 * self.data.time_val - self.data.time_val * self.rating
-        return key
+        return self._sort_key
 
     def __str__(self):
         return self.__repr__()
@@ -259,52 +495,94 @@ class RecordEntry:
             data=self.data
         )
 
-class RecordTkVar:
-    def __init__(self, n_data_to_show: int = 9):
-        self.n = n_data_to_show
-        self._default = ''
-        self._vars = [tk.StringVar(value=self._default) for _ in range(self.n)]
-        self.formatter = {
-            'opt_mouseover': ['☐', '☒'],   #'☑'],
-            'opt_tracker': ['☐', '☒'],     #'☑'],
-            'opt_allow_hits': ['⛔', '☕', '♿'],
-        }
-    
-    def update(self, record: RecordEntry = None):
-        ''' Update the inner tkvars '''
-        # print(type(record), RecordEntry, record.__class__, RecordEntry.__class__)
-        if isinstance(record, RecordEntry):
-            fields = record.data._fields
-            for i, var in enumerate(self._vars):
-                if i < 2:
-                    # Seed and time
-                    var.set(record.data[i+1])
-                elif record.mode.special:
-                    if i < self.n - 1:
-                        if fields[i+1].startswith('opt'):
-                            # use special format
-                            var.set(self.formatter.get(fields[i+1])[record.data[i+1]])
-                        else:
-                            var.set(record.data[i+1])
-                    else:
-                        # if the last record, show rating instead
-                        var.set('{:05.2f}%'.format(record.rating * 100))
-                else:
-                    var.set('-')
+# The fields shown after the seed and time, the generator and start are shown as part of the seed
+RECORD_SHOWN_FIELDS = RECORD._fields[3:-3]
+
+# Format of the option fields in the records view
+RECORD_FORMATTER = {
+    'opt_mouseover': ['☐', '☒'],   #'☑'],
+    'opt_tracker': ['☐', '☒'],     #'☑'],
+    'opt_allow_hits': ['⛔', '☕', '♿'],
+}
+
+def record_values(rank: int, record: RecordEntry) -> tuple:
+    ''' The values of the record as shown in the records view '''
+    data = record.data
+    # Seed, along with the generator and start cell it needs to reproduce, and time
+    values = [rank, format_seed(data.seed, data.generator, data.start, data.opening), data.time_str]
+    for field in RECORD_SHOWN_FIELDS:
+        if not record.mode.special:
+            values.append('-')
+        elif field.startswith('opt'):
+            # use special format
+            values.append(RECORD_FORMATTER.get(field)[getattr(data, field)])
         else:
-            self.clear()
-    
-    def clear(self):
-        ''' Clear the inner tkvars '''
-        for var in self._vars:
-            var.set(self._default)
-
-    @property
-    def values(self):
-        return [var.get() for var in self._vars]
-    
-    def __getitem__(self, index):
-        return self._vars[index]
+            values.append(getattr(data, field))
+    # show rating last
+    values.append('{:05.2f}%'.format(record.rating * 100) if record.mode.special else '-')
+    return tuple(values)
+
+# Sort key of each column in the records view, on the (rank, record) pairs
+RECORD_SORT_KEYS = [
+    lambda shown: shown[0],
+    lambda shown: (shown[1].data.generator, shown[1].data.seed),
+    lambda shown: shown[1].data.time_val,
+    *(lambda shown, field=field: getattr(shown[1].data, field) for field in RECORD_SHOWN_FIELDS),
+    lambda shown: shown[1].rating,
+]
+
+class RecordView(ttk.Treeview):
+    '''
+    Records table that only holds the rows in view, the rows are refilled from the values as it scrolls.
+    No matter how many records there are, there are only as many items as the height.
+    '''
+    HEADERS = ['Rank', 'Seed', 'Time',
+               '❓', '❗', '✨',
+               'Σ Hints', '⚑ Track', '♠ ⃞ Hits',
+               '♥ ⃞  Rating']
+    WIDTHS = [45, 150, 70] + [45] * 6 + [70]
+    ROWS = 15
+
+    def __init__(self, master, sort_command):
+        columns = list(range(len(RecordView.HEADERS)))
+        super().__init__(master, columns=columns, show='headings', height=RecordView.ROWS, selectmode='none')
+        for col, (header, width) in enumerate(zip(RecordView.HEADERS, RecordView.WIDTHS)):
+            self.heading(col, text=header, command=lambda col=col: sort_command(col))
+            self.column(col, width=width, anchor=tk.W if col == 0 else tk.E, stretch=False)
+        self.items = [self.insert('', tk.END, values=()) for _ in range(RecordView.ROWS)]
+        self.row_values = []
+        self.offset = 0
+        self.bar = ttk.Scrollbar(master, orient=tk.VERTICAL, command=self.scroll)
+        self.bind('<MouseWheel>', lambda e: self.scroll('scroll', -3 if e.delta > 0 else 3, 'units'))
+        self.bind('<Button-4>', lambda e: self.scroll('scroll', -3, 'units'))
+        self.bind('<Button-5>', lambda e: self.scroll('scroll', 3, 'units'))
+
+    def set_rows(self, rows: list):
+        ''' Show the new rows from the top '''
+        self.row_values = rows
+        self.offset = 0
+        self.refresh()
+
+    def scroll(self, action, amount, what=None):
+        ''' Scrollbar command, also used by the wheel bindings '''
+        if action == 'moveto':
+            target = round(float(amount) * len(self.row_values))
+        elif what == 'pages':
+            target = self.offset + int(amount) * (RecordView.ROWS - 1)
+        else:
+            target = self.offset + int(amount)
+        target = max(0, min(target, len(self.row_values) - RecordView.ROWS))
+        if target != self.offset:
+            self.offset = target
+            self.refresh()
+
+    def refresh(self):
+        ''' Fill the items with the rows in view and update the scrollbar '''
+        for i, item in enumerate(self.items):
+            row = self.offset + i
+            self.item(item, values=self.row_values[row] if row < len(self.row_values) else ())
+        total = max(len(self.row_values), 1)
+        self.bar.set(self.offset / total, min(self.offset + RecordView.ROWS, total) / total)
 
 def _test():
     ''' Unit testing '''
@@ -0,0 +1,131 @@
+''' Compact replay log of the board actions, and the headless player to re-execute it '''
+import struct
+import sys
+from array import array
+from time import monotonic
+from . import constants as c
+from . import engine
+
+# magic, format version, flags (used_seed, opening, start) and number of actions
+HEADER = struct.Struct('<4sBBI')
+# the start cell of a no guess board follows the header, only if the flag is set (version 2 on)
+START = struct.Struct('<I')
+MAGIC = b'PMSR'
+VERSION = 2
+FLAG_USED_SEED = 1
+FLAG_OPENING = 2
+FLAG_START = 4
+
+
+class Replay:
+    '''
+    Log of the actions taken on a board, kept in three parallel arrays:
+    cells       - the cell index of each action
+    actions     - the engine ACTION_* of each action (ACTION_FLAG + the value for flags)
+    offsets     - milliseconds since the first action
+    The start_cell the board was placed around is kept along with the used_seed and opening flags.
+
+    Attach it to Board.replay to log the actions as they are played.
+    '''
+    def __init__(self, used_seed: bool = False, opening: bool = False, start_cell: int = None):
+        self.used_seed = used_seed
+        self.opening = opening
+        self.start_cell = start_cell
+        self.cells = array('I')
+        self.actions = array('B')
+        self.offsets = array('I')
+        self.start = None
+
+    def log(self, idx: int, action: int):
+        ''' Append the action with its offset from the first action '''
+        now = monotonic()
+        if self.start is None:
+            self.start = now
+        self.cells.append(idx)
+        self.actions.append(action)
+        self.offsets.append(int((now - self.start) * 1000))
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __iter__(self):
+        ''' Iterate over the (idx, action, offset) of each action '''
+        return zip(self.cells, self.actions, self.offsets)
+
+    def to_bytes(self) -> bytes:
+        ''' Pack the replay to be stored with the record '''
+        flags = FLAG_USED_SEED * bool(self.used_seed) | FLAG_OPENING * bool(self.opening)
+        header = HEADER.pack(MAGIC, VERSION, flags | FLAG_START * (self.start_cell is not None), len(self))
+        if self.start_cell is not None:
+            header += START.pack(self.start_cell)
+        arrays = [self.cells, self.actions, self.offsets]
+        if sys.byteorder != 'little':
+            arrays = [array(arr.typecode, arr) for arr in arrays]
+            for arr in arrays:
+                arr.byteswap()
+        return header + b''.join(arr.tobytes() for arr in arrays)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        ''' Unpack a stored replay, raises ValueError if it isn't one '''
+        try:
+            magic, version, flags, count = HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError('Not a replay')
+        if magic != MAGIC or not 1 <= version <= VERSION:
+            raise ValueError('Not a replay, or a replay of an unknown version')
+        replay = cls(used_seed=bool(flags & FLAG_USED_SEED), opening=bool(flags & FLAG_OPENING))
+        pos = HEADER.size
+        if flags & FLAG_START:
+            try:
+                replay.start_cell, = START.unpack_from(data, pos)
+            except struct.error:
+                raise ValueError('Truncated replay')
+            pos += START.size
+        for arr in (replay.cells, replay.actions, replay.offsets):
+            end = pos + count * arr.itemsize
+            if end > len(data):
+                raise ValueError('Truncated replay')
+            arr.frombytes(data[pos:end])
+            if sys.byteorder != 'little':
+                arr.byteswap()
+            pos = end
+        return replay
+
+
+def play(replay, mode: c.MODE_CONFIG, seed: int, generator: int = engine.GENERATOR_LATEST,
+         allow_hits: int = 0, backend: str = None) -> engine.Board:
+    '''
+    Re-execute the replay (or its bytes) on a new board of the seed as fast as it goes,
+    returns the board at the end of the replay.
+    '''
+    if not isinstance(replay, Replay):
+        replay = Replay.from_bytes(replay)
+    board = engine.create_board(
+        mode, backend=backend, seed=seed, generator=generator, allow_hits=allow_hits, opening=replay.opening,
+        start=replay.start_cell
+    )
+    # The games recorded without a seed had their first click kept clear
+    board.used_seed = replay.used_seed
+    for idx, action, _ in replay:
+        if action >= engine.ACTION_FLAG:
+            board.flag(idx, action - engine.ACTION_FLAG)
+        elif action == engine.ACTION_CLICK:
+            board.clicked(idx)
+        elif action == engine.ACTION_GUESS:
+            board.guess(idx)
+        elif action == engine.ACTION_CHORD:
+            board.chord(idx)
+        else:
+            raise ValueError('Unknown action {} in replay'.format(action))
+    return board
+
+
+def verify(replay, mode: c.MODE_CONFIG, record: c.RECORD) -> bool:
+    ''' Check the replay plays out to the recorded win '''
+    board = play(replay, mode, record.seed, generator=record.generator, allow_hits=record.opt_allow_hits)
+    if not board.is_won:
+        return False
+    if mode.special:
+        return (board.IED_guessed, board.IED_hit, board.IED_blew) == record[3:6]
+    return True
@@ -0,0 +1,203 @@
+''' Headless batch simulation of games with the built-in strategies, across all the cores '''
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from random import Random, randrange
+from sys import maxsize
+from time import perf_counter
+from . import constants as c
+from . import engine
+from .solver import create_solver
+
+# Cap on the moves of a game, in case a strategy gets stuck
+MAX_MOVES_PER_CELL = 4
+
+
+def random_cell(board: engine.Board, rnd: Random) -> int:
+    ''' Pick a random concealed and unflagged cell '''
+    # Rejection sampling is quick until the board is nearly cleared, then fall back to a scan
+    for _ in range(32):
+        idx = rnd.randrange(board.size)
+        if not board.revealed[idx] and not board.flags[idx]:
+            return idx
+    concealed = [idx for idx in range(board.size) if not board.revealed[idx] and not board.flags[idx]]
+    return rnd.choice(concealed) if concealed else rnd.randrange(board.size)
+
+
+# A strategy takes the board and returns the function that makes a move with the Random,
+# so any state of the strategy can be kept for the whole game.
+
+def random_strategy(board: engine.Board):
+    ''' Click any concealed cell '''
+    return lambda rnd: random_move(board, rnd)
+
+
+def random_move(board: engine.Board, rnd: Random):
+    board.clicked(random_cell(board, rnd))
+
+
+def simple_strategy(board: engine.Board):
+    '''
+    Apply the single cell rules around the revealed clues, otherwise click at random:
+    - if the flags add up to the clue, chord the cell
+    - if the concealed cells must all be IEDs, flag them (normal modes)
+    - if a single concealed cell is left, flag it with the remaining value (blackjack modes)
+    '''
+    return lambda rnd: simple_move(board, rnd)
+
+
+def simple_move(board: engine.Board, rnd: Random):
+    progress = False
+    for idx in range(board.size):
+        if not board.revealed[idx] or board.values[idx] or not board.clues[idx]:
+            continue
+        unknown = [adj for adj in board.adjacents(idx) if not board.revealed[adj] and not board.flags[adj]]
+        if not unknown:
+            continue
+        remaining = int(board.clues[idx]) - board.adjacent_flags(idx)
+        if remaining == 0:
+            board.chord(idx)
+        elif board.mode.special:
+            if len(unknown) == 1 and 0 < remaining <= 10:
+                board.flag(unknown[0], remaining)
+            else:
+                continue
+        elif remaining == len(unknown):
+            for adj in unknown:
+                board.flag(adj)
+        else:
+            continue
+        progress = True
+        if board.is_over:
+            return
+    if not progress:
+        random_move(board, rnd)
+
+
+def solver_strategy(board: engine.Board):
+    ''' Reveal the cells the solver deduced to be safe, otherwise click at random away from the known IEDs '''
+    solver = create_solver(board)
+
+    def move(rnd: Random):
+        if solver.safe:
+            idx = min(solver.safe)
+        else:
+            idx = random_cell(board, rnd)
+            while idx in solver.mines:
+                idx = random_cell(board, rnd)
+        solver.update(board.clicked(idx))
+    return move
+
+
+STRATEGIES = {
+    'random': random_strategy,
+    'simple': simple_strategy,
+    'solver': solver_strategy,
+}
+
+
+def play_game(task: tuple) -> dict:
+    ''' Play a single game to the end, the task is (game number, mode, seed, strategy name, allow_hits, opening) '''
+    game, mode, seed, strategy, allow_hits, opening = task
+    start = perf_counter()
+    board = engine.create_board(mode, seed=seed, allow_hits=allow_hits, opening=opening)
+    # Play it as an unseeded game, the first click is kept clear
+    board.used_seed = False
+    move = STRATEGIES[strategy](board)
+    rnd = Random(seed)
+    moves = 0
+    while not board.is_over and moves < board.size * MAX_MOVES_PER_CELL:
+        move(rnd)
+        moves += 1
+    return {
+        'game': game,
+        'seed': engine.format_seed(seed, board.generator, board.start, board.opening),
+        'won': board.is_won,
+        'cleared': board.map_cleared,
+        'goal': board.map_goal,
+        'moves': moves,
+        'guesses': board.IED_guessed,
+        'hits': board.IED_hit,
+        'blew': board.IED_blew,
+        'ms': round((perf_counter() - start) * 1000, 3),
+    }
+
+
+def simulate(games: int, mode: c.MODE_CONFIG, strategy: str = 'simple', workers: int = None,
+             seed: int = None, allow_hits: int = 0, opening: bool = False, out=None) -> dict:
+    '''
+    Play the games across a process pool, each result is written to out as a JSON line as they come in.
+    Returns the summary of all the games.
+    '''
+    if strategy not in STRATEGIES:
+        raise ValueError('Unknown strategy: {}'.format(strategy))
+    rnd = Random(randrange(maxsize) if seed is None else seed)
+    tasks = [(game, mode, rnd.randrange(maxsize), strategy, allow_hits, opening) for game in range(games)]
+    workers = workers or os.cpu_count() or 1
+    wins = cleared = 0
+    start = perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Big enough chunks that the short games don't spend their time on the queue
+        chunksize = max(1, games // (workers * 8))
+        for result in executor.map(play_game, tasks, chunksize=chunksize):
+            wins += result['won']
+            cleared += result['cleared'] / result['goal']
+            if out is not None:
+                out.write(json.dumps(result) + '\n')
+    elapsed = perf_counter() - start
+    return {
+        'games': games,
+        'workers': workers,
+        'win_rate': wins / games if games else 0.0,
+        'avg_cleared': cleared / games if games else 0.0,
+        'games_per_sec': games / elapsed if elapsed else 0.0,
+    }
+
+
+def parse_mode(text: str) -> c.MODE_CONFIG:
+    ''' A MODES key (e.g. "2"), or a custom geometry as WIDTHxHEIGHTxIEDS (e.g. "100x100x15%") '''
+    if text.isdigit() and int(text) in c.MODES:
+        return c.MODES.get(int(text))
+    try:
+        x, y, IEDs = text.split('x')
+        return engine.custom_mode(x, y, IEDs)
+    except ValueError as e:     # pylint: disable=invalid-name
+        raise argparse.ArgumentTypeError(str(e) or 'Invalid mode: {}'.format(text))
+
+
+def main(argv=None):
+    ''' Entry point of `python -m pyms simulate` '''
+    modes = ', '.join('{}={}'.format(key, mode.name) for key, mode in c.MODES.items())
+    parser = argparse.ArgumentParser(prog='python -m pyms simulate', description=__doc__)
+    parser.add_argument('-n', '--games', type=int, default=1000, help='number of games to play')
+    parser.add_argument('-m', '--mode', type=parse_mode, default=c.MODES.get(0),
+                        help='mode ({}) or WIDTHxHEIGHTxIEDS for a custom field'.format(modes))
+    parser.add_argument('-s', '--strategy', choices=sorted(STRATEGIES), default='simple')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (all cores by default)')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the game seeds, to repeat a batch')
+    parser.add_argument('--allow-hits', type=int, choices=(0, 1, 2), default=0, help='hits option of blackjack modes')
+    parser.add_argument('--opening', action='store_true', help='the first click always opens an area')
+    parser.add_argument('-o', '--out', default=None, help='JSONL file of the results of each game ("-" for stdout)')
+    args = parser.parse_args(argv)
+
+    if args.out is None:
+        out = None
+    elif args.out == '-':
+        out = sys.stdout
+    else:
+        out = open(args.out, 'w')
+    try:
+        summary = simulate(
+            args.games, args.mode, args.strategy, args.workers, args.seed, args.allow_hits, args.opening, out
+        )
+    finally:
+        if out not in (None, sys.stdout):
+            out.close()
+    print(
+        '{games} games on {workers} workers: {win_rate:.2%} won, {avg_cleared:.2%} cleared on average, '
+        '{games_per_sec:.1f} games/sec'.format(**summary),
+        file=sys.stderr if out is sys.stdout else sys.stdout
+    )
+    return summary
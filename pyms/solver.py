@@ -0,0 +1,644 @@
+''' Constraint propagation solver, deduces the forced cells from what the player can see on the board '''
+from collections import deque
+from functools import lru_cache
+from math import comb
+from . import engine
+
+# Search nodes a single component gets to enumerate its assignments, beyond it the component is left undecided
+MAX_NODES = 5000
+# Components of the same constraints to keep the enumerations of, they are shared across the games
+COMPONENTS_KEPT = 1024
+# Binomial weights to keep, the same few come up again on every move
+BINOMIALS_KEPT = 4096
+
+
+class Solver:
+    '''
+    Solver for the Normal modes, only looks at the revealed clues and never at the concealed cells.
+
+    Each revealed clue is a constraint: the sum of its unknown adjacent cells is the clue less the known IEDs.
+    The constraints are reduced with the single cell rule (all or nothing left) and the pair rule
+    (subsets and the overlaps of adjacent clues), only around the cells that changed since the last move.
+
+    Attributes:
+    safe        - cells deduced to be safe that are not revealed yet
+    mines       - cells deduced to be IEDs
+    '''
+    def __init__(self, board: engine.Board):
+        if board.mode.special:
+            raise ValueError('The Solver only handles the Normal modes.')
+        self.board = board
+        self.safe = set()
+        self.mines = set()
+        # clue cells to look at again
+        self.dirty = set()
+        # Pick up whatever has been revealed so far
+        self.update(idx for idx in range(board.size) if board.revealed[idx])
+
+    def update(self, revealed):
+        ''' Take in the newly revealed cells and propagate '''
+        board = self.board
+        for idx in revealed:
+            self.safe.discard(idx)
+            self.dirty.add(idx)
+            self.dirty.update(adj for adj in board.adjacents(idx) if board.revealed[adj])
+        self.propagate()
+
+    def constraint(self, idx: int):
+        ''' The (unknown cells, IEDs left) of the clue, None if the cell isn't a clue with any unknown cells left '''
+        board = self.board
+        if not board.revealed[idx] or board.values[idx]:
+            return None
+        unknown = []
+        remaining = int(board.clues[idx])
+        for adj in board.adjacents(idx):
+            if board.revealed[adj]:
+                # a revealed IED is as good as a known one
+                remaining -= bool(board.values[adj])
+            elif adj in self.mines:
+                remaining -= 1
+            elif adj not in self.safe:
+                unknown.append(adj)
+        if not unknown:
+            return None
+        return frozenset(unknown), remaining
+
+    def mark(self, cells, is_mine: bool):
+        ''' Record the deduced cells, the clues around them need another look '''
+        board = self.board
+        (self.mines if is_mine else self.safe).update(cells)
+        for idx in cells:
+            self.dirty.update(adj for adj in board.adjacents(idx) if board.revealed[adj])
+
+    def propagate(self):
+        ''' Apply the rules until nothing changes '''
+        board = self.board
+        while self.dirty:
+            idx = self.dirty.pop()
+            con = self.constraint(idx)
+            if con is None:
+                continue
+            cells, remaining = con
+            if remaining == 0:
+                self.mark(cells, False)
+                continue
+            if remaining == len(cells):
+                self.mark(cells, True)
+                continue
+            # Pair up with the other clues sharing any of the unknown cells
+            others = {adj for cell in cells for adj in board.adjacents(cell) if board.revealed[adj]}
+            others.discard(idx)
+            for other in others:
+                other_con = self.constraint(other)
+                if other_con is not None and self.pair(con, other_con):
+                    # The cells changed, this clue gets another look with the new cells
+                    self.dirty.add(idx)
+                    break
+
+    def pair(self, con_a: tuple, con_b: tuple) -> bool:
+        ''' Reduce the pair of constraints both ways, returns whether anything was deduced '''
+        if not con_a[0] & con_b[0]:
+            return False
+        for (cells, left), (cells_o, left_o) in ((con_a, con_b), (con_b, con_a)):
+            only = cells_o - cells
+            # The shared cells hold at most left, so the rest of other needs at least left_o - left
+            if only and left_o - left == len(only):
+                self.mark(only, True)
+                # ... and the shared cells hold exactly left, so the rest of cells are safe
+                rest = cells - cells_o
+                if rest:
+                    self.mark(rest, False)
+                return True
+            # Subset with the same amount, the rest of other are safe
+            if only and left_o == left and cells <= cells_o:
+                self.mark(only, False)
+                return True
+        return False
+
+
+def split_components(constraints: dict) -> list:
+    ''' Split the (cells, sum) constraints of the clues into the groups sharing any cells, as sorted tuples '''
+    clues_of = {}
+    for idx, (cells, _) in constraints.items():
+        for cell in cells:
+            clues_of.setdefault(cell, []).append(idx)
+    components = []
+    seen = set()
+    for start in constraints:
+        if start in seen:
+            continue
+        seen.add(start)
+        stack = [start]
+        group = set()
+        while stack:
+            idx = stack.pop()
+            group.add(constraints[idx])
+            for cell in constraints[idx][0]:
+                for other in clues_of[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+        components.append(tuple(sorted(group)))
+    return components
+
+
+@lru_cache(maxsize=BINOMIALS_KEPT)
+def binomial(n: int, k: int) -> int:
+    ''' The ways to pick k of n cells, 0 if it can't be done '''
+    return comb(n, k) if 0 <= k <= n else 0
+
+
+def convolve(left: dict, right: dict) -> dict:
+    ''' Product of two polynomials kept as {power: coefficient} '''
+    product = {}
+    for i, x in left.items():
+        for j, y in right.items():
+            product[i + j] = product.get(i + j, 0) + x * y
+    return product
+
+
+def frontier_order(constraints: tuple) -> list:
+    '''
+    The cells of the constraints in the order to enumerate them, walking the constraints breadth first from
+    the smallest one so the constraints along the way close early and prune the rest of the search
+    '''
+    cons_of = {}
+    for con, (con_cells, _) in enumerate(constraints):
+        for cell in con_cells:
+            cons_of.setdefault(cell, []).append(con)
+    start = min(range(len(constraints)), key=lambda con: len(constraints[con][0]))
+    queue = deque((start, ))
+    queued = {start}
+    cells = []
+    while queue:
+        con_cells = constraints[queue.popleft()][0]
+        for cell in con_cells:
+            if cell in cons_of:
+                cells.append(cell)
+                for other in cons_of.pop(cell):
+                    if other not in queued:
+                        queued.add(other)
+                        queue.append(other)
+    return cells
+
+
+def count_component(constraints: tuple) -> tuple:
+    '''
+    Count the IED placements of a component of the Normal mode constraints, each constraint is ((cells), IEDs).
+    The cells under the same constraints are grouped, so only the amount of IEDs in each group is chosen
+    and weighted by the ways to place them in the group.
+
+    The groups are taken in turn along the frontier, and the rest of the choices only depend on the sums left of
+    the constraints still open, so the placements are counted over those states forwards and backwards
+    instead of enumerated one by one.
+
+    Returns the groups of cells and a dict of the IEDs in the component to
+    [placements, [placements times the IEDs of each group]].
+    '''
+    # pylint: disable=too-many-locals
+    ordered = dict.fromkeys(frontier_order(constraints))
+    cons_of = {cell: [] for cell in ordered}
+    for con, (con_cells, _) in enumerate(constraints):
+        for cell in con_cells:
+            cons_of[cell].append(con)
+    groups = {}
+    for cell in ordered:
+        groups.setdefault(tuple(cons_of[cell]), []).append(cell)
+    of_group = list(groups)
+    sizes = [len(cells) for cells in groups.values()]
+    full = [total for _, total in constraints]
+    # The cells of each constraint of the group left after it, and the constraints open between the groups
+    left = [len(con_cells) for con_cells, _ in constraints]
+    last = {}
+    left_after = []
+    for pos, cons in enumerate(of_group):
+        for con in cons:
+            left[con] -= sizes[pos]
+            last[con] = pos
+        left_after.append([left[con] for con in cons])
+    open_at = [()]
+    started = set()
+    for pos, cons in enumerate(of_group):
+        started.update(cons)
+        open_at.append(tuple(sorted(con for con in started if last[con] > pos)))
+
+    def moves(pos: int, state: tuple):
+        ''' The (IEDs, ways, next state) the group can take from the state '''
+        values = dict(zip(open_at[pos], state))
+        cons = of_group[pos]
+        size = sizes[pos]
+        current = [values.get(con, full[con]) for con in cons]
+        # Whatever the group takes, the rest of each of its constraints has to be able to make up the sum
+        low = max(0, max(value - left for value, left in zip(current, left_after[pos])))
+        high = min(size, min(current))
+        for amount in range(low, high + 1):
+            for con, value in zip(cons, current):
+                values[con] = value - amount
+            yield amount, binomial(size, amount), tuple(values[con] for con in open_at[pos + 1])
+
+    def add_shifted(target: dict, poly: dict, shift: int, weight: int):
+        for amount, ways in poly.items():
+            target[amount + shift] = target.get(amount + shift, 0) + ways * weight
+
+    # Placements of the groups before each position by state, and the moves out of each state
+    forward = [{(): {0: 1}}]
+    transitions = []
+    for pos in range(len(sizes)):
+        reached = {}
+        taken = []
+        for state, poly in forward[pos].items():
+            for amount, ways, after in moves(pos, state):
+                taken.append((state, amount, ways, after))
+                add_shifted(reached.setdefault(after, {}), poly, amount, ways)
+        forward.append(reached)
+        transitions.append(taken)
+    # Placements of the groups from each position on by state, only the ones that close all the constraints
+    backward = [{(): {0: 1}}]
+    for pos in reversed(range(len(sizes))):
+        completed = {}
+        for state, amount, ways, after in transitions[pos]:
+            suffix = backward[-1].get(after)
+            if suffix is not None:
+                add_shifted(completed.setdefault(state, {}), suffix, amount, ways)
+        backward.append(completed)
+    backward.reverse()
+
+    counts = {amount: [ways, [0] * len(sizes)] for amount, ways in backward[0].get((), {}).items()}
+    for pos, taken in enumerate(transitions):
+        for state, amount, ways, after in taken:
+            suffix = backward[pos + 1].get(after)
+            if not amount or suffix is None:
+                continue
+            for before, prefix_ways in forward[pos][state].items():
+                for rest, suffix_ways in suffix.items():
+                    counts[before + amount + rest][1][pos] += prefix_ways * ways * suffix_ways * amount
+    return list(groups.values()), counts
+
+
+@lru_cache(maxsize=COMPONENTS_KEPT)
+def component_solutions(constraints: tuple, limits: tuple):
+    '''
+    Enumerate the assignments of a component of the Blackjack constraints, each constraint is ((cells), sum)
+    and limits is the most there can be of each card value (indexed by the value).
+
+    Returns the cells and a dict of the card usage (the count of each value 1 to 10) to the bits of the possible
+    values of each cell under that usage, or None if the component takes more than MAX_NODES to enumerate.
+    '''
+    # pylint: disable=too-many-locals
+    # Cells of the smaller constraints go first, so the constraints close early and prune the rest
+    ordered = dict.fromkeys(cell for con_cells, _ in sorted(constraints, key=lambda con: len(con[0]))
+                            for cell in con_cells)
+    cons_of = {cell: [] for cell in ordered}
+    for con, (con_cells, _) in enumerate(constraints):
+        for cell in con_cells:
+            cons_of[cell].append(con)
+    # The cells of the same constraints are interchangeable, only their values in ascending order are tried
+    groups = {}
+    for cell in ordered:
+        groups.setdefault(tuple(cons_of[cell]), []).append(cell)
+    cells = [cell for group in groups.values() for cell in group]
+    same_group = [pos > 0 and cons_of[cells[pos - 1]] == cons_of[cell] for pos, cell in enumerate(cells)]
+    of_cell = [cons_of[cell] for cell in cells]
+    sums = [total for _, total in constraints]
+    left = [len(con_cells) for con_cells, _ in constraints]
+    used = [0] * 11
+    assigned = [0] * len(cells)
+    found = {}
+    nodes = 0
+
+    def search(pos: int) -> bool:
+        nonlocal nodes
+        if pos == len(cells):
+            usage = tuple(used[1:])
+            bits = found.get(usage)
+            if bits is None:
+                found[usage] = [1 << value for value in assigned]
+            else:
+                for i, value in enumerate(assigned):
+                    bits[i] |= 1 << value
+            return True
+        nodes += 1
+        if nodes > MAX_NODES:
+            return False
+        cons = of_cell[pos]
+        # Whatever the cell takes, the rest of each of its constraints has to be able to make up the sum
+        low = max(0, max(sums[con] - 10 * (left[con] - 1) for con in cons))
+        high = min(10, min(sums[con] for con in cons))
+        if same_group[pos]:
+            low = max(low, assigned[pos - 1])
+        for value in range(low, high + 1):
+            if value and used[value] >= limits[value]:
+                continue
+            for con in cons:
+                sums[con] -= value
+                left[con] -= 1
+            used[value] += 1
+            assigned[pos] = value
+            done = search(pos + 1)
+            used[value] -= 1
+            for con in cons:
+                sums[con] += value
+                left[con] += 1
+            if not done:
+                return False
+        return True
+
+    if not search(0):
+        return None
+    # Any value one of the interchangeable cells took, the others could have taken as well
+    for bits in found.values():
+        start = 0
+        for group in groups.values():
+            end = start + len(group)
+            union = 0
+            for pos in range(start, end):
+                union |= bits[pos]
+            bits[start:end] = [union] * len(group)
+            start = end
+    return tuple(cells), found
+
+
+class BlackjackSolver:
+    '''
+    Solver for the Blackjack modes, only looks at the revealed clues and cards and never at the concealed cells.
+
+    Each unknown cell takes a card value from 1 to 10, or 0 if safe, and each revealed clue is the sum of its
+    unknown adjacent cells (less the known cards). The clues are split into the components of the clues sharing
+    cells, each component is enumerated on its own (memoized on its constraints) and the card usages of the
+    components are checked against the cards left in the deck and the unknown cells away from the clues.
+
+    Attributes:
+    safe        - cells deduced to be safe that are not revealed yet
+    mines       - cells deduced to be IEDs
+    values      - the card value deduced for each of the mines
+    cards_left  - cards not revealed or deduced yet, indexed by value
+    '''
+    def __init__(self, board: engine.Board):
+        if not board.mode.special:
+            raise ValueError('The BlackjackSolver only handles the Blackjack modes.')
+        self.board = board
+        self.safe = set()
+        self.mines = set()
+        self.values = {}
+        decks = board.mode.amount // 13
+        self.limits = (0, ) + tuple(engine.CARDS.count(value) * decks for value in range(1, 11))
+        self.cards_left = list(self.limits)
+        # cells taken out of cards_left
+        self.counted = set()
+        # the current (cells, sum) of each revealed clue with any unknown cells left
+        self.constraints = {}
+        # clue cells to look at again
+        self.dirty = set()
+        # Pick up whatever has been revealed so far
+        self.update(idx for idx in range(board.size) if board.revealed[idx])
+
+    def update(self, revealed):
+        ''' Take in the newly revealed cells and propagate '''
+        board = self.board
+        for idx in revealed:
+            self.safe.discard(idx)
+            if board.values[idx]:
+                # A hit, the card is known from now on
+                self.mines.discard(idx)
+                self.values.pop(idx, None)
+                self.count(idx, board.values[idx])
+            self.dirty.add(idx)
+            self.dirty.update(adj for adj in board.adjacents(idx) if board.revealed[adj])
+        self.propagate()
+
+    def count(self, idx: int, value: int):
+        ''' Take the card of the cell out of the cards left, once '''
+        if idx not in self.counted:
+            self.counted.add(idx)
+            self.cards_left[value] -= 1
+
+    def is_unknown(self, idx: int) -> bool:
+        ''' Whether nothing is known of the cell yet '''
+        return not self.board.revealed[idx] and idx not in self.safe and idx not in self.mines
+
+    def constraint(self, idx: int):
+        ''' The (unknown cells, sum left) of the clue, None if the cell isn't a clue with any unknown cells left '''
+        board = self.board
+        if not board.revealed[idx] or board.values[idx]:
+            return None
+        unknown = []
+        remaining = int(board.clues[idx])
+        for adj in board.adjacents(idx):
+            if board.revealed[adj]:
+                remaining -= int(board.values[adj])
+            elif adj in self.mines:
+                remaining -= self.values[adj]
+            elif adj not in self.safe:
+                unknown.append(adj)
+        if not unknown:
+            return None
+        return tuple(unknown), remaining
+
+    def mark(self, idx: int, value: int):
+        ''' Record the deduced cell, the clues around it need another look '''
+        board = self.board
+        if value:
+            self.mines.add(idx)
+            self.values[idx] = value
+            self.count(idx, value)
+        else:
+            self.safe.add(idx)
+        self.dirty.update(adj for adj in board.adjacents(idx) if board.revealed[adj])
+
+    def propagate(self):
+        ''' Solve the components until nothing changes '''
+        while self.dirty:
+            for idx in self.dirty:
+                con = self.constraint(idx)
+                if con is None:
+                    self.constraints.pop(idx, None)
+                else:
+                    self.constraints[idx] = con
+            self.dirty.clear()
+            self.solve()
+
+    def solve(self):
+        ''' Enumerate the components and mark the cells left with a single possible value '''
+        # pylint: disable=too-many-locals
+        # The single clue rules first, they are cheap and keep the components small
+        forced = False
+        for cells, remaining in list(self.constraints.values()):
+            if remaining == 0 or remaining == 10 * len(cells) or len(cells) == 1:
+                for cell in cells:
+                    if self.is_unknown(cell):
+                        self.mark(cell, remaining // len(cells))
+                forced = True
+        if forced:
+            return
+        components = split_components(self.constraints)
+        solved = [component_solutions(component, self.limits) for component in components]
+        sizes = [len({cell for cells, _ in component for cell in cells}) for component in components]
+        frontier = {cell for cells, _ in self.constraints.values() for cell in cells}
+        interior = [idx for idx in range(self.board.size) if self.is_unknown(idx) and idx not in frontier]
+        cards = self.cards_left[1:]
+        total = sum(cards)
+
+        # The card usages of each component still possible, None for the undecided components
+        usages = [None if sol is None else list(sol[1]) for sol in solved]
+        changed = True
+        while changed:
+            changed = False
+            bounds = [self.usage_bounds(usage, size) for usage, size in zip(usages, sizes)]
+            low_cards = [sum(bound[0][value] for bound in bounds) for value in range(10)]
+            low_total = sum(bound[1] for bound in bounds)
+            high_total = sum(bound[2] for bound in bounds)
+            for i, usage in enumerate(usages):
+                if not usage:
+                    continue
+                own_cards, own_low, own_high = bounds[i]
+                # The least the other components take of each value, and the range of the cards the rest hold
+                other_cards = [low - own for low, own in zip(low_cards, own_cards)]
+                other_low = low_total - own_low
+                other_high = high_total - own_high + len(interior)
+                kept = [
+                    use for use in usage
+                    if all(other + count <= left for other, count, left in zip(other_cards, use, cards))
+                    and other_low + sum(use) <= total <= other_high + sum(use)
+                ]
+                if len(kept) < len(usage):
+                    usages[i] = kept
+                    changed = True
+
+        for sol, usage in zip(solved, usages):
+            if not usage:
+                # Undecided, or nothing consistent with the cards left
+                continue
+            cells, found = sol
+            possible = [0] * len(cells)
+            for use in usage:
+                for i, bits in enumerate(found[use]):
+                    possible[i] |= bits
+            for cell, bits in zip(cells, possible):
+                if bits & (bits - 1) == 0:
+                    self.mark(cell, bits.bit_length() - 1)
+
+        # The components take up at least all the cards left, so the cells away from the clues are all safe
+        if sum(self.usage_bounds(usage, size)[1] for usage, size in zip(usages, sizes)) >= total:
+            for idx in interior:
+                self.mark(idx, 0)
+
+    @staticmethod
+    def usage_bounds(usage, size: int) -> tuple:
+        ''' The least of each value, and the least and most cards over the usages, anything for the undecided '''
+        if not usage:
+            return [0] * 10, 0, size
+        return ([min(use[value] for use in usage) for value in range(10)],
+                min(sum(use) for use in usage), max(sum(use) for use in usage))
+
+
+class Probabilities:
+    '''
+    Exact IED probability of the concealed cells of a Normal mode board, from the revealed clues only.
+
+    The clues are split into the components sharing cells and the placements of each component are counted by
+    the IEDs it holds. The components are combined with the ways to place the rest of the IEDs in the cells away
+    from the clues. The counts of a component are kept until a move changes any of its clues.
+
+    Attributes:
+    frontier    - the probability of each concealed cell next to a revealed clue
+    interior    - the probability of any of the other concealed cells
+    '''
+    def __init__(self, board: engine.Board):
+        if board.mode.special:
+            raise ValueError('The Probabilities only handle the Normal modes.')
+        self.board = board
+        self.concealed = board.size
+        self.IEDs_left = board.IED_count
+        # the current (cells, IEDs) of each revealed clue with any concealed cells left
+        self.constraints = {}
+        # the counts of each component, by its constraints
+        self.counted = {}
+        self.frontier = {}
+        self.interior = self.IEDs_left / self.concealed
+        # Pick up whatever has been revealed so far
+        self.update(idx for idx in range(board.size) if board.revealed[idx])
+
+    def update(self, revealed):
+        ''' Take in the newly revealed cells and recompute '''
+        board = self.board
+        dirty = set()
+        for idx in revealed:
+            self.concealed -= 1
+            self.IEDs_left -= bool(board.values[idx])
+            dirty.add(idx)
+            dirty.update(adj for adj in board.adjacents(idx) if board.revealed[adj])
+        for idx in dirty:
+            con = self.constraint(idx)
+            if con is None:
+                self.constraints.pop(idx, None)
+            else:
+                self.constraints[idx] = con
+        self.compute()
+
+    def constraint(self, idx: int):
+        ''' The (concealed cells, IEDs left) of the clue, None if the cell isn't a clue with any concealed cells left '''
+        board = self.board
+        if not board.revealed[idx] or board.values[idx]:
+            return None
+        concealed = []
+        remaining = int(board.clues[idx])
+        for adj in board.adjacents(idx):
+            if not board.revealed[adj]:
+                concealed.append(adj)
+            elif board.values[adj]:
+                remaining -= 1
+        if not concealed:
+            return None
+        return tuple(concealed), remaining
+
+    def probability(self, idx: int):
+        ''' The probability the cell is an IED, None if it is revealed '''
+        if self.board.revealed[idx]:
+            return None
+        return self.frontier.get(idx, self.interior)
+
+    def compute(self):
+        ''' Count the components a move changed and combine all of them into the probabilities '''
+        # pylint: disable=too-many-locals
+        self.counted = {
+            component: self.counted.get(component) or count_component(component)
+            for component in split_components(self.constraints)
+        }
+        counted = list(self.counted.values())
+        outside = self.concealed - len({cell for cells, _ in self.constraints.values() for cell in cells})
+        IEDs = self.IEDs_left
+        polys = [{amount: entry[0] for amount, entry in counts.items()} for _, counts in counted]
+        # Products of the components before and after each one, to leave each one out in turn
+        before = [{0: 1}]
+        for poly in polys:
+            before.append(convolve(before[-1], poly))
+        after = [{0: 1}]
+        for poly in reversed(polys):
+            after.append(convolve(after[-1], poly))
+        after.reverse()
+
+        total = sum(weight * binomial(outside, IEDs - amount) for amount, weight in before[-1].items())
+        if not total:
+            # Nothing fits the clues, which only happens on a board that isn't played by the rules
+            return
+        frontier = {}
+        for i, (groups, counts) in enumerate(counted):
+            others = convolve(before[i], after[i + 1])
+            for amount, (_, mines) in counts.items():
+                # The placements of the rest of the field along with this amount in the component
+                rest = sum(weight * binomial(outside, IEDs - amount - other) for other, weight in others.items())
+                for cells, weight in zip(groups, mines):
+                    for cell in cells:
+                        frontier[cell] = frontier.get(cell, 0) + weight * rest
+            for cells in groups:
+                for cell in cells:
+                    frontier[cell] = frontier.get(cell, 0) / (len(cells) * total)
+        self.frontier = frontier
+        self.interior = sum(
+            weight * binomial(outside - 1, IEDs - amount - 1) for amount, weight in before[-1].items()
+        ) / total if outside else 0.0
+
+
+def create_solver(board: engine.Board):
+    ''' The solver for the mode of the board '''
+    return BlackjackSolver(board) if board.mode.special else Solver(board)
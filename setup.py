@@ -9,4 +9,6 @@ setup(name='pymsweeper',
       keywords='pyms minesweeper blackjack gui tkinter tk mashup',
       license='GPLv3',
       packages=['pyms'],
+      python_requires='>=3.9',
+      extras_require={'numpy': ['numpy']},
       zip_safe=False)
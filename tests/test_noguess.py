@@ -0,0 +1,56 @@
+''' The background search of the no guess boards stays on its share of the cores and gives up on the modes too rare '''
+import os
+import pytest
+from pyms import constants as c
+from pyms import engine
+from pyms import noguess
+
+
+@pytest.mark.parametrize('seconds, found, hopeless', (
+    (10.0, 0, False),
+    (noguess.SAMPLE_SECONDS, 0, True),
+    (noguess.SAMPLE_SECONDS, 1, False),
+    (noguess.SECONDS_PER_SEED * 3, 2, True),
+    (noguess.SECONDS_PER_SEED * 3, 3, False),
+))
+def test_hopeless(seconds, found, hopeless):
+    assert noguess.Filler.hopeless(seconds, found) is hopeless
+
+
+def test_generate_gives_up(tmp_path):
+    index = noguess.SeedIndex(str(tmp_path / 'noguess.db'))
+    checks = []
+
+    def give_up(seconds, found):
+        checks.append((seconds, found))
+        return True
+    summary = noguess.generate(c.MODES.get(0), 1000, index, workers=1, seed=1, give_up=give_up)
+    assert len(checks) == 1
+    assert summary['found'] == index.count(c.MODES.get(0)) < 1000
+    index.close()
+
+
+def test_generate_solves(tmp_path):
+    index = noguess.SeedIndex(str(tmp_path / 'noguess.db'))
+    mode = c.MODES.get(0)
+    assert noguess.generate(mode, 3, index, workers=1, seed=1)['found'] == 3
+    while index.count(mode):
+        seed, generator, start = index.pop(mode)
+        assert noguess.solves(mode, seed, start, generator)
+        board = engine.create_board(mode, seed=seed, generator=generator, start=start, opening=True)
+        board.clicked(start)
+        assert not board.is_over or board.is_won
+    index.close()
+
+
+def test_filler(tmp_path):
+    filler = noguess.Filler(str(tmp_path / 'noguess.db'))
+    assert filler.workers == max(1, (os.cpu_count() or 1) // 2)
+    mode = c.MODES.get(5)
+    filler.gave_up.add(noguess.SeedIndex.key(mode))
+    # same geometry under another name
+    assert filler.gave_up_on(mode._replace(name='Custom'))
+    filler.request(mode)
+    assert filler.wanted == []
+    filler.request(c.MODES.get(0))
+    assert filler.wanted == [c.MODES.get(0)]
@@ -0,0 +1,143 @@
+''' The records database, and the one time migration of the pickled records from before it '''
+import os
+import pickle
+import sqlite3
+import time
+from types import SimpleNamespace
+import pytest
+from pyms import constants as c
+from pyms.recorder import Checkpointer, Leaderboard, RecordEntry, RecordKeeper
+
+NORMAL = c.MODES.get(0)
+BLACKJACK = c.MODES.get(3)
+
+
+class Pickled:
+    ''' Pickles as the reduce value it is given, to write the objects as older versions had them '''
+    def __init__(self, reduced):
+        self.reduced = reduced
+
+    def __reduce__(self):
+        return self.reduced
+
+
+def old_entry(mode: c.MODE_CONFIG, *values) -> RecordEntry:
+    ''' A RecordEntry as pickled before the database, only its mode and 9 field RECORD '''
+    entry = RecordEntry.__new__(RecordEntry)
+    entry.__dict__ = {'data': Pickled((c.RECORD, values)), 'mode': mode}
+    return entry
+
+
+@pytest.fixture
+def keeper(tmp_path, monkeypatch):
+    ''' A keeper on a new database, with no old records to migrate unless a test writes them '''
+    monkeypatch.setattr(RecordKeeper, 'default_filename', str(tmp_path / '.data.pms'))
+    keeper = RecordKeeper(SimpleNamespace(options=[]))
+    yield keeper
+    keeper.close()
+
+
+def test_migrate(tmp_path, keeper):
+    records = {
+        RecordKeeper.mode_str(NORMAL): [
+            old_entry(NORMAL, time_val, seed, '{:.2f}'.format(time_val), 0, 0, 0, 0, 0, 0)
+            for time_val, seed in ((30.5, 1), (12.25, 2), (20.0, 3))
+        ],
+        RecordKeeper.mode_str(BLACKJACK): [old_entry(BLACKJACK, 40.0, 4, '40.00', 2, 5, 1, 1, 1, 2)],
+    }
+    with open(RecordKeeper.default_filename, 'wb') as file:
+        pickle.dump((records, [4, 1, 0, 1, 2]), file)
+
+    assert keeper.load(str(tmp_path / 'records.db')) == [4, 1, 0, 1, 2]
+    top = keeper.top(NORMAL)
+    assert [entry.data.seed for entry in top] == [2, 3, 1]
+    assert [entry.sort_key() for entry in top] == [12.25, 20.0, 30.5]
+    # the records from before the versioning were all placed by the legacy generator
+    assert all(entry.data.generator == 0 and entry.data.start is None for entry in top)
+    blackjack, = keeper.top(BLACKJACK)
+    assert blackjack.data[3:9] == (2, 5, 1, 1, 1, 2)
+    assert blackjack.sort_key() == RecordEntry(BLACKJACK, blackjack.data).sort_key()
+    keeper.close()
+
+    # migrated once, the old file is left alone from then on
+    keeper.load(str(tmp_path / 'records.db'))
+    assert len(keeper.top(NORMAL)) == 3
+
+
+def test_add_record(tmp_path, keeper):
+    keeper.load(str(tmp_path / 'records.db'))
+    added = [
+        (c.RECORD(time_val, seed, '{:.2f}'.format(time_val), 0, 0, 0, 0, 0, 0, 1, seed, seed % 2 == 0), replay)
+        for time_val, seed, replay in ((25.0, 1, b'first'), (15.0, 2, None), (35.0, 3, b'third'))
+    ]
+    for data, replay in added:
+        keeper.add_record(NORMAL, data, replay)
+    assert [entry.data for entry in keeper.top(NORMAL)] == [added[1][0], added[0][0], added[2][0]]
+    # only the records with a replay, in rank
+    assert [(entry.data, replay) for entry, replay in keeper.replays(NORMAL)] == [added[0], added[2]]
+    assert list(keeper.replays(BLACKJACK)) == []
+    keeper.close()
+
+    keeper.load(str(tmp_path / 'records.db'))
+    assert [entry.data for entry in keeper.top(NORMAL, limit=2)] == [added[1][0], added[0][0]]
+
+
+def test_checkpointer_survives_errors(tmp_path):
+    ''' A failed checkpoint is skipped, the thread keeps waiting for the next request '''
+    database = tmp_path / 'broken.db'
+    database.write_bytes(b'not a database' * 100)
+    checkpointer = Checkpointer(str(database))
+    checkpointer.start()
+    for _ in range(3):
+        checkpointer.request()
+        time.sleep(.05)
+        assert checkpointer.is_alive()
+    checkpointer.close()
+    assert not checkpointer.is_alive()
+
+
+def test_close_checkpoints(tmp_path, keeper):
+    database = str(tmp_path / 'records.db')
+    keeper.load(database)
+    # keep the log from being removed by the last connection closing, to see what the keeper left in it
+    reader = sqlite3.connect(database)
+    reader.execute('SELECT count(*) FROM records').fetchone()
+    keeper.checkpointer.closing = True
+    keeper.add_record(NORMAL, c.RECORD(10.0, 1, '10.00', 0, 0, 0, 0, 0, 0, 1, 1, True))
+    keeper.close()
+    assert os.path.getsize(database + '-wal') == 0
+    assert reader.execute('SELECT count(*) FROM records').fetchone() == (1, )
+    reader.close()
+
+
+def normal_record(time_val: float, seed: int) -> RecordEntry:
+    return RecordEntry(NORMAL, c.RECORD(time_val, seed, '{:.2f}'.format(time_val), 0, 0, 0, 0, 0, 0, 1, None, True))
+
+
+def test_leaderboard():
+    board = Leaderboard(3, [normal_record(time_val, seed) for seed, time_val in enumerate((30.0, 10.0, 20.0))])
+    assert [record.data.seed for record in board] == [1, 2, 0]
+    # a tie goes after the records already there, a worse record past the size is turned away
+    assert board.add(normal_record(20.0, 3)) == 2
+    assert [record.data.seed for record in board] == [1, 2, 3]
+    assert board.add(normal_record(20.0, 4)) is None
+    assert board.add(normal_record(40.0, 5)) is None
+    assert board.add(normal_record(5.0, 6)) == 0
+    assert len(board) == 3
+    assert [record.data.seed for record in board] == [6, 1, 2]
+    assert board[-1].sort_key() == 20.0
+
+
+def test_leaderboard_keeps_database(tmp_path, monkeypatch):
+    ''' Only the board is bounded to records_to_keep, the database keeps every record '''
+    monkeypatch.setattr(RecordKeeper, 'default_filename', str(tmp_path / '.data.pms'))
+    keeper = RecordKeeper(SimpleNamespace(options=[]), records_to_keep=2)
+    keeper.load(str(tmp_path / 'records.db'))
+    mode_str = RecordKeeper.mode_str(NORMAL)
+    board = keeper.leaderboard(mode_str)
+    for seed, time_val in enumerate((30.0, 10.0, 20.0, 10.0)):
+        keeper.add_record(NORMAL, normal_record(time_val, seed).data)
+    assert [record.data.seed for record in board] == [1, 3]
+    assert [record.data.seed for record in keeper.top(NORMAL)] == [1, 3]
+    assert [record.data.seed for record in keeper.top(NORMAL, limit=10)] == [1, 3, 2, 0]
+    keeper.close()
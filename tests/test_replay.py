@@ -0,0 +1,67 @@
+''' The replays must survive being stored and play back to the same board '''
+from random import Random
+import pytest
+from pyms import constants as c
+from pyms import engine
+from pyms import replay
+from pyms.simulate import simple_strategy
+
+SEEDS = range(10)
+
+
+def played(mode: c.MODE_CONFIG, seed: int, allow_hits: int = 0, opening: bool = False, start: int = None):
+    ''' Play a game with the simple strategy and a few mid click guesses, logging it to a replay '''
+    board = engine.create_board(mode, seed=seed, allow_hits=allow_hits, opening=opening, start=start)
+    board.used_seed = False
+    board.replay = replay.Replay(used_seed=False)
+    move = simple_strategy(board)
+    rnd = Random(seed)
+    for moves in range(board.size * 2):
+        if board.is_over:
+            break
+        if mode.special and moves % 5 == 4:
+            board.guess(rnd.randrange(board.size))
+        else:
+            move(rnd)
+    return board
+
+
+def state(board: engine.Board) -> tuple:
+    return (
+        board.revealed, board.flags, board.IEDs, board.values, board.is_over, board.is_won,
+        board.IED_guessed, board.IED_hit, board.IED_blew, board.map_cleared
+    )
+
+
+def assert_round_trip(log: replay.Replay):
+    copy = replay.Replay.from_bytes(log.to_bytes())
+    assert list(copy) == list(log)
+    assert (copy.used_seed, copy.opening, copy.start_cell) == (log.used_seed, log.opening, log.start_cell)
+
+
+@pytest.mark.parametrize('mode', list(c.MODES.values()), ids=lambda mode: mode.name)
+@pytest.mark.parametrize('opening', (False, True))
+def test_play_back(mode, opening):
+    for seed in SEEDS:
+        board = played(mode, seed, allow_hits=2, opening=opening)
+        assert len(board.replay)
+        assert_round_trip(board.replay)
+        copy = replay.play(board.replay.to_bytes(), mode, seed, allow_hits=2)
+        assert state(copy) == state(board)
+
+
+def test_play_back_start():
+    ''' A no guess board is placed around its start cell, wherever the first click is '''
+    mode = c.MODES.get(0)
+    for seed in SEEDS:
+        board = played(mode, seed, start=seed)
+        assert board.replay.start_cell == seed
+        assert_round_trip(board.replay)
+        assert state(replay.play(board.replay, mode, seed)) == state(board)
+
+
+def test_not_a_replay():
+    data = played(c.MODES.get(0), 0).replay.to_bytes()
+    for broken in (b'', b'PMSX' + data[4:], data[:-1]):
+        with pytest.raises(ValueError):
+            replay.Replay.from_bytes(broken)
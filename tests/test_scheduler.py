@@ -0,0 +1,176 @@
+''' The Scheduler runs the timed UI work in order off a single after job, on a fake root and clock so no display is needed '''
+from types import SimpleNamespace
+import pytest
+from pyms import constants as c
+from pyms import engine
+from pyms import gui
+
+
+class FakeRoot:
+    ''' Keeps the after jobs instead of running an event loop, fire runs the one armed '''
+    def __init__(self):
+        self.jobs = {}
+        self.ids = 0
+
+    def after(self, ms: int, func) -> str:
+        self.ids += 1
+        job = 'after#{}'.format(self.ids)
+        self.jobs[job] = (ms, func)
+        return job
+
+    def after_cancel(self, job: str):
+        del self.jobs[job]
+
+    def fire(self):
+        (job, (_, func)), = self.jobs.items()
+        del self.jobs[job]
+        func()
+
+
+class Clock:
+    def __init__(self):
+        self.time = 100.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = gui.Scheduler(FakeRoot())
+    scheduler.now = Clock()
+    return scheduler
+
+
+def armed(scheduler: gui.Scheduler) -> list:
+    ''' The delays of the after jobs set, only ever one '''
+    return [ms for ms, _ in scheduler.root.jobs.values()]
+
+
+def test_order(scheduler):
+    ran = []
+    for seconds, name in ((.3, 'c'), (.1, 'a'), (.2, 'b'), (.1, 'a2')):
+        scheduler.after(seconds, lambda name=name: ran.append(name))
+    assert armed(scheduler) == [100]
+    scheduler.now.time += .15
+    scheduler.root.fire()
+    # due at the same time in the order they were scheduled
+    assert ran == ['a', 'a2']
+    assert armed(scheduler) == [50]
+    scheduler.now.time += 1
+    scheduler.root.fire()
+    assert ran == ['a', 'a2', 'b', 'c']
+    assert armed(scheduler) == []
+
+
+def test_early_run(scheduler):
+    ''' A job run before its time (the after rounding) leaves the entry and sets the job again '''
+    ran = []
+    scheduler.after(.25, lambda: ran.append(1))
+    scheduler.now.time += .2
+    scheduler.root.fire()
+    assert ran == []
+    assert armed(scheduler) == [50]
+
+
+def test_reschedule(scheduler):
+    ran = []
+    scheduler.after(1, lambda: ran.append('late'))
+    assert armed(scheduler) == [1000]
+    # an earlier entry sets the job again in place of the later one
+    scheduler.after(.5, lambda: ran.append('early'))
+    assert armed(scheduler) == [500]
+    # a later entry keeps the job as it is
+    scheduler.after(2, lambda: ran.append('last'))
+    assert armed(scheduler) == [500]
+    scheduler.now.time += .5
+    scheduler.root.fire()
+    assert ran == ['early']
+    assert armed(scheduler) == [500]
+
+
+def test_cancel(scheduler):
+    ran = []
+    first = scheduler.after(.25, lambda: ran.append('first'))
+    scheduler.after(.5, lambda: ran.append('second'))
+    scheduler.cancel(first)
+    scheduler.cancel(None)
+    scheduler.now.time += .25
+    scheduler.root.fire()
+    assert ran == []
+    scheduler.now.time += .25
+    scheduler.root.fire()
+    assert ran == ['second']
+    # cancelling everything left drops the job once it comes up
+    last = scheduler.after(.25, lambda: ran.append('last'))
+    scheduler.cancel(last)
+    scheduler.now.time += .25
+    scheduler.root.fire()
+    assert ran == ['second']
+    assert armed(scheduler) == []
+
+
+def test_errors_keep_the_job(scheduler):
+    ''' The entries after a failing one still run on the next job '''
+    ran = []
+
+    def fail():
+        raise RuntimeError('failed')
+    scheduler.after(.25, fail)
+    scheduler.after(.5, lambda: ran.append(1))
+    scheduler.now.time += .25
+    with pytest.raises(RuntimeError):
+        scheduler.root.fire()
+    scheduler.now.time += .25
+    scheduler.root.fire()
+    assert ran == [1]
+
+
+class FakeLabel:
+    def __init__(self):
+        self.options = {'bg': 'grey'}
+
+    def cget(self, option: str):
+        return self.options[option]
+
+    def config(self, **options):
+        self.options.update(options)
+
+
+def flashing_cell(scheduler: gui.Scheduler) -> gui.CanvasMapElem:
+    ''' A revealed cell of the field, with only the parts the failed chord flash uses '''
+    board = engine.create_board(c.MODES.get(0), seed=1)
+    field = SimpleNamespace(parent=SimpleNamespace(scheduler=scheduler), board=board)
+    elem = gui.CanvasMapElem.__new__(gui.CanvasMapElem)
+    elem.field, elem.board, elem.idx, elem.flash = field, board, 0, None
+    elem.lbl = FakeLabel()
+    elem.box = SimpleNamespace(reset=lambda: None)
+    return elem
+
+
+def test_flash(scheduler):
+    elem = flashing_cell(scheduler)
+    elem._update_lbl_from_failed_reveal()       # pylint: disable=protected-access
+    assert elem.lbl.cget('bg') == 'gold'
+    # failing again while it flashes doesn't stack another flash
+    flash = elem.flash
+    elem._update_lbl_from_failed_reveal()       # pylint: disable=protected-access
+    assert elem.flash is flash
+    scheduler.now.time += gui.FLASH_SECONDS
+    scheduler.root.fire()
+    assert (elem.lbl.cget('bg'), elem.flash) == ('grey', None)
+
+
+def test_flash_cancelled(scheduler):
+    ''' Concealing the cell for a new board cancels its flash, the colour isn't put back over the new board '''
+    elem = flashing_cell(scheduler)
+    lbl = elem.lbl
+    elem._update_lbl_from_failed_reveal()       # pylint: disable=protected-access
+    flash = elem.flash
+    elem.field.board = engine.create_board(c.MODES.get(0), seed=2)
+    elem.reset()
+    assert elem.flash is None and flash[2] is None
+    scheduler.now.time += gui.FLASH_SECONDS
+    scheduler.root.fire()
+    assert lbl.cget('bg') == 'gold'
+    assert armed(scheduler) == []
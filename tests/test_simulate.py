@@ -0,0 +1,56 @@
+''' The batch simulation repeats from its seed, and the mode argument only takes the modes it can play '''
+import argparse
+import io
+import json
+import pytest
+from pyms import constants as c
+from pyms import simulate
+
+
+def results(out: io.StringIO) -> list:
+    ''' The results written for each game, without the timings '''
+    games = [json.loads(line) for line in out.getvalue().splitlines()]
+    for game in games:
+        del game['ms']
+    return games
+
+
+@pytest.mark.parametrize('strategy', sorted(simulate.STRATEGIES))
+def test_simulate_repeats(strategy):
+    runs = []
+    for _ in range(2):
+        out = io.StringIO()
+        summary = simulate.simulate(20, c.MODES.get(0), strategy, workers=1, seed=1234, out=out)
+        runs.append((summary['win_rate'], summary['avg_cleared'], results(out)))
+    assert runs[0] == runs[1]
+    games = runs[0][2]
+    assert [game['game'] for game in games] == list(range(20))
+    assert runs[0][0] == sum(game['won'] for game in games) / 20
+
+
+def test_play_game_repeats():
+    task = (0, c.MODES.get(3), 42, 'simple', 1, True)
+    first, second = simulate.play_game(task), simulate.play_game(task)
+    del first['ms'], second['ms']
+    assert first == second
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        simulate.simulate(1, c.MODES.get(0), 'clairvoyant', workers=1)
+
+
+@pytest.mark.parametrize('text, mode', (('2', c.MODES.get(2)), ('4', c.MODES.get(4))))
+def test_parse_mode(text, mode):
+    assert simulate.parse_mode(text) == mode
+
+
+def test_parse_custom_mode():
+    mode = simulate.parse_mode('100x100x15%')
+    assert (mode.x, mode.y, mode.amount) == (100, 100, 1500)
+
+
+@pytest.mark.parametrize('text', ('', '99', 'pro', '10x10', '10x10x5x5', 'axbx5', '10x10x500', '10x10xlots'))
+def test_parse_mode_invalid(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        simulate.parse_mode(text)
@@ -0,0 +1,90 @@
+''' The solvers must never deduce anything the board disagrees with, and the probabilities must be exact '''
+import itertools
+from random import Random
+import pytest
+from pyms import constants as c
+from pyms import engine
+from pyms.solver import BlackjackSolver, Probabilities, Solver, create_solver
+
+SEEDS = range(10)
+# Small enough to count every placement of the IEDs
+TINY = c.MODE_CONFIG('Tiny', 5, 4, None, 5, False)
+
+
+def concealed_pick(board: engine.Board, solver, rnd: Random) -> int:
+    ''' A deduced safe cell, otherwise any concealed cell not deduced to be an IED '''
+    if solver.safe:
+        return min(solver.safe)
+    while True:
+        idx = rnd.randrange(board.size)
+        if not board.revealed[idx] and idx not in solver.mines:
+            return idx
+
+
+@pytest.mark.parametrize('mode', list(c.MODES.values()), ids=lambda mode: mode.name)
+def test_deductions(mode):
+    deduced = 0
+    for seed in SEEDS:
+        rnd = Random(seed)
+        board = engine.create_board(mode, seed=seed, opening=True)
+        board.used_seed = False
+        solver = create_solver(board)
+        while not board.is_over:
+            solver.update(board.clicked(concealed_pick(board, solver, rnd)))
+            for idx in solver.safe:
+                assert not board.values[idx]
+            for idx in solver.mines:
+                assert board.values[idx]
+                if mode.special:
+                    assert solver.values[idx] == board.values[idx]
+        deduced += len(solver.mines)
+    # the games do get past the guessing
+    assert deduced
+
+
+def test_create_solver():
+    normal = engine.Board(c.MODES.get(0), seed=0)
+    blackjack = engine.Board(c.MODES.get(3), seed=0)
+    assert isinstance(create_solver(normal), Solver)
+    assert isinstance(create_solver(blackjack), BlackjackSolver)
+    with pytest.raises(ValueError):
+        Solver(blackjack)
+    with pytest.raises(ValueError):
+        BlackjackSolver(normal)
+
+
+def brute_force(board: engine.Board) -> dict:
+    ''' The IED probability of each concealed cell, over every placement that agrees with the revealed clues '''
+    concealed = [idx for idx in range(board.size) if not board.revealed[idx]]
+    clues = [idx for idx in range(board.size) if board.revealed[idx]]
+    counts = dict.fromkeys(concealed, 0)
+    total = 0
+    for placed in itertools.combinations(concealed, board.IED_count):
+        placed = set(placed)
+        if all(sum(adj in placed for adj in board.adjacents(idx)) == board.clues[idx] for idx in clues):
+            total += 1
+            for idx in placed:
+                counts[idx] += 1
+    return {idx: count / total for idx, count in counts.items()}
+
+
+def test_probabilities():
+    checked = 0
+    for seed in range(60):
+        rnd = Random(seed)
+        board = engine.Board(TINY, seed=seed)
+        board.used_seed = False
+        probabilities = Probabilities(board)
+        for _ in range(rnd.randrange(1, 4)):
+            if board.is_over:
+                break
+            safe = [idx for idx in range(board.size) if not board.revealed[idx] and not board.values[idx]]
+            probabilities.update(board.clicked(rnd.choice(safe) if board.IEDs_are_set else rnd.randrange(board.size)))
+        if board.is_over:
+            continue
+        fresh = Probabilities(board)
+        for idx, expected in brute_force(board).items():
+            assert probabilities.probability(idx) == pytest.approx(expected)
+            assert fresh.probability(idx) == pytest.approx(expected)
+        checked += 1
+    assert checked